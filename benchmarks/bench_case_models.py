@@ -0,0 +1,99 @@
+"""Build time and memory of ModelItem vs CompactCase for synthetic cases.
+
+Builds ``-n`` cases from raw dicts shaped like API cases (subjects, tags,
+participants, appeal cases, documents with references), then renders the
+display fields the bib/hay/md converters use. Memory is what the built
+objects retain on top of the raw dicts after rendering, measured with
+``tracemalloc`` in a separate untimed pass.
+
+    uv run python benchmarks/bench_case_models.py -n 20000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from domdb.core.compact import compact_case
+from domdb.core.converters.fields import parse_case_fields
+from domdb.core.model import ModelItem
+
+
+def _enum(value: int, text: str) -> dict:
+    return {"enumValue": value, "displayText": text}
+
+
+def _case(index: int) -> dict:
+    return {
+        "id": str(index),
+        "headline": f"Sag {index} om overtrædelse af straffeloven § 237",
+        "courtCaseNumber": f"BS-{index}/2024",
+        "officeName": "Østre Landsret",
+        "profession": _enum(1, "Straffesag"),
+        "instance": _enum(2, "2. instans"),
+        "caseType": _enum(3, "Almindelig sag"),
+        "verdictStatus": _enum(1, "Endelig"),
+        "caseSubjects": [_enum(2, "Strafferet"), _enum(7, "Færdselsret")],
+        "caseTags": [{"id": str(i), "displayText": f"Tag {i}"} for i in range(3)],
+        "participants": [
+            {"type": _enum(1, "Part"), "role": _enum(i, "Tiltalt"), "name": None}
+            for i in range(4)
+        ],
+        "verticalCotreatmentGroups": [
+            {
+                "appealCases": [
+                    {"id": f"{index}-{i}", "instance": _enum(1, "1. instans")}
+                    for i in range(2)
+                ]
+            }
+        ],
+        "documents": [
+            {
+                "id": f"{index}-doc",
+                "displayTitle": "Dom",
+                "documentType": _enum(1, "Dom"),
+                "verdictDateTime": "2024-03-01T00:00:00",
+                "references": [
+                    {"markingId": str(i), "content": f"§ {i}", "type": "Lov"}
+                    for i in range(10)
+                ],
+            }
+        ],
+    }
+
+
+def _measure(label: str, raws: list[dict], build) -> None:
+    started = time.perf_counter()
+    cases = [build(raw) for raw in raws]
+    built = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for case in cases:
+        parse_case_fields(case)
+    rendered = time.perf_counter() - started
+
+    del cases
+    tracemalloc.start()
+    cases = [build(raw) for raw in raws]
+    for case in cases:
+        parse_case_fields(case)
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:12} build {len(raws) / built:9.0f} cases/s  "
+        f"fields {len(raws) / rendered:9.0f} cases/s  "
+        f"{retained / len(raws):7.0f} B/case"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--cases", type=int, default=10000)
+    args = parser.parse_args()
+
+    raws = [_case(i) for i in range(args.cases)]
+    _measure("ModelItem", raws, ModelItem.model_validate)
+    _measure("CompactCase", raws, compact_case)
+
+
+if __name__ == "__main__":
+    main()
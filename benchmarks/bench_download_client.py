@@ -0,0 +1,91 @@
+"""Requests/sec of the pooled DownloadClient against a local stand-in API.
+
+Runs a keep-alive HTTP/1.1 server on localhost that answers ``/autoriser`` and
+``/sager`` like domsdatabasen, then compares one-off ``requests.get`` calls
+(a new connection per request, the old behaviour) with a shared
+``DownloadClient`` at several thread counts.
+
+    uv run python benchmarks/bench_download_client.py -n 2000
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from domdb.core.download.client import DownloadClient
+
+PAGE = json.dumps(
+    [{"id": str(i), "headline": f"Sag {i}", "documents": []} for i in range(25)]
+).encode()
+TOKEN = json.dumps({"tokenString": "bench-token"}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(PAGE)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(TOKEN)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(label: str, requests_total: int, threads: int, call) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: call(), range(requests_total)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:28} threads={threads:<3} {requests_total / elapsed:8.0f} req/s "
+        f"({elapsed:.2f}s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        for threads in args.threads:
+            _run(
+                "one-off requests.get",
+                args.requests,
+                threads,
+                lambda: requests.get(f"{base_url}/sager", timeout=10).json(),
+            )
+            with DownloadClient(base_url, pool_size=threads) as client:
+                _run(
+                    "pooled DownloadClient",
+                    args.requests,
+                    threads,
+                    lambda: client.get("sager").json(),
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Cases/sec of each JSON decoding backend over a synthetic page cache.
+
+Writes ``--pages`` page files of ``--cases`` cases, each carrying a base64
+"PDF" of ``--pdf-kb`` kilobytes like the real API, then times decoding every
+page (``read_page``) and the full converter load (``load_cases``: decode plus
+pydantic validation) with each installed backend. The last rows time the
+metadata load writing page snapshots (miss) and reading them back (hit).
+
+    uv run python benchmarks/bench_json_backends.py --pages 40 --pdf-kb 400
+"""
+
+import argparse
+import base64
+import os
+import tempfile
+import time
+
+from loguru import logger
+
+from domdb.core import jsoncodec
+from domdb.core.converters.case_load import load_cases
+from domdb.core.download.storage import save_cases
+from domdb.core.pages import PROJECTIONS, list_page_files, read_page
+
+
+def _enum(value: int, text: str) -> dict:
+    return {"enumValue": value, "displayText": text}
+
+
+def _case(page: int, index: int, pdf: str | None) -> dict:
+    case_id = f"{page}-{index}"
+    return {
+        "id": case_id,
+        "headline": f"Sag {case_id} om overtrædelse af straffeloven § 237",
+        "courtCaseNumber": f"BS-{index}/2024",
+        "officeName": "Østre Landsret",
+        "verdictDateTime": "2024-03-01T00:00:00",
+        "caseSubjects": [_enum(2, "Strafferet"), _enum(7, "Færdselsret")],
+        "caseTags": [{"id": str(i), "displayText": f"Tag {i}"} for i in range(3)],
+        "participants": [
+            {"type": _enum(1, "Part"), "role": _enum(i, "Tiltalt"), "name": None}
+            for i in range(4)
+        ],
+        "documents": [
+            {
+                "id": f"{case_id}-doc",
+                "contentPdf": pdf,
+                "contentPdfBlob": None if pdf else "0" * 64,
+                "displayTitle": "Dom",
+                "documentType": _enum(1, "Dom"),
+                "verdictDateTime": "2024-03-01T00:00:00",
+                "references": [
+                    {"markingId": str(i), "content": f"§ {i}", "type": "Lov"}
+                    for i in range(10)
+                ],
+            }
+        ],
+    }
+
+
+def _build_cache(directory: str, pages: int, cases: int, pdf_kb: int) -> None:
+    pdf = base64.b64encode(os.urandom(pdf_kb * 1024)).decode() if pdf_kb else None
+    for page in range(1, pages + 1):
+        save_cases(page, [_case(page, i, pdf) for i in range(cases)], directory)
+
+
+def _time(label: str, backend: str, count: int, run) -> None:
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:17} {backend:8} {count / elapsed:10.0f} cases/s ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--cases", type=int, default=25)
+    parser.add_argument("--pdf-kb", type=int, default=100)
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as directory:
+        _build_cache(directory, args.pages, args.cases, args.pdf_kb)
+        files = list_page_files(directory)
+        total = args.pages * args.cases
+        size = sum(os.path.getsize(path) for path in files)
+        print(f"{len(files)} pages, {total} cases, {size / 1e6:.0f} MB")
+
+        os.environ["DOMDB_SNAPSHOTS"] = "0"
+        for backend in jsoncodec.available_backends():
+            jsoncodec.set_backend(backend)
+            _time("read_page", backend, total, lambda: [read_page(p) for p in files])
+            _time("load_cases", backend, total, lambda: load_cases(directory))
+
+        # Projections and compact views, as used by the converters and queries.
+        jsoncodec.set_backend()
+        for projection in PROJECTIONS:
+            for compact in (False, True):
+                label = f"{projection}{'/compact' if compact else ''}"
+                _time(
+                    label,
+                    jsoncodec.BACKEND,
+                    total,
+                    lambda: load_cases(
+                        directory, compact=compact, projection=projection
+                    ),
+                )
+
+        os.environ["DOMDB_SNAPSHOTS"] = "1"
+        for label in ("snapshot miss", "snapshot hit"):
+            _time(
+                label,
+                jsoncodec.BACKEND,
+                total,
+                lambda: load_cases(directory, projection="metadata"),
+            )
+
+
+if __name__ == "__main__":
+    main()
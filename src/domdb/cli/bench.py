@@ -0,0 +1,70 @@
+import os
+from typing import List
+
+from domdb.core.converters import pdf_backends
+from domdb.core.converters.html_bench import compare_html, sample_html
+from domdb.core.converters.pdf_bench import compare_backends, sample_pdfs
+
+
+def _percent(value: float | None) -> str:
+    return "ref" if value is None else f"{value * 100:.1f}%"
+
+
+def bench_pdf(directory: str, number: int, backends: List[str]):
+    """Compare PDF text-extraction backends on PDFs from the cache."""
+    directory = os.path.expanduser(directory)
+    available = pdf_backends.available_backends()
+    missing = [name for name in backends if name not in available]
+    if missing:
+        unknown = [name for name in missing if name not in pdf_backends.BACKENDS]
+        problem = "Unknown" if unknown else "Not installed"
+        print(
+            f"{problem} PDF backend(s): {', '.join(unknown or missing)}; "
+            f"installed: {', '.join(available)}"
+        )
+        return
+    pdfs = sample_pdfs(directory, number)
+    if not pdfs:
+        print(f"No cached PDFs in {directory}")
+        return
+    reports = compare_backends(pdfs, backends or None)
+    print(
+        f"{len(pdfs)} PDFs from {directory}; texts compared with {reports[0].backend}"
+    )
+    print(
+        f"{'backend':<12}{'pages':>7}{'pages/s':>10}{'peak MB':>10}"
+        f"{'errors':>8}{'identical':>11}{'similarity':>12}"
+    )
+    for report in reports:
+        print(
+            f"{report.backend:<12}{report.pages:>7}"
+            f"{report.pages_per_second:>10.1f}{report.peak_rss_mb:>10.0f}"
+            f"{report.errors:>8}{_percent(report.identical):>11}"
+            f"{_percent(report.similarity):>12}"
+        )
+
+
+def bench_html(directory: str, number: int):
+    """Compare the fast HTML-to-text path with BeautifulSoup on cached HTML."""
+    directory = os.path.expanduser(directory)
+    docs = sample_html(directory, number)
+    if not docs:
+        print(f"No cached HTML documents in {directory}")
+        return
+    report = compare_html(docs)
+    print(
+        f"{report.documents} HTML documents ({report.megabytes:.1f} MB) from {directory}"
+    )
+    print(f"{'extractor':<16}{'seconds':>9}{'docs/s':>10}")
+    for name, seconds in (
+        ("beautifulsoup", report.soup_seconds),
+        ("html_text", report.fast_seconds),
+    ):
+        rate = report.documents / seconds if seconds else 0.0
+        print(f"{name:<16}{seconds:>9.2f}{rate:>10.0f}")
+    print(
+        f"Speedup {report.speedup:.1f}x; {report.fallbacks} fell back to "
+        f"BeautifulSoup; {len(report.mismatches)} texts differ"
+    )
+    for doc_id in report.mismatches[:10]:
+        print(f"  differs: {doc_id}")
@@ -5,12 +5,12 @@ from domdb.core.converters.json2bib.convert import convert_json_to_bib
 from domdb.core.exceptions import ConversionError
 
 
-def bib(number: int, directory: str, output: str):
+def bib(number: int, directory: str, output: str, workers: int = 1):
     """Convert JSON case files to BibTeX format."""
     directory = os.path.expanduser(directory)
     number = None if number == -1 else number
     try:
-        count = convert_json_to_bib(directory, output, number)
+        count = convert_json_to_bib(directory, output, number, workers)
         print(f"Converted {count} unique cases to {output}")
     except ConversionError as e:
         print(str(e), file=sys.stderr)
@@ -1,16 +1,35 @@
 import sys
 import os
 
-from domdb.core.download.main import load_next_batch
+from domdb.core.download.main import load_next_batch, load_pages
+from domdb.core.download.sync import sync_cases
 from domdb.core.exceptions import DownloadError
 
 
-def download(directory: str):
+def download(directory: str, pages: int = 1, workers: int = 4):
     """Download verdicts from domsdatabasen.dk."""
     directory = os.path.expanduser(directory)
     try:
-        count = load_next_batch(directory)
-        print(f"Successfully fetched {count} cases")
+        if pages > 1:
+            summary = load_pages(directory, pages, workers)
+            print(summary.describe())
+        else:
+            count = load_next_batch(directory)
+            print(f"Successfully fetched {count} cases")
+    except DownloadError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def sync(directory: str, pages: int = -1):
+    """Refresh cached verdicts that were added, corrected or revoked upstream."""
+    directory = os.path.expanduser(directory)
+    try:
+        changes = sync_cases(directory, pages)
+        print(changes.describe())
     except DownloadError as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
@@ -2,16 +2,16 @@ import sys
 import os
 
 from domdb.core.converters.json2evid.processing import convert_json_to_evid
-from domdb.core.exceptions import EvidConversionError
+from domdb.core.exceptions import EvidConversionError, PdfBackendError
 
 
-def j2e(number: int, directory: str, output: str):
+def j2e(number: int, directory: str, output: str, workers: int = 1):
     """Convert JSON case files to EVID directory structure."""
     directory = os.path.expanduser(directory)
     number = None if number == -1 else number
     try:
-        count = convert_json_to_evid(directory, output, number)
+        count = convert_json_to_evid(directory, output, number, workers)
         print(f"Converted {count} cases to EVID in {output}")
-    except EvidConversionError as e:
+    except (EvidConversionError, PdfBackendError) as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
@@ -1,12 +1,14 @@
 from treeparse import cli, command, group, option
 from treeparse.utils.color_config import color_theme
 
-from .download import download
+from .download import download, sync
+from .bench import bench_html, bench_pdf
 from .bib import bib
 from .hay import hay
 from .md import md
 from .j2e import j2e
 from .query import query_count, query_index, query_list
+from .storage import storage_blobs, storage_compress, storage_dedupe, storage_pdfs
 
 app = cli(
     name="domdb",
@@ -28,9 +30,38 @@ download_cmd = command(
     name="download",
     help="Download verdicts from domsdatabasen.dk.",
     callback=download,
+    options=[
+        option(
+            flags=["-p", "--pages"],
+            help="Number of pages to fetch; more than 1 fetches concurrently and stops at the first empty page",
+            arg_type=int,
+            default=1,
+        ),
+        option(
+            flags=["-w", "--workers"],
+            help="Maximum number of pages fetched in parallel",
+            arg_type=int,
+            default=4,
+        ),
+    ],
 )
 app.commands.append(download_cmd)
 
+sync_cmd = command(
+    name="sync",
+    help="Refresh cached verdicts that were added, corrected or revoked upstream.",
+    callback=sync,
+    options=[
+        option(
+            flags=["-p", "--pages"],
+            help="Maximum number of API pages to walk (-1 for all)",
+            arg_type=int,
+            default=-1,
+        ),
+    ],
+)
+app.commands.append(sync_cmd)
+
 output_cmd = group(
     name="output",
     help="Commands for outputting data.",
@@ -53,6 +84,12 @@ bib_cmd = command(
             arg_type=str,
             default="resources/cases.bib",
         ),
+        option(
+            flags=["-w", "--workers"],
+            help="Processes used to parse and validate page files",
+            arg_type=int,
+            default=1,
+        ),
     ],
 )
 output_cmd.commands.append(bib_cmd)
@@ -74,6 +111,12 @@ hay_cmd = command(
             arg_type=str,
             default="resources/cases.yml",
         ),
+        option(
+            flags=["-w", "--workers"],
+            help="Processes used to parse and validate page files",
+            arg_type=int,
+            default=1,
+        ),
     ],
 )
 output_cmd.commands.append(hay_cmd)
@@ -115,6 +158,12 @@ md_cmd = command(
             flag=True,
             default=False,
         ),
+        option(
+            flags=["-w", "--workers"],
+            help="Processes used to parse and validate page files",
+            arg_type=int,
+            default=1,
+        ),
     ],
 )
 output_cmd.commands.append(md_cmd)
@@ -136,6 +185,12 @@ j2e_cmd = command(
             arg_type=str,
             default="evid",
         ),
+        option(
+            flags=["-w", "--workers"],
+            help="Processes used to parse and validate page files",
+            arg_type=int,
+            default=1,
+        ),
     ],
 )
 output_cmd.commands.append(j2e_cmd)
@@ -244,6 +299,86 @@ query_cmd.commands.append(query_list_cmd)
 
 app.subgroups.append(query_cmd)
 
+storage_cmd = group(
+    name="storage",
+    help="Maintain the local case cache.",
+)
+
+storage_compress_cmd = command(
+    name="compress",
+    help="Gzip cached page files in place (readers handle both formats).",
+    callback=storage_compress,
+)
+storage_cmd.commands.append(storage_compress_cmd)
+
+storage_blobs_cmd = command(
+    name="blobs",
+    help="Move inline PDFs from cached pages into a content-addressed blob store.",
+    callback=storage_blobs,
+)
+storage_cmd.commands.append(storage_blobs_cmd)
+
+storage_dedupe_cmd = command(
+    name="dedupe",
+    help="Keep only the newest copy of each case id across cached pages.",
+    callback=storage_dedupe,
+)
+storage_cmd.commands.append(storage_dedupe_cmd)
+
+storage_pdfs_cmd = command(
+    name="pdfs",
+    help="Count cached PDFs by extraction outcome (text, scanned, failed).",
+    callback=storage_pdfs,
+)
+storage_cmd.commands.append(storage_pdfs_cmd)
+
+app.subgroups.append(storage_cmd)
+
+bench_cmd = group(
+    name="bench",
+    help="Benchmark parts of the pipeline on the local cache.",
+)
+
+bench_pdf_cmd = command(
+    name="pdf",
+    help="Compare PDF text-extraction backends on cached PDFs.",
+    callback=bench_pdf,
+    options=[
+        option(
+            flags=["-n", "--number"],
+            help="Number of cached PDFs to sample",
+            arg_type=int,
+            default=20,
+        ),
+        option(
+            flags=["-b", "--backend"],
+            dest="backends",
+            help="Backends to compare, the first as reference; empty compares all available",
+            arg_type=str,
+            nargs="+",
+            default=[],
+        ),
+    ],
+)
+bench_cmd.commands.append(bench_pdf_cmd)
+
+bench_html_cmd = command(
+    name="html",
+    help="Compare fast HTML-to-text extraction with BeautifulSoup on cached HTML.",
+    callback=bench_html,
+    options=[
+        option(
+            flags=["-n", "--number"],
+            help="Number of cached HTML documents to sample",
+            arg_type=int,
+            default=200,
+        ),
+    ],
+)
+bench_cmd.commands.append(bench_html_cmd)
+
+app.subgroups.append(bench_cmd)
+
 
 def main():
     app.run()
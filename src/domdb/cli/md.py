@@ -4,7 +4,7 @@ from typing import List
 
 from loguru import logger
 from domdb.core.converters.json2md.convert import convert_json_to_md
-from domdb.core.exceptions import ConversionError
+from domdb.core.exceptions import ConversionError, PdfBackendError
 
 
 def md(
@@ -14,6 +14,7 @@ def md(
     split_by_year: bool,
     keywords: List[str],
     full_text: bool,
+    workers: int = 1,
 ):
     """Convert JSON case files to Markdown format."""
     directory = os.path.expanduser(directory)
@@ -23,11 +24,11 @@ def md(
     )
     try:
         count = convert_json_to_md(
-            directory, output, number, split_by_year, keywords, full_text
+            directory, output, number, split_by_year, keywords, full_text, workers
         )
         logger.info(f"Successfully converted {count} cases")
         print(f"Converted {count} unique cases")
-    except ConversionError as e:
+    except (ConversionError, PdfBackendError) as e:
         logger.error(f"Conversion error: {e!s}")
         print(str(e), file=sys.stderr)
         sys.exit(1)
@@ -1,9 +1,11 @@
 import json
 import os
+import sys
 from typing import List, Optional
 
 from loguru import logger
 
+from domdb.core.exceptions import PdfBackendError
 from domdb.core.query import QueryParams, build_index, count_cases, list_cases
 
 
@@ -59,7 +61,11 @@ def query_count(
     directory = os.path.expanduser(directory)
     params = _params(keywords, paragraph, from_date, to_date, full_text, court, subject)
     logger.info(f"Query count: {params}")
-    total = count_cases(directory, params)
+    try:
+        total = count_cases(directory, params)
+    except PdfBackendError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
     print(total)
 
 
@@ -88,7 +94,11 @@ def query_list(
         limit=None if number == -1 else number,
     )
     logger.info(f"Query list: {params}")
-    hits = list_cases(directory, params)
+    try:
+        hits = list_cases(directory, params)
+    except PdfBackendError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
 
     if format == "json":
         print(json.dumps([hit.as_dict() for hit in hits], ensure_ascii=False, indent=2))
@@ -0,0 +1,59 @@
+import os
+
+from domdb.core.blobs import ingest_cache
+from domdb.core.pages import compress_cache
+from domdb.core.store import dedupe_cache
+from domdb.core.textcache import FAILED, SCANNED, TEXT, get_text_cache, text_cache_path
+
+
+def storage_compress(directory: str):
+    """Gzip every plain JSON page file in the cache directory in place."""
+    directory = os.path.expanduser(directory)
+    files, before, after = compress_cache(directory)
+    if not files:
+        print(f"No uncompressed page files in {directory}")
+        return
+    print(
+        f"Compressed {files} page files in {directory} "
+        f"({before / 1e6:.1f} MB -> {after / 1e6:.1f} MB)"
+    )
+
+
+def storage_blobs(directory: str):
+    """Move inline base64 PDFs from cached pages into the blob store."""
+    directory = os.path.expanduser(directory)
+    pages, moved = ingest_cache(directory)
+    if not moved:
+        print(f"No inline PDFs in {directory}")
+        return
+    print(f"Moved {moved} PDFs from {pages} page files into {directory}/blobs")
+
+
+def storage_dedupe(directory: str):
+    """Keep only the newest copy of each case id across cached pages."""
+    directory = os.path.expanduser(directory)
+    files, dropped = dedupe_cache(directory)
+    if not dropped:
+        print(f"No duplicate cases in {directory}")
+        return
+    print(f"Dropped {dropped} superseded cases from {files} page files")
+
+
+def storage_pdfs(directory: str):
+    """Report PDF extraction outcomes recorded in the text cache's registry."""
+    cache = get_text_cache()
+    if cache is None:
+        print("Text cache is disabled; no PDF registry to report")
+        return
+    summary = cache.pdf_summary()
+    if not summary:
+        print(f"No PDFs recorded in {text_cache_path()} yet")
+        return
+    print(f"PDF registry in {text_cache_path()}")
+    print(f"{'status':<10}{'documents':>11}{'pages':>9}{'MB':>10}")
+    total = [0, 0, 0]
+    for status in (TEXT, SCANNED, FAILED):
+        docs, pages, size = summary.get(status, (0, 0, 0))
+        print(f"{status:<10}{docs:>11}{pages:>9}{size / 1e6:>10.1f}")
+        total = [total[0] + docs, total[1] + pages, total[2] + size]
+    print(f"{'total':<10}{total[0]:>11}{total[1]:>9}{total[2] / 1e6:>10.1f}")
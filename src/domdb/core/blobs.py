@@ -0,0 +1,88 @@
+"""Content-addressed store for document PDFs.
+
+Verdict pages embed every PDF as base64 in ``Document.contentPdf``. Ingesting a
+page moves each PDF into ``<cache>/blobs/<aa>/<sha256>`` as raw bytes and leaves
+the hash in ``Document.contentPdfBlob``. Page files shrink to metadata and HTML,
+identical PDFs shared between cases are stored once, and text extraction
+memory-maps the blob instead of decoding base64 into memory.
+"""
+
+import base64
+import binascii
+import hashlib
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from loguru import logger
+
+from .pages import list_page_files, rewrite_page
+from .tempfiles import mkstemp
+
+BLOB_DIRNAME = "blobs"
+
+
+def blob_path(directory: str, key: str) -> str:
+    return os.path.join(directory, BLOB_DIRNAME, key[:2], key)
+
+
+def put_blob(directory: str, data: bytes) -> str:
+    """Store ``data`` under its SHA-256 and return the key. Idempotent."""
+    key = hashlib.sha256(data).hexdigest()
+    path = blob_path(directory, key)
+    if os.path.exists(path):
+        return key
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = mkstemp(os.path.dirname(path), ".blob.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return key
+
+
+@contextmanager
+def open_blob(directory: str, key: str) -> Iterator[mmap.mmap]:
+    """Memory-map a stored blob read-only."""
+    with open(blob_path(directory, key), "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def externalize_case(case: dict, directory: str) -> int:
+    """Move a raw case's inline PDFs into the blob store. Returns PDFs moved."""
+    moved = 0
+    for doc in case.get("documents") or []:
+        content = doc.get("contentPdf")
+        if not content:
+            continue
+        try:
+            data = base64.b64decode(content, validate=True)
+        except (binascii.Error, ValueError):
+            logger.warning(f"Keeping undecodable PDF inline for doc {doc.get('id')}")
+            continue
+        doc["contentPdfBlob"] = put_blob(directory, data)
+        doc["contentPdf"] = None
+        moved += 1
+    return moved
+
+
+def ingest_cache(directory: str) -> tuple[int, int]:
+    """Externalize inline PDFs for every page file in ``directory``.
+
+    Pages without inline PDFs are left untouched. Returns
+    ``(pages_rewritten, pdfs_moved)``.
+    """
+    pages = moved = 0
+    for path in list_page_files(directory):
+        page_moved = rewrite_page(path, lambda case: externalize_case(case, directory))
+        if page_moved:
+            pages += 1
+            moved += page_moved
+            logger.info(f"Moved {page_moved} PDFs from {path} into the blob store")
+    return pages, moved
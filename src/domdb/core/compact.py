@@ -0,0 +1,154 @@
+"""Lightweight read-only case objects for hot loops.
+
+``ModelItem.model_validate`` builds and validates the whole nested tree of every
+case (documents, participants, appeal cases, enum wrappers). Converters and
+queries mostly read a headline, a date and a few display texts, so loaders can
+return ``CompactCase`` objects instead: slotted classes generated from the
+pydantic models, with the same attribute names and defaults, that
+
+- copy scalar fields without validation,
+- share one instance per distinct enum wrapper (``displayText`` interned), and
+- keep nested lists as raw dicts until the attribute is first read.
+
+They are views for reading; use ``ModelItem`` when a case must be validated or
+serialised (EVID export).
+"""
+
+import sys
+import typing
+from functools import cache
+
+from pydantic import BaseModel
+
+from .model import ModelItem
+
+_ENUM_FIELDS = ("enumValue", "displayText")
+_LAZY_PREFIX = "_raw_"
+
+
+def _model_type(annotation) -> tuple[type[BaseModel] | None, bool]:
+    """``(nested model, is_list)`` for a field annotation, or ``(None, False)``."""
+    is_list = typing.get_origin(annotation) in (list, typing.List)
+    for arg in typing.get_args(annotation) or (annotation,):
+        if typing.get_origin(arg) in (list, typing.List):
+            is_list = True
+            arg = typing.get_args(arg)[0]
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg, is_list
+    return None, is_list
+
+
+def _is_enum(model: type[BaseModel]) -> bool:
+    return tuple(model.model_fields) == _ENUM_FIELDS
+
+
+@cache
+def _enum(model: type[BaseModel], value, text) -> object:
+    obj = object.__new__(compact_type(model))
+    obj.enumValue = value
+    obj.displayText = sys.intern(text) if isinstance(text, str) else text
+    return obj
+
+
+class _Built(list):
+    """Marker for a lazy list that has already been materialised."""
+
+    __slots__ = ()
+
+
+def _lazy_list(name: str, model: type[BaseModel]) -> property:
+    slot = _LAZY_PREFIX + name
+
+    def get(self):
+        value = getattr(self, slot)
+        if type(value) is _Built:
+            return value
+        built = _Built(convert(model, item) for item in value or ())
+        setattr(self, slot, built)
+        return built
+
+    return property(get, doc=f"List of {model.__name__}, built on first access.")
+
+
+@cache
+def compact_type(model: type[BaseModel]) -> type:
+    """Slotted class mirroring ``model``'s fields, generated once per model."""
+    scalars, nested, lists = [], [], []
+    for name, field in model.model_fields.items():
+        sub, is_list = _model_type(field.annotation)
+        if is_list:
+            lists.append((name, sub))
+        elif sub is not None:
+            nested.append((name, sub))
+        else:
+            scalars.append(name)
+
+    namespace = {
+        "__slots__": (
+            *scalars,
+            *(name for name, _ in nested),
+            *(_LAZY_PREFIX + name for name, _ in lists),
+            *(("_cache_dir",) if model is ModelItem else ()),
+        ),
+        "__module__": __name__,
+        "__doc__": f"Compact read-only view of ``{model.__name__}``.",
+        "_scalars": tuple(scalars),
+        "_nested": tuple(nested),
+        "_lists": tuple(lists),
+        "__repr__": _repr,
+    }
+    if _is_enum(model):
+        namespace["__reduce__"] = _reduce_enum
+    for name, sub in lists:
+        namespace[name] = _lazy_list(name, sub) if sub else _plain_list(name)
+    cls = type(f"Compact{model.__name__}", (), namespace)
+    cls._model = model
+    globals()[cls.__name__] = cls  # importable by name, so instances pickle
+    return cls
+
+
+def _reduce_enum(self):
+    # Unpickled enums (e.g. from a worker process) rejoin the shared instances.
+    return _enum, (type(self)._model, self.enumValue, self.displayText)
+
+
+def _plain_list(name: str) -> property:
+    slot = _LAZY_PREFIX + name
+    return property(lambda self: getattr(self, slot) or [])
+
+
+def _repr(self) -> str:
+    shown = ", ".join(
+        f"{name}={getattr(self, name)!r}"
+        for name in self._scalars
+        if getattr(self, name) is not None
+    )
+    return f"{type(self).__name__}({shown})"
+
+
+def convert(model: type[BaseModel], raw: dict | None):
+    """Build the compact object for one raw dict of ``model`` (no validation)."""
+    if raw is None:
+        return None
+    if _is_enum(model):
+        return _enum(model, raw.get("enumValue"), raw.get("displayText"))
+    cls = compact_type(model)
+    obj = object.__new__(cls)
+    get = raw.get
+    for name in cls._scalars:
+        setattr(obj, name, get(name))
+    for name, sub in cls._nested:
+        setattr(obj, name, convert(sub, get(name)))
+    for name, _sub in cls._lists:
+        setattr(obj, _LAZY_PREFIX + name, get(name))
+    return obj
+
+
+CompactCase = compact_type(ModelItem)
+
+
+def compact_case(raw: dict, cache_dir: str | None = None) -> CompactCase:
+    """Wrap one raw case dict from a page file as a ``CompactCase``."""
+    case = convert(ModelItem, raw)
+    case._cache_dir = cache_dir
+    return case
@@ -6,6 +6,15 @@ DEFAULT_CONFIG = {
     "bib_output": "resources/cases.bib",
     "hay_output": "resources/cases.yml",
     "batch_size": 25,
+    "compress": False,
+    "blobs": False,
+    "text_cache": "~/.domdb/text-cache.sqlite",
+    "text_cache_mb": 512,
+    "pdf_backend": "pdfplumber",
+    "extract_workers": 0,
+    "extract_timeout": 300,
+    "extract_max_rss_mb": 2048,
+    "extract_split_pages": 50,
 }
 
 CONFIG_PATH = os.path.expanduser("~/.domdb/config.toml")
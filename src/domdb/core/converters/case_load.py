@@ -1,59 +1,144 @@
 """Shared case loading for converter modules."""
 
-import glob
-import json
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from typing import Type
 
 from loguru import logger
 from pydantic import ValidationError
 
+from ..compact import CompactCase, compact_case
 from ..exceptions import ConversionError
 from ..model import ModelItem
+from ..pages import PROJECTIONS, iter_page, list_page_files
+from ..snapshots import SnapshotStats, page_cases
 
 
-def load_cases(
+def _parse_file_cases(
+    file_path: str, compact: bool = False, projection: str = "full"
+) -> Iterator[ModelItem | CompactCase]:
+    """Valid cases with an id from one page file, parsed incrementally."""
+    cache_dir = os.path.dirname(file_path)
+    for case_data in iter_page(file_path, projection):
+        try:
+            if compact:
+                case = compact_case(case_data, cache_dir)
+            else:
+                case = ModelItem.model_validate(case_data)
+                case._cache_dir = cache_dir
+        except ValidationError as e:
+            logger.error(f"Invalid case data: {e!s}")
+            continue
+        if not case.id:
+            logger.error("Skipping case without id")
+            continue
+        yield case
+
+
+def _iter_file_cases(
+    file_path: str,
+    compact: bool = False,
+    projection: str = "full",
+    stats: SnapshotStats | None = None,
+) -> Iterable[ModelItem | CompactCase]:
+    """Cases of one page file, from its snapshot when one is valid."""
+    logger.info(f"Processing file: {file_path}")
+    return page_cases(
+        file_path,
+        projection,
+        compact,
+        lambda: _parse_file_cases(file_path, compact, projection),
+        stats,
+    )
+
+
+def _load_file_cases(
+    args: tuple[str, bool, str],
+) -> tuple[list[ModelItem | CompactCase], SnapshotStats]:
+    """Worker function for parallel loading: one page file → its cases."""
+    stats = SnapshotStats()
+    return list(_iter_file_cases(*args, stats=stats)), stats
+
+
+def iter_cases(
     directory: str,
-    number: int | None = None,
     *,
     error_cls: Type[Exception] = ConversionError,
-) -> list[ModelItem]:
-    """Glob directory/*.json → validate ModelItem → optional cap.
+    compact: bool = False,
+    workers: int = 1,
+    projection: str = "full",
+) -> Iterator[ModelItem | CompactCase]:
+    """Stream valid cases with an id from every page file, in file order.
 
-    Raises error_cls (default ConversionError; use EvidConversionError for evid)
-    if no JSON files are found. Skips invalid cases and cases without id.
+    Page files are parsed incrementally, so with one worker memory is bounded
+    by the largest case rather than the largest page. With ``workers > 1``
+    files are parsed and validated in a process pool and yielded in the same
+    order as the serial path; the pool is terminated as soon as the caller
+    stops iterating. Pages loaded with a PDF-free projection are served from
+    their snapshots when valid (see ``snapshots``) and the hit rate is logged
+    at the end. Raises error_cls if no JSON files are found; see
+    ``load_cases`` for ``compact`` and ``projection``.
     """
+    if projection not in PROJECTIONS:
+        raise ValueError(f"Unknown projection {projection!r}")
     logger.info(f"Loading verdicts from directory: {directory}")
-    json_files = glob.glob(f"{directory}/*.json")
+    json_files = list_page_files(directory)
     logger.info(f"Found {len(json_files)} JSON files")
     if not json_files:
         raise error_cls(f"No JSON files found in {directory}")
 
-    cases: list[ModelItem] = []
-    total_raw = 0
-    for file_path in json_files:
-        logger.info(f"Processing file: {file_path}")
-        with open(file_path, "r", encoding="utf-8") as f:
-            cases_data = json.load(f)
-            total_raw += len(cases_data)
-            logger.info(f"Loaded {len(cases_data)} raw cases from {file_path}")
-            for case_data in cases_data:
-                try:
-                    case = ModelItem.model_validate(case_data)
-                    if not case.id:
-                        logger.error("Skipping case without id")
-                        continue
-                    cases.append(case)
-                    if number is not None and len(cases) >= number:
-                        logger.info(
-                            f"Total raw cases loaded: {total_raw}, "
-                            f"valid cases collected: {len(cases)}"
-                        )
-                        return cases
-                except ValidationError as e:
-                    logger.error(f"Invalid case data: {e!s}")
-                    continue
-
-    logger.info(
-        f"Total raw cases loaded: {total_raw}, valid cases collected: {len(cases)}"
+    workers = min(workers, len(json_files))
+    stats = SnapshotStats()
+    try:
+        if workers <= 1:
+            for file_path in json_files:
+                yield from _iter_file_cases(file_path, compact, projection, stats)
+            return
+
+        logger.info(f"Loading {len(json_files)} files with {workers} processes")
+        with multiprocessing.Pool(workers) as pool:
+            tasks = [(file_path, compact, projection) for file_path in json_files]
+            for cases, file_stats in pool.imap(_load_file_cases, tasks):
+                stats.hits += file_stats.hits
+                stats.misses += file_stats.misses
+                yield from cases
+    finally:
+        stats.report()
+
+
+def load_cases(
+    directory: str,
+    number: int | None = None,
+    *,
+    error_cls: Type[Exception] = ConversionError,
+    compact: bool = False,
+    workers: int = 1,
+    projection: str = "full",
+) -> list[ModelItem] | list[CompactCase]:
+    """Page files (plain or gzipped) → validate ModelItem → optional cap.
+
+    Raises error_cls (default ConversionError; use EvidConversionError for evid)
+    if no JSON files are found. Skips invalid cases and cases without id.
+    With ``compact=True`` cases are returned as unvalidated ``CompactCase``
+    views, which is much cheaper when only display fields are read.
+    ``workers > 1`` parses page files in a process pool; the result (order,
+    cap, skipped cases) is identical to the serial load. ``projection``
+    ("metadata", "html" or "full", see ``pages.PROJECTIONS``) drops document
+    bodies the caller does not need before they are decoded or validated.
+    """
+    cases = list(
+        islice(
+            iter_cases(
+                directory,
+                error_cls=error_cls,
+                compact=compact,
+                workers=workers,
+                projection=projection,
+            ),
+            number,
+        )
     )
+    logger.info(f"Valid cases collected: {len(cases)}")
     return cases
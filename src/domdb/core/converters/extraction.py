@@ -0,0 +1,474 @@
+"""PDF text extraction in isolated worker processes.
+
+pdfplumber can spend many minutes and gigabytes of RAM on a single bad PDF.
+``ExtractionService`` runs each PDF document in a worker process and watches
+it from the parent: a document that exceeds its wall-clock ``timeout`` or
+whose worker grows past ``max_rss_mb`` of resident memory is killed, logged
+and treated as unreadable, and the worker is replaced. The rest of the batch
+carries on.
+
+Callers submit whole cases (``submit`` / ``attach``) and read each case's
+page texts from its ``ExtractionJob``, in the same order as
+``text_utils.iter_case_page_texts``. Workers send every page as soon as it is
+extracted, so a reader gets a PDF's first pages while the rest are still
+being parsed, and a reader that stops early (a keyword search that has seen
+all its keywords) closes the job, which stops the workers still busy with it.
+Cached texts, known-scanned PDFs and HTML documents are resolved in the parent
+without a worker; newly extracted PDF texts are stored in the text cache and
+every PDF's outcome (including kills) in its registry. Abandoned documents
+are neither cached nor recorded.
+
+A PDF longer than ``split_pages`` pages is spread over several workers: the
+first worker extracts the first range and reports the page count, the other
+ranges are queued ahead of every other document, and the texts are put back
+together in page order. One very long verdict then no longer runs alone at
+the end of a batch. The time and memory limits apply to each range; a failed
+range stops the rest of the document, whose text then ends at the first range
+that did not complete, and the document is recorded as unreadable.
+
+Workers are reused between documents, but the allocator rarely hands memory
+back, so a worker that finishes a document above ``RECYCLE_RSS`` of the
+memory limit is replaced rather than carrying that footprint into the next
+(harmless) document and being killed for it.
+
+Limits come from the config (``extract_workers``, ``extract_timeout``,
+``extract_max_rss_mb``, ``extract_split_pages``). Resident memory is read
+from ``/proc``; where that is unavailable only the timeout applies.
+"""
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+from multiprocessing.connection import Connection, wait
+
+from loguru import logger
+
+from ..config import load_config
+from ..model import Document, ModelItem
+from ..textcache import get_text_cache
+from . import pdf_backends
+from .text_utils import (
+    DocumentKey,
+    cached_texts,
+    has_content,
+    html_texts,
+    pdf_page_count,
+    pdf_page_texts,
+    store_texts,
+)
+
+T = TypeVar("T")
+
+# How often busy workers are checked against their limits, in seconds.
+POLL_INTERVAL = 0.2
+
+# A worker that ends a task above this fraction of max_rss_mb is replaced.
+RECYCLE_RSS = 0.5
+
+
+def _extract(
+    conn: Connection,
+    cache_dir: str | None,
+    doc: Document,
+    pages: range | None,
+    split_pages: int,
+) -> None:
+    """Send one task's page texts to ``conn``, then ``(page_count, ok)``.
+
+    Each page is sent as a ``str`` as soon as it is extracted. A whole document
+    (``pages`` None) longer than ``split_pages`` only has its first
+    ``split_pages`` pages extracted, and its page count is reported so the
+    parent can queue the rest; otherwise the count is None.
+    """
+    count = None
+    if pages is None and split_pages:
+        total = pdf_page_count(cache_dir, doc)
+        if total is not None and total > split_pages:
+            count, pages = total, range(split_pages)
+    sent = 0
+    try:
+        for text in pdf_page_texts(cache_dir, doc, pages):
+            conn.send(text)
+            sent += 1
+    except Exception as e:
+        logger.warning(
+            f"Failed to extract text from PDF for doc {doc.id or 'unknown'}: {e}"
+        )
+        conn.send((None, False))
+        return
+    # A scanned PDF has no text in its first range; don't extract the others.
+    conn.send((count if sent else None, True))
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker loop: ``(cache_dir, doc, pages, split_pages)`` in, ``_extract`` out."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        _extract(conn, *task)
+
+
+def _rss_bytes(pid: int) -> int | None:
+    """Resident set size of a process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ExtractionJob:
+    """Page texts of one submitted case, streamed as its documents are extracted.
+
+    Iterating the job yields the case's page texts in document order, each PDF
+    page as soon as a worker has sent it. ``close`` abandons the documents
+    still being extracted; ``result`` reads the remaining pages into a list.
+    """
+
+    def __init__(self, service: "ExtractionService", case: ModelItem):
+        self.case = case
+        self._service = service
+        self._docs: list[list[str] | _Pdf] = []
+        self._pending = 0
+        self._pages = self._stream()
+
+    @property
+    def done(self) -> bool:
+        return self._pending == 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self._pages
+
+    def result(self) -> list[str]:
+        """Block until every document is done; returns the unread page texts."""
+        return list(self._pages)
+
+    def close(self) -> None:
+        """Stop reading; documents still being extracted are abandoned."""
+        self._pages.close()
+        for doc in self._docs:
+            if isinstance(doc, _Pdf) and not doc.finished:
+                self._service._cancel(doc)
+
+    def _stream(self) -> Iterator[str]:
+        for doc in self._docs:
+            if isinstance(doc, _Pdf):
+                yield from self._pdf_pages(doc)
+            else:
+                yield from doc
+
+    def _pdf_pages(self, pdf: "_Pdf") -> Iterator[str]:
+        # Index loop: the first range of a long PDF adds the others when done.
+        part = 0
+        while part < len(pdf.parts):
+            current = pdf.parts[part]
+            if current.unread:
+                yield current.unread.popleft()
+            elif current.ok:
+                part += 1
+            elif current.ok is False:
+                return
+            elif self._service.closed:
+                raise RuntimeError("Extraction service was closed")
+            else:
+                self._service._pump(block=True)
+
+
+class _Part:
+    """One page range of a PDF: pages not yet read, and all pages for the cache."""
+
+    def __init__(self, keep: bool):
+        self.unread: deque[str] = deque()
+        self.texts: list[str] | None = [] if keep else None
+        self.ok: bool | None = None  # None while it is being extracted
+
+
+class _Pdf:
+    """A PDF document being extracted, whole or in page ranges."""
+
+    def __init__(self, job: ExtractionJob, key: DocumentKey | None, doc):
+        self.job = job
+        self.key = key
+        self.doc = doc
+        self.parts = [_Part(key is not None)]
+        self.failed = False
+        self.cancelled = False
+        self.finished = False
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        # (document, part index, page range or None for the whole document)
+        self.task: tuple[_Pdf, int, range | None] | None = None
+        self.deadline = 0.0
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionService:
+    """Pool of extraction workers with per-document time and memory limits.
+
+    Use as a context manager so the workers are shut down. Arguments left as
+    None are read from the config.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        timeout: float | None = None,
+        max_rss_mb: float | None = None,
+        split_pages: int | None = None,
+    ):
+        pdf_backends.backend_name()  # fail here, not in every worker
+        config = load_config()
+        workers = config["extract_workers"] if workers is None else workers
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = config["extract_timeout"] if timeout is None else timeout
+        max_rss_mb = config["extract_max_rss_mb"] if max_rss_mb is None else max_rss_mb
+        self.max_rss = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self.split_pages = (
+            config["extract_split_pages"] if split_pages is None else split_pages
+        )
+        self.killed = 0
+        self.cancelled = 0  # documents abandoned by their reader
+        self.recycled = 0  # workers replaced for their leftover memory
+        self.split = 0  # documents spread over several workers
+        self.closed = False
+        self._cache = get_text_cache()
+        self._context = multiprocessing.get_context()
+        self._queue: deque[tuple[_Pdf, int, range | None]] = deque()
+        self._idle: list[_Worker] = []
+        self._busy: list[_Worker] = []
+
+    def __enter__(self) -> "ExtractionService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop all workers; unfinished documents are abandoned."""
+        self.closed = True
+        for worker in self._busy:
+            worker.kill()
+        for worker in self._idle:
+            worker.stop()
+        self._busy.clear()
+        self._idle.clear()
+        self._queue.clear()
+
+    def submit(self, case: ModelItem) -> ExtractionJob:
+        """Queue a case's documents for extraction and return its job."""
+        job = ExtractionJob(self, case)
+        for doc in case.documents or []:
+            if not has_content(doc):
+                continue
+            key, texts = cached_texts(doc, self._cache, case._cache_dir)
+            if texts is None and doc.contentHtml:
+                texts = html_texts(doc)
+                store_texts(self._cache, key, doc, texts)
+            if texts is None:
+                pdf = _Pdf(job, key, doc)
+                job._docs.append(pdf)
+                job._pending += 1
+                self._queue.append((pdf, 0, None))
+            else:
+                job._docs.append(texts)
+        self._pump(block=False)
+        return job
+
+    def extract(self, cases: Iterable[ModelItem]) -> Iterator[list[str]]:
+        """Page texts for each case, in order (see ``attach``)."""
+        for _case, job in self.attach((case, case) for case in cases):
+            yield job.result()
+
+    def attach(
+        self, items: Iterable[tuple[T, ModelItem | None]]
+    ) -> Iterator[tuple[T, ExtractionJob | None]]:
+        """Yield ``(payload, job)`` for ``(payload, case)`` pairs, in order.
+
+        Pairs whose case is None pass through with None, so callers can stream
+        every item and only pay for the ones that need text. Up to twice the
+        worker count of cases are submitted ahead of the item being returned,
+        which keeps all workers busy while ``items`` stays a lazy stream.
+
+        A job is closed when the next item is requested: read its pages before
+        that. Pages left unread are abandoned, so a caller that stops reading
+        early also stops the extraction.
+        """
+        pending: deque[tuple[T, ExtractionJob | None]] = deque()
+        lookahead = 2 * self.workers
+        for payload, case in items:
+            pending.append((payload, self.submit(case) if case is not None else None))
+            while pending and (
+                pending[0][1] is None or pending[0][1].done or len(pending) > lookahead
+            ):
+                yield from self._hand_over(*pending.popleft())
+        while pending:
+            yield from self._hand_over(*pending.popleft())
+
+    @staticmethod
+    def _hand_over(
+        payload: T, job: ExtractionJob | None
+    ) -> Iterator[tuple[T, ExtractionJob | None]]:
+        try:
+            yield payload, job
+        finally:
+            if job is not None:
+                job.close()
+
+    def _pump(self, block: bool) -> None:
+        """Dispatch queued documents, collect pages and enforce limits."""
+        self._dispatch()
+        if not self._busy:
+            return
+        ready = wait([w.conn for w in self._busy], POLL_INTERVAL if block else 0)
+        now = time.monotonic()
+        for worker in list(self._busy):
+            if worker not in self._busy:
+                continue  # stopped along with a failed range of its document
+            if worker.conn in ready:
+                try:
+                    while worker.task is not None and worker.conn.poll():
+                        self._receive(worker, worker.conn.recv())
+                except (EOFError, OSError):
+                    self._kill(worker, "worker exited")
+            elif now > worker.deadline:
+                self._kill(worker, f"timed out after {self.timeout:g}s")
+            elif self.max_rss:
+                rss = _rss_bytes(worker.process.pid)
+                if rss is not None and rss > self.max_rss:
+                    self._kill(worker, f"exceeded {self.max_rss >> 20} MB RSS")
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queue and (self._idle or len(self._busy) < self.workers):
+            worker = self._idle.pop() if self._idle else _Worker(self._context)
+            pdf, part, pages = worker.task = self._queue.popleft()
+            worker.deadline = (
+                time.monotonic() + self.timeout if self.timeout else float("inf")
+            )
+            self._busy.append(worker)
+            try:
+                worker.conn.send(
+                    (pdf.job.case._cache_dir, pdf.doc, pages, self.split_pages)
+                )
+            except OSError:
+                self._kill(worker, "worker exited")
+
+    def _receive(self, worker: _Worker, message: str | tuple) -> None:
+        pdf, part, _pages = worker.task
+        if isinstance(message, str):
+            current = pdf.parts[part]
+            current.unread.append(message)
+            if current.texts is not None:
+                current.texts.append(message)
+            return
+        count, ok = message
+        worker.task = None
+        self._busy.remove(worker)
+        self._release(worker)
+        if count is not None:
+            self._split(pdf, count)
+        self._part_done(pdf, part, ok)
+
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker to the idle list, or stop it if it kept its peak RSS."""
+        if self.max_rss:
+            rss = _rss_bytes(worker.process.pid)
+            if rss is not None and rss > self.max_rss * RECYCLE_RSS:
+                logger.debug(f"Replacing extraction worker holding {rss >> 20} MB")
+                worker.stop()
+                self.recycled += 1
+                return
+        self._idle.append(worker)
+
+    def _split(self, pdf: _Pdf, count: int) -> None:
+        """Queue the rest of a long PDF, ahead of other documents."""
+        size = self.split_pages
+        ranges = [
+            range(start, min(start + size, count)) for start in range(size, count, size)
+        ]
+        pdf.parts.extend(_Part(pdf.key is not None) for _ in ranges)
+        for part, pages in reversed(list(enumerate(ranges, start=1))):
+            self._queue.appendleft((pdf, part, pages))
+        self.split += 1
+        logger.debug(
+            f"Extracting {count} pages of doc {pdf.doc.id or 'unknown'} "
+            f"in {len(ranges) + 1} ranges"
+        )
+
+    def _part_done(self, pdf: _Pdf, part: int, ok: bool) -> None:
+        pdf.parts[part].ok = ok
+        if not ok and not pdf.failed:
+            # The document is unreadable; don't extract its remaining ranges.
+            pdf.failed = True
+            self._abandon(pdf)
+        self._check_done(pdf)
+
+    def _cancel(self, pdf: _Pdf) -> None:
+        pdf.cancelled = True
+        self.cancelled += 1
+        self._abandon(pdf)
+        self._check_done(pdf)
+
+    def _abandon(self, pdf: _Pdf) -> None:
+        """Drop a document's queued ranges and stop the workers busy with it."""
+        for _pdf, part, _pages in self._queue:
+            if _pdf is pdf:
+                pdf.parts[part].ok = False
+        self._queue = deque(task for task in self._queue if task[0] is not pdf)
+        for worker in [w for w in self._busy if w.task[0] is pdf]:
+            pdf.parts[worker.task[1]].ok = False
+            worker.kill()
+            self._busy.remove(worker)
+
+    def _check_done(self, pdf: _Pdf) -> None:
+        """Once no range is left running, store the document's outcome."""
+        if pdf.finished or any(part.ok is None for part in pdf.parts):
+            return
+        pdf.finished = True
+        pdf.job._pending -= 1
+        if pdf.failed and not pdf.cancelled:
+            store_texts(self._cache, pdf.key, pdf.doc, None)
+        elif pdf.key is not None and not pdf.cancelled:
+            texts = [text for part in pdf.parts for text in part.texts]
+            store_texts(self._cache, pdf.key, pdf.doc, texts)
+        for part in pdf.parts:
+            part.texts = None
+
+    def _kill(self, worker: _Worker, reason: str) -> None:
+        pdf, part, pages = worker.task
+        where = "" if pages is None else f" pages {pages.start + 1}-{pages.stop}"
+        logger.warning(
+            f"Killed PDF extraction for doc {pdf.doc.id or 'unknown'}{where}: {reason}"
+        )
+        worker.kill()
+        self._busy.remove(worker)
+        self.killed += 1
+        self._part_done(pdf, part, False)
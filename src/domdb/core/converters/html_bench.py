@@ -0,0 +1,67 @@
+"""Compare ``html_text`` with BeautifulSoup on HTML documents from the cache.
+
+Both extractors run over the same sample; the report gives their throughput,
+how many documents needed the BeautifulSoup fallback, and how many came out
+different (which should always be none).
+"""
+
+import time
+from dataclasses import dataclass
+
+from bs4 import BeautifulSoup
+
+from ..query.loader import iter_cached_cases
+from .html_text import _fast_html_text, html_to_text
+
+
+@dataclass
+class HtmlBenchReport:
+    documents: int
+    megabytes: float
+    soup_seconds: float
+    fast_seconds: float
+    fallbacks: int  # documents the fast path handed to BeautifulSoup
+    mismatches: list[str]  # ids of documents whose texts differ
+
+    @property
+    def speedup(self) -> float:
+        return self.soup_seconds / self.fast_seconds if self.fast_seconds else 0.0
+
+
+def sample_html(directory: str, number: int) -> list[tuple[str, str]]:
+    """``(doc_id, html)`` of the first ``number`` HTML documents."""
+    sample: list[tuple[str, str]] = []
+    for case, _path in iter_cached_cases(directory, compact=True, projection="html"):
+        for doc in case.documents:
+            if doc.contentHtml:
+                sample.append((doc.id or "", doc.contentHtml))
+            if len(sample) >= number:
+                return sample
+    return sample
+
+
+def _soup_text(markup: str) -> str:
+    return BeautifulSoup(markup, "html.parser").get_text(separator="\n", strip=True)
+
+
+def compare_html(docs: list[tuple[str, str]]) -> HtmlBenchReport:
+    started = time.perf_counter()
+    expected = [_soup_text(markup) for _doc_id, markup in docs]
+    soup_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    texts = [html_to_text(markup) for _doc_id, markup in docs]
+    fast_seconds = time.perf_counter() - started
+
+    return HtmlBenchReport(
+        documents=len(docs),
+        megabytes=sum(len(markup) for _doc_id, markup in docs) / 1e6,
+        soup_seconds=soup_seconds,
+        fast_seconds=fast_seconds,
+        fallbacks=sum(_fast_html_text(markup) is None for _doc_id, markup in docs),
+        mismatches=[
+            doc_id
+            for (doc_id, _markup), text, want in zip(docs, texts, expected)
+            if text != want
+        ],
+    )
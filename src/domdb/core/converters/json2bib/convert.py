@@ -8,13 +8,15 @@ from ..case_load import load_cases
 
 
 def convert_json_to_bib(
-    directory: str, output: str, number: Optional[int] = None
+    directory: str, output: str, number: Optional[int] = None, workers: int = 1
 ) -> int:
     """Convert JSON case files to BibTeX format."""
     database = bib.bibdatabase.BibDatabase()
     database.entries = []
 
-    cases = load_cases(directory, number)
+    cases = load_cases(
+        directory, number, compact=True, workers=workers, projection="metadata"
+    )
     for case in cases:
         database.entries.append(create_bib_entry(case))
 
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import Optional
 import json
 import os
@@ -5,7 +6,7 @@ import uuid
 import yaml
 from loguru import logger
 from .info_utils import create_info_yml
-from ..text_utils import extract_case_page_texts
+from ..text_utils import iter_case_page_texts
 from ...model import ModelItem
 from evid.core.label_setup import clean_text_for_typst
 from evid.core.models import InfoModel
@@ -24,17 +25,54 @@ TYPST_TEMPLATE = """#import \"@local/labtyp:0.1.0\": lablist, lab, mset
 #lablist()
 """
 
+EMPTY_BODY = "#mset(values: (opage: 1))\n== Page 1\nNo content available\n\n"
 
-def create_evid_dir(case: ModelItem, base_output: str) -> Optional[str]:
-    """Create EVID directory for a single case."""
+
+def _page_block(number: int, page_text: str) -> str:
+    return (
+        f"#mset(values: (opage: {number}))\n== Page {number}\n"
+        f"{clean_text_for_typst(page_text)}\n\n"
+    )
+
+
+def write_label(path: str, title: str, date: str, page_texts: Iterable[str]) -> int:
+    """Write ``label.typ`` page by page; returns the number of pages written.
+
+    Pages are cleaned and written as they arrive, so only one page's text is
+    held at a time.
+    """
+    head, tail = TYPST_TEMPLATE.split("{body}")
+    pages = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(head.format(title=title, date=date))
+        for pages, page_text in enumerate(page_texts, start=1):
+            f.write(_page_block(pages, page_text))
+        if not pages:
+            f.write(EMPTY_BODY)
+        f.write(tail)
+    return pages
+
+
+def evid_dir_path(case_id: str, base_output: str) -> str:
+    """EVID directory of a case (deterministic UUID based on case ID)."""
+    ns_uuid = uuid.uuid5(uuid.NAMESPACE_OID, case_id)
+    return os.path.join(base_output, str(ns_uuid))
+
+
+def create_evid_dir(
+    case: ModelItem, base_output: str, page_texts: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """Create EVID directory for a single case.
+
+    ``page_texts`` are the case's extracted page texts; when not given they are
+    extracted inline, one page at a time as ``label.typ`` is written.
+    """
     case_id = case.id
     if not case_id:
         logger.error("Case missing 'id'")
         return None
 
-    # Deterministic UUID based on case ID
-    ns_uuid = uuid.uuid5(uuid.NAMESPACE_OID, case_id)
-    dir_path = os.path.join(base_output, str(ns_uuid))
+    dir_path = evid_dir_path(case_id, base_output)
 
     if os.path.exists(dir_path):
         logger.info(f"Skipping existing EVID directory: {dir_path}")
@@ -59,18 +97,6 @@ def create_evid_dir(case: ModelItem, base_output: str) -> Optional[str]:
     with open(info_path, "w", encoding="utf-8") as f:
         yaml.dump(info, f, default_flow_style=False)
 
-    # Collect all page texts from documents
-    all_page_texts = extract_case_page_texts(case)
-
-    # Generate body for Typst
-    if not all_page_texts:
-        body = "#mset(values: (opage: 1))\n== Page 1\nNo content available\n\n"
-    else:
-        body = "".join(
-            f"#mset(values: (opage: {i + 1}))\n== Page {i + 1}\n{clean_text_for_typst(page_text)}\n\n"
-            for i, page_text in enumerate(all_page_texts)
-        )
-
     # Prepare date and name
     date = info.get("dates", "DATE")
     if isinstance(date, list):
@@ -79,11 +105,10 @@ def create_evid_dir(case: ModelItem, base_output: str) -> Optional[str]:
     name = info.get("label", "NAME")
     title = name.replace("_", " ")
 
-    # Generate label.typ using Typst template
-    label_content = TYPST_TEMPLATE.format(title=title, date=date, body=body)
-    label_path = os.path.join(dir_path, "label.typ")
-    with open(label_path, "w", encoding="utf-8") as f:
-        f.write(label_content)
+    # Generate label.typ using Typst template, streaming the page texts
+    if page_texts is None:
+        page_texts = iter_case_page_texts(case)
+    write_label(os.path.join(dir_path, "label.typ"), title, date, page_texts)
 
     logger.info(f"Created EVID directory: {dir_path}")
     return dir_path
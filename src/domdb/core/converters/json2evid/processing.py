@@ -1,33 +1,43 @@
-import multiprocessing
+import os
 from typing import Optional
 
 from loguru import logger
 
-from .dir_creation import create_evid_dir
+from .dir_creation import create_evid_dir, evid_dir_path
 from ....core.exceptions import EvidConversionError
 from ..case_load import load_cases
-
-
-def process_case(args):
-    """Worker function for parallel processing."""
-    case, output_dir = args
-    return create_evid_dir(case, output_dir) is not None  # Return True if successful
+from ..extraction import ExtractionService
 
 
 def convert_json_to_evid(
-    directory: str, output: str, number: Optional[int] = None
+    directory: str, output: str, number: Optional[int] = None, workers: int = 1
 ) -> int:
-    """Convert JSON case files to EVID directory structure with parallel processing."""
-    cases = load_cases(directory, number, error_cls=EvidConversionError)
+    """Convert JSON case files to EVID directory structure.
+
+    Page texts are extracted in parallel by the extraction service, which
+    kills documents that exceed its time or memory limits; each ``label.typ``
+    is written page by page as the workers send the pages.
+    """
+    cases = load_cases(
+        directory, number, error_cls=EvidConversionError, workers=workers
+    )
     if not cases:
         logger.info("No valid cases to process")
         return 0
 
     logger.info(f"Processing {len(cases)} cases to EVID in {output}")
 
-    with multiprocessing.Pool() as pool:  # Use multiprocessing for parallelization
-        results = pool.map(process_case, [(case, output) for case in cases])
-        count = sum(1 for result in results if result)  # Count successful creations
+    def pending():
+        # Existing directories are skipped by create_evid_dir; don't extract them.
+        for case in cases:
+            exists = case.id and os.path.exists(evid_dir_path(case.id, output))
+            yield case, None if exists else case
+
+    count = 0
+    with ExtractionService() as service:
+        for case, job in service.attach(pending()):
+            if create_evid_dir(case, output, job or []) is not None:
+                count += 1
 
     logger.info(f"Converted {count} cases to EVID in {output}")
     return count
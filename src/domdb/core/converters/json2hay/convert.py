@@ -9,10 +9,12 @@ from ..case_load import load_cases
 
 
 def convert_json_to_hay(
-    directory: str, output: str, number: Optional[int] = None
+    directory: str, output: str, number: Optional[int] = None, workers: int = 1
 ) -> int:
     """Convert JSON case files to Hayagriva YAML format."""
-    cases = load_cases(directory, number)
+    cases = load_cases(
+        directory, number, compact=True, workers=workers, projection="metadata"
+    )
     entries: dict[str, dict] = {}
 
     for case in cases:
@@ -1,11 +1,13 @@
 import os
 from typing import Optional
 from collections import defaultdict
+from contextlib import nullcontext
 from loguru import logger
 
 from .entry import create_md_entry
-from .filter import case_matches_keywords, normalize_keywords
-from ..case_load import load_cases
+from .filter import iter_keyword_matches, normalize_keywords
+from ..extraction import ExtractionService
+from ..case_load import iter_cases
 
 
 def convert_json_to_md(
@@ -15,6 +17,7 @@ def convert_json_to_md(
     split_by_year: bool = False,
     keywords: Optional[list[str]] = None,
     full_text: bool = False,
+    workers: int = 1,
 ) -> int:
     """Convert JSON case files to Markdown format."""
     norm_keywords = normalize_keywords(keywords)
@@ -23,18 +26,25 @@ def convert_json_to_md(
             "Full-text mode on: extracting verdict body text (PDF extraction may be slow)"
         )
 
-    # Load all cases; number is applied after keyword filter so the cap counts matches.
-    cases = load_cases(directory)
+    # Document bodies are only read by the full-text keyword filter.
+    projection = "full" if norm_keywords and full_text else "metadata"
+
+    # Stream cases; number is applied after keyword filter so the cap counts matches.
+    # Full-text extraction runs in isolated worker processes (see extraction).
     entries = []
     count = 0
-    for case in cases:
-        if number and count >= number:
-            break
-        if not case_matches_keywords(case, norm_keywords, full_text=full_text):
-            continue
-        entry = create_md_entry(case)
-        entries.append(entry)
-        count += 1
+    cases = iter_cases(directory, compact=True, workers=workers, projection=projection)
+    extracting = bool(norm_keywords and full_text)
+    with ExtractionService() if extracting else nullcontext() as service:
+        matches = iter_keyword_matches(
+            cases, norm_keywords, full_text=full_text, service=service
+        )
+        for case in matches:
+            if number and count >= number:
+                break
+            entry = create_md_entry(case)
+            entries.append(entry)
+            count += 1
 
     # Remove duplicates based on ID
     seen = set()
@@ -1,12 +1,21 @@
+from collections.abc import Iterable, Iterator
+
 from ...model import ModelItem
 from ...query.search import (
     metadata_search_text,
     normalize_keywords,
+    pages_contain_keywords,
     text_contains_keywords,
 )
+from ..extraction import ExtractionService
+from ..text_utils import iter_case_page_texts
 
-__all__ = ["case_matches_keywords", "normalize_keywords", "metadata_search_text"]
-from ..text_utils import extract_case_text
+__all__ = [
+    "case_matches_keywords",
+    "iter_keyword_matches",
+    "normalize_keywords",
+    "metadata_search_text",
+]
 
 
 def case_matches_keywords(
@@ -15,7 +24,11 @@ def case_matches_keywords(
     *,
     full_text: bool = False,
 ) -> bool:
-    """Return True if all normalized keywords match metadata and/or body text."""
+    """Return True if all normalized keywords match metadata and/or body text.
+
+    Body pages are extracted lazily and extraction stops at the page where the
+    last missing keyword turns up.
+    """
     if not keywords:
         return True
     metadata = metadata_search_text(case)
@@ -23,5 +36,43 @@ def case_matches_keywords(
         return True
     if not full_text:
         return False
-    body = extract_case_text(case).lower()
-    return text_contains_keywords(metadata + "\n" + body, keywords)
+    return pages_contain_keywords(iter_case_page_texts(case), keywords, metadata)
+
+
+def iter_keyword_matches(
+    cases: Iterable[ModelItem],
+    keywords: list[str],
+    *,
+    full_text: bool = False,
+    service: ExtractionService | None = None,
+) -> Iterator[ModelItem]:
+    """Cases matching all normalized keywords, in input order.
+
+    Like ``case_matches_keywords``, but in full-text mode the body text of
+    cases whose metadata does not match comes from ``service``, which extracts
+    ahead in isolated workers; a case's extraction is stopped at the page
+    where the last missing keyword turns up. Without a service, text is
+    extracted inline.
+    """
+    if not keywords:
+        yield from cases
+        return
+    if not full_text or service is None:
+        for case in cases:
+            if case_matches_keywords(case, keywords, full_text=full_text):
+                yield case
+        return
+
+    def candidates():
+        for case in cases:
+            metadata = metadata_search_text(case)
+            if text_contains_keywords(metadata, keywords):
+                yield (case, None), None
+            else:
+                yield (case, metadata), case
+
+    for (case, metadata), job in service.attach(candidates()):
+        if metadata is None:
+            yield case
+        elif pages_contain_keywords(job, keywords, metadata):
+            yield case
@@ -0,0 +1,187 @@
+"""PDF text-extraction backends shared by every text extractor.
+
+A backend turns a seekable PDF stream into page texts, lazily, so callers can
+sample the first pages of a scanned PDF and stop, and can extract a range of
+pages so one long PDF can be spread over several workers. Available backends:
+
+- ``pdfplumber`` (default): pdfminer with pdfplumber's character model.
+- ``pdfminer``: pdfminer's text converter without layout analysis.
+- ``pdfium``: PDFium through pypdfium2, which pdfplumber already depends on.
+
+Set ``pdf_backend`` in the config, or ``DOMDB_PDF_BACKEND`` to override it;
+``set_backend`` switches at runtime (benchmarks, tests). The configured
+backend is only resolved when a PDF is first needed, so a bad name fails that
+command with ``PdfBackendError`` instead of every import. ``domdb bench pdf``
+compares the backends on a sample of the cache.
+"""
+
+import io
+import os
+import tomllib
+from collections.abc import Callable, Iterator
+from typing import BinaryIO, NamedTuple
+
+from ..config import load_config
+from ..exceptions import PdfBackendError
+
+
+class Backend(NamedTuple):
+    # (stream, pages) -> page texts; ``pages`` is a 0-based range, None for all
+    page_texts: Callable[[BinaryIO, range | None], Iterator[str]]
+    page_count: Callable[[BinaryIO], int]
+
+
+def _pdfminer_page_count(stream: BinaryIO) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    document = PDFDocument(PDFParser(stream))
+    return sum(1 for _page in PDFPage.create_pages(document))
+
+
+def _pdfplumber() -> Backend:
+    import pdfplumber
+
+    def page_texts(stream: BinaryIO, pages: range | None = None) -> Iterator[str]:
+        numbers = None if pages is None else [number + 1 for number in pages]
+        with pdfplumber.open(stream, pages=numbers) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                page.close()  # drop the page's cached objects
+
+    return Backend(page_texts, _pdfminer_page_count)
+
+
+def _pdfminer() -> Backend:
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    def page_texts(stream: BinaryIO, pages: range | None = None) -> Iterator[str]:
+        document = PDFDocument(PDFParser(stream))
+        resources = PDFResourceManager(caching=True)
+        for number, page in enumerate(PDFPage.create_pages(document)):
+            if pages is not None:
+                if number >= pages.stop:
+                    break
+                if number not in pages:
+                    continue
+            out = io.StringIO()
+            device = TextConverter(resources, out, laparams=None)
+            PDFPageInterpreter(resources, device).process_page(page)
+            device.close()
+            yield out.getvalue().rstrip("\f")
+
+    return Backend(page_texts, _pdfminer_page_count)
+
+
+def _pdfium() -> Backend:
+    import pypdfium2
+
+    def readable(stream: BinaryIO) -> BinaryIO:
+        if hasattr(stream, "readinto"):
+            return stream
+        # PDFium reads through readinto(), which mmap lacks; a copy of the
+        # bytes is cheap next to the extraction itself.
+        stream.seek(0)
+        return io.BytesIO(stream.read())
+
+    def page_texts(stream: BinaryIO, pages: range | None = None) -> Iterator[str]:
+        pdf = pypdfium2.PdfDocument(readable(stream))
+        try:
+            for number in range(len(pdf)) if pages is None else pages:
+                if number >= len(pdf):
+                    break
+                page = pdf[number]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range().replace("\r\n", "\n")
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+    def page_count(stream: BinaryIO) -> int:
+        pdf = pypdfium2.PdfDocument(readable(stream))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    return Backend(page_texts, page_count)
+
+
+# The default first; the benchmark compares the others against it.
+BACKENDS: dict[str, Callable[[], Backend]] = {
+    "pdfplumber": _pdfplumber,
+    "pdfminer": _pdfminer,
+    "pdfium": _pdfium,
+}
+
+
+def available_backends() -> list[str]:
+    names = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def configured_backend() -> str:
+    """``DOMDB_PDF_BACKEND``, else ``pdf_backend`` from the config."""
+    name = os.environ.get("DOMDB_PDF_BACKEND")
+    if name:
+        return name
+    try:
+        return load_config()["pdf_backend"]
+    except (OSError, tomllib.TOMLDecodeError) as exc:
+        raise PdfBackendError(f"Cannot read pdf_backend from the config: {exc}")
+
+
+def set_backend(name: str) -> str:
+    """Select the backend used by ``page_texts``. Returns its name."""
+    global _backend, _backend_name
+    if name not in BACKENDS:
+        raise PdfBackendError(
+            f"Unknown PDF backend {name!r}; choose from {list(BACKENDS)}"
+        )
+    try:
+        backend = BACKENDS[name]()
+    except ImportError as exc:
+        raise PdfBackendError(f"PDF backend {name!r} is not installed: {exc}")
+    _backend, _backend_name = backend, name
+    return name
+
+
+def backend_name() -> str:
+    """The selected backend, resolving the configured one on first use."""
+    if _backend_name is None:
+        set_backend(configured_backend())
+    return _backend_name
+
+
+def page_texts(stream: BinaryIO, pages: range | None = None) -> Iterator[str]:
+    """Page texts of a PDF with the selected backend, one page at a time.
+
+    ``pages`` limits extraction to a 0-based range of pages; pages past the
+    end of the document are ignored.
+    """
+    backend_name()
+    return _backend.page_texts(stream, pages)
+
+
+def page_count(stream: BinaryIO) -> int:
+    """Number of pages, as the selected backend sees them."""
+    backend_name()
+    return _backend.page_count(stream)
+
+
+_backend: Backend | None = None
+_backend_name: str | None = None
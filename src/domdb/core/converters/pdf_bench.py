@@ -0,0 +1,122 @@
+"""Compare PDF text-extraction backends on a sample of the cache.
+
+Each backend runs in its own fresh process over the same sample of PDF
+documents, so its speed and peak memory are measured in isolation. Texts are
+compared with the default backend's after normalising case and whitespace,
+which is what keyword and paragraph search see.
+"""
+
+import base64
+import difflib
+import multiprocessing
+import resource
+import sys
+import time
+from dataclasses import dataclass
+from io import BytesIO
+
+from loguru import logger
+
+from ..blobs import open_blob
+from ..query.loader import iter_cached_cases
+from . import pdf_backends
+
+
+@dataclass
+class BackendReport:
+    backend: str
+    documents: int
+    pages: int
+    errors: int
+    seconds: float
+    peak_rss_mb: float
+    identical: float | None = None  # share of documents with equal text
+    similarity: float | None = None  # mean word-sequence similarity
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+
+def sample_pdfs(directory: str, number: int) -> list[tuple[str, bytes]]:
+    """``(doc_id, pdf_bytes)`` of the first ``number`` PDF documents."""
+    sample: list[tuple[str, bytes]] = []
+    for case, _path in iter_cached_cases(directory, compact=True):
+        for doc in case.documents:
+            if doc.contentPdfBlob:
+                with open_blob(case._cache_dir, doc.contentPdfBlob) as mapped:
+                    sample.append((doc.id or "", mapped[:]))
+            elif doc.contentPdf:
+                sample.append((doc.id or "", base64.b64decode(doc.contentPdf)))
+            if len(sample) >= number:
+                return sample
+    return sample
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_backend(name: str, pdfs: list[tuple[str, bytes]], conn) -> None:
+    """Child process: extract every sample PDF with one backend."""
+    logger.remove()
+    extract = pdf_backends.BACKENDS[name]().page_texts
+    texts: list[list[str] | None] = []
+    started = time.perf_counter()
+    for _doc_id, data in pdfs:
+        try:
+            texts.append(list(extract(BytesIO(data))))
+        except Exception:
+            texts.append(None)
+    conn.send((texts, time.perf_counter() - started, _peak_rss_mb()))
+    conn.close()
+
+
+def _words(pages: list[str]) -> list[str]:
+    return "\n".join(pages).lower().split()
+
+
+def _compare(reference: list[list[str] | None], texts: list[list[str] | None]):
+    identical, ratios = 0, []
+    for ref, got in zip(reference, texts):
+        if ref is None or got is None:
+            continue
+        ref_words, got_words = _words(ref), _words(got)
+        identical += ref_words == got_words
+        ratios.append(difflib.SequenceMatcher(None, ref_words, got_words).ratio())
+    if not ratios:
+        return None, None
+    return identical / len(ratios), sum(ratios) / len(ratios)
+
+
+def compare_backends(
+    pdfs: list[tuple[str, bytes]], backends: list[str] | None = None
+) -> list[BackendReport]:
+    """Run each backend over ``pdfs``; the first one is the text reference."""
+    backends = backends or pdf_backends.available_backends()
+    context = multiprocessing.get_context("spawn")
+    reports, reference = [], None
+    for name in backends:
+        if name not in pdf_backends.BACKENDS:
+            raise ValueError(f"Unknown PDF backend {name!r}")
+        parent, child = context.Pipe(duplex=False)
+        process = context.Process(target=_run_backend, args=(name, pdfs, child))
+        process.start()
+        child.close()
+        texts, seconds, peak = parent.recv()
+        process.join()
+        report = BackendReport(
+            backend=name,
+            documents=len(pdfs),
+            pages=sum(len(t) for t in texts if t is not None),
+            errors=sum(t is None for t in texts),
+            seconds=seconds,
+            peak_rss_mb=peak,
+        )
+        if reference is None:
+            reference = texts
+        else:
+            report.identical, report.similarity = _compare(reference, texts)
+        reports.append(report)
+    return reports
@@ -1,20 +1,43 @@
 """Shared helpers for extracting plain text from case documents.
 
 Used by the EVID converter (per-page Typst body) and the Markdown converter
-(full-text keyword search). HTML via BeautifulSoup; PDF via base64 + pdfplumber.
+(full-text keyword search). ``iter_case_page_texts`` extracts one page at a
+time, so consumers that write pages out or stop at the first match keep
+memory bounded on very long verdicts. HTML via ``html_text``; PDF via the
+selected ``pdf_backends`` backend (pdfplumber by default), read either from
+the base64 ``contentPdf`` or memory-mapped from the blob store.
 
 Compared to the old inline json2evid logic, scanned (image-only) PDFs are now
 detected from a short page sample and skipped instead of iterating every page.
+Extracted texts are kept in the on-disk text cache (``textcache``), and each
+PDF's outcome in its registry, so known-scanned PDFs are not opened again.
 """
 
 import base64
+import hashlib
 import io
+import os
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import islice
+from typing import BinaryIO, NamedTuple
 
-import pdfplumber
-from bs4 import BeautifulSoup
 from loguru import logger
 
-from ..model import ModelItem
+from ..blobs import blob_path, open_blob
+from ..exceptions import PdfBackendError
+from ..model import Document, ModelItem
+from ..textcache import (
+    FAILED,
+    SCANNED,
+    TEXT,
+    PdfOutcome,
+    TextCache,
+    get_text_cache,
+)
+from . import pdf_backends
+from .html_text import html_to_text
 
 # Scanned (image-only) PDFs in the corpus have no extractable text yet make
 # pdfplumber run for many minutes and consume gigabytes of RAM. We detect them
@@ -23,39 +46,236 @@ from ..model import ModelItem
 SCAN_SAMPLE_PAGES = 3
 
 
-def extract_case_page_texts(case: ModelItem) -> list[str]:
-    """Extract plain text from a case's documents as a list of page texts.
+@contextmanager
+def _open_pdf(cache_dir: str | None, doc: Document) -> Iterator[BinaryIO]:
+    """Yield a seekable stream over a document's PDF bytes.
+
+    Blob-backed PDFs are memory-mapped from the case's cache directory, so the
+    bytes are paged in by the OS instead of being decoded into memory.
+    """
+    if doc.contentPdfBlob:
+        if not cache_dir:
+            raise FileNotFoundError(
+                f"PDF blob {doc.contentPdfBlob} has no cache directory to resolve in"
+            )
+        with open_blob(cache_dir, doc.contentPdfBlob) as mapped:
+            yield mapped
+    else:
+        yield io.BytesIO(base64.b64decode(doc.contentPdf))
+
+
+class DocumentKey(NamedTuple):
+    """Where a document's texts and PDF outcome live in the text cache."""
+
+    text: str  # text cache key
+    digest: str | None = None  # PDF SHA-256 (the blob key); None for HTML
+    size: int = 0  # PDF size in bytes
+
+
+def _pdf_identity(
+    cache_dir: str | None, doc: Document, cache: TextCache | None = None
+) -> tuple[str, int]:
+    """SHA-256 and byte size of a document's PDF, without parsing it.
+
+    An inline PDF the cache has seen before is looked up by a hash of its
+    base64 text, so it is not decoded again.
+    """
+    if doc.contentPdfBlob:
+        size = (
+            os.path.getsize(blob_path(cache_dir, doc.contentPdfBlob))
+            if cache_dir
+            else 0
+        )
+        return doc.contentPdfBlob, size
+    encoded = hashlib.sha256(doc.contentPdf.encode("ascii")).hexdigest()
+    known = cache.inline_pdf(encoded) if cache is not None else None
+    if known is not None:
+        return known
+    data = base64.b64decode(doc.contentPdf)
+    digest, size = hashlib.sha256(data).hexdigest(), len(data)
+    if cache is not None:
+        cache.record_inline_pdf(encoded, digest, size)
+    return digest, size
+
+
+def document_key(doc: Document, digest: str | None = None) -> str:
+    """Text cache key: document id plus a hash of its content.
+
+    PDFs are keyed by the SHA-256 of their bytes, which is the blob key, so a
+    document keeps its cached text when its PDF moves into the blob store.
+    """
+    if doc.contentHtml:
+        digest = hashlib.sha256(doc.contentHtml.encode("utf-8")).hexdigest()
+        return TextCache.key(doc.id, "html", digest)
+    if digest is None:
+        digest = _pdf_identity(None, doc)[0]
+    return TextCache.key(doc.id, f"pdf-{pdf_backends.backend_name()}", digest)
+
+
+def html_texts(doc: Document) -> list[str]:
+    return [html_to_text(doc.contentHtml)]
+
+
+def pdf_page_texts(
+    cache_dir: str | None, doc: Document, pages: range | None = None
+) -> Iterator[str]:
+    """Page texts of one PDF (or a 0-based page range), lazily.
+
+    Yields nothing for a scanned PDF; the check samples the document's first
+    pages, so it only applies to ranges starting at page 0. Errors propagate
+    to the caller. Closing the generator early releases the backend's pages
+    and the PDF mapping.
+    """
+    doc_id = doc.id or "unknown"
+    with _open_pdf(cache_dir, doc) as stream:
+        texts = pdf_backends.page_texts(stream, pages)
+        if pages is not None and pages.start > 0:
+            try:
+                yield from texts
+            finally:
+                texts.close()
+            return
+        try:
+            sample = list(islice(texts, SCAN_SAMPLE_PAGES))
+            if not "".join(sample).strip():
+                logger.warning(
+                    f"Skipping scanned (no extractable text) PDF for doc {doc_id}"
+                )
+                return
+            yield from sample
+            yield from texts
+        finally:
+            texts.close()
+
+
+def pdf_page_count(cache_dir: str | None, doc: Document) -> int | None:
+    """Number of pages in a document's PDF, or None if it cannot be read."""
+    try:
+        with _open_pdf(cache_dir, doc) as stream:
+            return pdf_backends.page_count(stream)
+    except PdfBackendError:
+        raise
+    except Exception as e:
+        logger.debug(f"Could not count pages of PDF for doc {doc.id}: {e}")
+        return None
+
+
+def _stream_pdf_texts(
+    cache_dir: str | None, doc: Document, cache: TextCache | None, key: str | None
+) -> Iterator[str]:
+    """Yield a PDF's page texts as they are extracted.
+
+    The texts are stored in the text cache once the whole document has been
+    read; a stream abandoned early or cut short by an error stores nothing.
+    """
+    collected: list[str] | None = [] if key is not None else None
+    try:
+        for text in pdf_page_texts(cache_dir, doc):
+            if collected is not None:
+                collected.append(text)
+            yield text
+    except PdfBackendError:
+        raise
+    except Exception as e:
+        logger.warning(
+            f"Failed to extract text from PDF for doc {doc.id or 'unknown'}: {e}"
+        )
+        store_texts(cache, key, doc, None)
+        return
+    store_texts(cache, key, doc, collected)
+
+
+def cached_texts(
+    doc: Document, cache: TextCache | None, cache_dir: str | None = None
+) -> tuple[DocumentKey | None, list[str] | None]:
+    """``(key, texts)`` from the text cache; texts is None on a miss.
+
+    A PDF the registry knows to be scanned gets ``[]`` without being opened
+    (or, if it is stored inline, decoded).
+    The key is None when the document cannot be cached (no cache, or content
+    that cannot be hashed); extraction then proceeds without storing.
+    """
+    if cache is None:
+        return None, None
+    try:
+        if doc.contentHtml:
+            key = DocumentKey(document_key(doc))
+            return key, cache.get(key.text)
+        digest, size = _pdf_identity(cache_dir, doc, cache)
+        key = DocumentKey(document_key(doc, digest), digest, size)
+        texts = cache.get(key.text)
+        if texts is None:
+            outcome = cache.pdf_outcome(doc.id, digest)
+            if outcome is not None and outcome.status == SCANNED:
+                logger.info(f"Skipping known scanned PDF for doc {doc.id or 'unknown'}")
+                texts = []
+        return key, texts
+    except (sqlite3.Error, ValueError, OSError) as exc:
+        logger.debug(f"Text cache lookup failed for doc {doc.id}: {exc}")
+        return None, None
+
+
+def store_texts(
+    cache: TextCache | None,
+    key: DocumentKey | None,
+    doc: Document,
+    texts: list[str] | None,
+) -> None:
+    """Remember extracted texts and, for PDFs, the outcome in the registry.
+
+    Unreadable documents (None) are recorded as failed but their (absent)
+    texts are not cached, so they are tried again next time.
+    """
+    if cache is None or key is None:
+        return
+    try:
+        if texts is not None:
+            cache.put(key.text, doc.id, texts)
+        if key.digest is not None:
+            status = FAILED if texts is None else TEXT if texts else SCANNED
+            outcome = PdfOutcome(
+                status, len(texts or []), key.size, pdf_backends.backend_name()
+            )
+            cache.record_pdf(doc.id, key.digest, outcome)
+    except sqlite3.Error as exc:
+        logger.debug(f"Text cache store failed for doc {doc.id}: {exc}")
+
+
+def has_content(doc: Document) -> bool:
+    return bool(doc.contentHtml or doc.contentPdf or doc.contentPdfBlob)
+
+
+def iter_case_page_texts(case: ModelItem) -> Iterator[str]:
+    """Yield plain text from a case's documents, one page at a time.
 
     For HTML documents a single entry holds the whole document's text; for PDF
-    documents each page contributes one entry. Scanned (image-only) PDFs yield no
-    text on their first pages and are skipped (logged). Failures to read a PDF
-    are logged and skipped.
+    documents each page contributes one entry, extracted only when the caller
+    asks for it, so a consumer that stops early never parses the remaining
+    pages. Scanned (image-only) PDFs yield no text on their first pages and are
+    skipped (logged). Failures to read a PDF are logged and end that document.
+    Texts come from the on-disk text cache when the document was extracted
+    before (see ``textcache``); failures are not cached.
     """
-    page_texts: list[str] = []
+    cache = get_text_cache()
     for doc in case.documents or []:
-        if doc.contentHtml:
-            soup = BeautifulSoup(doc.contentHtml, "html.parser")
-            page_texts.append(soup.get_text(separator="\n", strip=True))
-        elif doc.contentPdf:
-            doc_id = doc.id or "unknown"
-            try:
-                pdf_bytes = base64.b64decode(doc.contentPdf)
-                with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                    sample = "".join(
-                        page.extract_text() or ""
-                        for page in pdf.pages[:SCAN_SAMPLE_PAGES]
-                    )
-                    if not sample.strip():
-                        logger.warning(
-                            f"Skipping scanned (no extractable text) PDF for doc {doc_id}"
-                        )
-                        continue
-                    page_texts.extend(page.extract_text() or "" for page in pdf.pages)
-            except Exception as e:
-                logger.warning(f"Failed to extract text from PDF for doc {doc_id}: {e}")
-    return page_texts
+        if not has_content(doc):
+            continue
+        key, texts = cached_texts(doc, cache, case._cache_dir)
+        if texts is not None:
+            yield from texts
+        elif doc.contentHtml:
+            texts = html_texts(doc)
+            store_texts(cache, key, doc, texts)
+            yield from texts
+        else:
+            yield from _stream_pdf_texts(case._cache_dir, doc, cache, key)
+
+
+def extract_case_page_texts(case: ModelItem) -> list[str]:
+    """All page texts of a case as a list (see ``iter_case_page_texts``)."""
+    return list(iter_case_page_texts(case))
 
 
 def extract_case_text(case: ModelItem) -> str:
     """Return the full plain text of a case (all documents joined)."""
-    return "\n".join(extract_case_page_texts(case))
+    return "\n".join(iter_case_page_texts(case))
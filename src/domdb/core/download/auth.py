@@ -1,19 +1,73 @@
+import base64
+import json
 import os
+import threading
+import time
 
 import requests
 from loguru import logger
 
 from ..exceptions import DownloadError
+from .client import API_BASE_URL, DownloadClient, client_scope
 
-API_BASE_URL = "https://domsdatabasen.dk/webapi/kapi/v2"
+__all__ = ["API_BASE_URL", "TokenManager", "get_access_token"]
 
+TOKEN_CACHE_PATH = os.path.expanduser("~/.domdb/token.json")
+# Refresh this many seconds before the token actually expires.
+TOKEN_REFRESH_MARGIN = 300
+# Lifetime assumed for tokens that carry no JWT ``exp`` claim.
+DEFAULT_TOKEN_TTL = 3600
 
-def get_access_token() -> str:
-    """Authenticate and retrieve an access token."""
+
+def _token_expiry(token: str) -> float:
+    """Expiry (epoch seconds) from the JWT ``exp`` claim, or a default TTL."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + DEFAULT_TOKEN_TTL
+
+
+def _read_cached_token(user_id: str) -> str | None:
+    try:
+        with open(TOKEN_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("user") != user_id:
+        return None
+    if cached.get("expires_at", 0) - TOKEN_REFRESH_MARGIN <= time.time():
+        logger.info("Cached access token is expired or about to expire")
+        return None
+    return cached.get("token")
+
+
+def _write_cached_token(user_id: str, token: str) -> None:
+    cached = {"user": user_id, "token": token, "expires_at": _token_expiry(token)}
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+    except OSError as e:
+        logger.warning(f"Could not cache access token: {e}")
+
+
+def get_access_token(
+    client: DownloadClient | None = None,
+    *,
+    use_cache: bool = True,
+    force_refresh: bool = False,
+) -> str:
+    """Return an access token, reusing the on-disk cache until it nears expiry.
+
+    ``force_refresh`` skips the cached token (e.g. after the API rejected it with
+    401) and stores the freshly issued one.
+    """
     try:
         USER_ID = os.getenv("DOMDB_USER_ID")
         PASSWORD = os.getenv("DOMDB_PASSWORD")
-        url = f"{API_BASE_URL}/autoriser"
         headers = {"Content-Type": "application/json"}
         body = {"Email": USER_ID, "Password": PASSWORD}
 
@@ -21,10 +75,46 @@ def get_access_token() -> str:
             logger.error("Missing USER_ID or PASSWORD environment variables")
             raise DownloadError("Missing USER_ID or PASSWORD environment variables")
 
-        response = requests.post(url, json=body, headers=headers, timeout=10)
+        if use_cache and not force_refresh:
+            token = _read_cached_token(USER_ID)
+            if token:
+                logger.info("Using cached access token")
+                return token
+
+        with client_scope(client) as client:
+            response = client.post("autoriser", json=body, headers=headers)
         response.raise_for_status()
         logger.info("Successfully obtained access token")
-        return response.json()["tokenString"]
+        token = response.json()["tokenString"]
+        if use_cache:
+            _write_cached_token(USER_ID, token)
+        return token
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to get access token: {str(e)}")
         raise DownloadError(f"Failed to get access token: {str(e)}")
+
+
+class TokenManager:
+    """Access token shared by concurrent page workers.
+
+    The first worker to see a 401 refreshes the token; workers that hit 401 with
+    the same stale token afterwards reuse the refreshed one.
+    """
+
+    def __init__(self, client: DownloadClient | None = None):
+        self.client = client
+        self._token: str | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        with self._lock:
+            if self._token is None:
+                self._token = get_access_token(self.client)
+            return self._token
+
+    def refresh(self, stale_token: str) -> str:
+        with self._lock:
+            if self._token in (None, stale_token):
+                logger.info("Access token rejected, requesting a new one")
+                self._token = get_access_token(self.client, force_refresh=True)
+            return self._token
@@ -0,0 +1,132 @@
+"""Pooled HTTP client shared by the download endpoints.
+
+One ``requests.Session`` keeps TCP+TLS connections alive across the token
+request and every page fetch, instead of paying a fresh handshake per call.
+Transient failures are retried with backoff, and an optional token bucket
+keeps concurrent workers under the API's request rate.
+"""
+
+import time
+from contextlib import nullcontext
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from .retry import ClientStats, RetryPolicy, TokenBucket
+
+API_BASE_URL = "https://domsdatabasen.dk/webapi/kapi/v2"
+
+# (connect, read) seconds. Pages embed base64 PDFs, so reads get more slack.
+DEFAULT_TIMEOUT = (10.0, 60.0)
+DEFAULT_POOL_SIZE = 10
+
+
+class DownloadClient:
+    """HTTP session with a sized connection pool and default timeouts."""
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        session: requests.Session | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: TokenBucket | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.stats = ClientStats()
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_config(cls, config: dict, **overrides) -> "DownloadClient":
+        """Build a client from ``load_config()`` keys, with keyword overrides."""
+        rate = config.get("rate_limit", 0)
+        kwargs = {
+            "base_url": config.get("api_base_url", API_BASE_URL),
+            "pool_size": config.get("pool_size", DEFAULT_POOL_SIZE),
+            "timeout": (
+                config.get("connect_timeout", DEFAULT_TIMEOUT[0]),
+                config.get("read_timeout", DEFAULT_TIMEOUT[1]),
+            ),
+            "retry": RetryPolicy(
+                max_attempts=config.get("max_attempts", RetryPolicy.max_attempts),
+                base_delay=config.get("retry_base_delay", RetryPolicy.base_delay),
+                max_delay=config.get("retry_max_delay", RetryPolicy.max_delay),
+            ),
+            "rate_limiter": (
+                TokenBucket(rate, config.get("rate_burst")) if rate > 0 else None
+            ),
+        }
+        kwargs.update(overrides)
+        return cls(**kwargs)
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _send(self, send, path: str, kwargs: dict) -> requests.Response:
+        """Call ``send`` with rate limiting, retrying per ``self.retry``.
+
+        Connection errors, timeouts and retryable statuses are retried; once the
+        attempts are used up the last exception is raised or the last response
+        returned, so callers still see it via ``raise_for_status``.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.url(path)
+        attempts = max(1, self.retry.max_attempts)
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter and self.rate_limiter.acquire() > 0:
+                self.stats.add(throttled=1)
+            self.stats.add(requests=1)
+            retry_after = None
+            try:
+                response = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= attempts:
+                    raise
+                reason = str(e)
+            else:
+                if response.status_code not in self.retry.retry_statuses:
+                    return response
+                if response.status_code == 429:
+                    self.stats.add(rate_limited=1)
+                if attempt >= attempts:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+            delay = self.retry.delay(attempt, retry_after)
+            logger.warning(
+                f"{reason} for {path}; retry {attempt}/{attempts - 1} in {delay:.1f}s"
+            )
+            self.stats.add(retries=1)
+            time.sleep(delay)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self._send(self.session.get, path, kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self._send(self.session.post, path, kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "DownloadClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def client_scope(client: DownloadClient | None):
+    """Context yielding ``client``, or a fresh client that is closed on exit."""
+    return nullcontext(client) if client else DownloadClient()
@@ -1,22 +1,68 @@
-import requests
 from typing import List
 from loguru import logger
 
-from .auth import API_BASE_URL
-from ..exceptions import DownloadError
+from .client import DownloadClient, client_scope
+from .storage import StagedPage, stage_page
+from ..exceptions import AuthenticationError, DownloadError
+from ..jsonstream import CHUNK_SIZE
 
 
-def get_sager(token: str, page_number: int = 1, per_page: int = 100) -> List[dict]:
+def get_sager(
+    token: str,
+    page_number: int = 1,
+    per_page: int = 100,
+    client: DownloadClient | None = None,
+) -> List[dict]:
     """Fetch cases from the API."""
     try:
-        url = f"{API_BASE_URL}/sager"
         headers = {"Authorization": f"Bearer {token}"}
         params = {"sideNr": page_number, "perSide": per_page}
 
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        with client_scope(client) as client:
+            response = client.get("sager", headers=headers, params=params)
+        if response.status_code == 401:
+            raise AuthenticationError(f"Access token rejected for page {page_number}")
         response.raise_for_status()
-        logger.info(f"Fetched {len(response.json())} cases from page {page_number}")
-        return response.json()
+        cases = response.json()
+        logger.info(f"Fetched {len(cases)} cases from page {page_number}")
+        return cases
+    except AuthenticationError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch cases: {str(e)}")
+        raise DownloadError(f"Failed to fetch cases: {str(e)}")
+
+
+def fetch_page_to_disk(
+    token: str,
+    page_number: int,
+    per_page: int,
+    directory: str,
+    client: DownloadClient | None = None,
+    compress: bool = False,
+) -> StagedPage:
+    """Stream one page of cases straight into a staged temp file."""
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {"sideNr": page_number, "perSide": per_page}
+
+        with client_scope(client) as client:
+            response = client.get("sager", headers=headers, params=params, stream=True)
+            try:
+                if response.status_code == 401:
+                    raise AuthenticationError(
+                        f"Access token rejected for page {page_number}"
+                    )
+                response.raise_for_status()
+                staged = stage_page(
+                    page_number, response.iter_content(CHUNK_SIZE), directory, compress
+                )
+            finally:
+                response.close()
+        logger.info(f"Fetched {staged.cases} cases from page {page_number}")
+        return staged
+    except DownloadError:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch cases: {str(e)}")
         raise DownloadError(f"Failed to fetch cases: {str(e)}")
@@ -1,25 +1,160 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
 from loguru import logger
+from ..blobs import externalize_case
 from ..config import load_config
-from .auth import get_access_token
-from .fetch import get_sager
-from .storage import get_last_saved_page, save_cases
+from ..exceptions import AuthenticationError
+from ..pages import rewrite_page
+from ..store import record_pages
+from .auth import TokenManager
+from .client import DownloadClient
+from .fetch import fetch_page_to_disk
+from .storage import StagedPage, commit_page, discard_page, get_last_saved_page
+
+
+@dataclass
+class DownloadSummary:
+    """Aggregate counters for a multi-page download run."""
+
+    pages: int = 0
+    cases: int = 0
+    elapsed: float = 0.0
+    retries: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+
+    @property
+    def cases_per_second(self) -> float:
+        return self.cases / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Fetched {self.cases} cases from {self.pages} pages in "
+            f"{self.elapsed:.1f}s ({self.cases_per_second:.1f} cases/s, "
+            f"{self.pages_per_second:.2f} pages/s; {self.retries} retries, "
+            f"{self.throttled} throttled, {self.rate_limited} rate-limited)"
+        )
+
+
+def _fetch_page(
+    tokens: TokenManager,
+    page_number: int,
+    per_page: int,
+    directory: str,
+    client: DownloadClient,
+    compress: bool = False,
+) -> StagedPage:
+    """Stage one page, refreshing the token once if the API answers 401."""
+    args = (page_number, per_page, directory, client, compress)
+    token = tokens.get()
+    try:
+        return fetch_page_to_disk(token, *args)
+    except AuthenticationError:
+        token = tokens.refresh(token)
+        return fetch_page_to_disk(token, *args)
+
+
+def _commit(staged: StagedPage, directory: str, blobs: bool = False) -> str:
+    """Commit a staged page, moving its PDFs into the blob store if enabled."""
+    path = commit_page(staged, directory)
+    if blobs:
+        moved = rewrite_page(path, lambda case: externalize_case(case, directory))
+        logger.debug(f"Moved {moved} PDFs from page {staged.page_number} to blobs")
+    return path
 
 
 def load_next_batch(directory: str) -> int:
     """Load and save the next batch of cases."""
     config = load_config()
     logger.info(f"Starting to load next batch in directory: {directory}")
-    token = get_access_token()
-    page_number = get_last_saved_page(directory)
-    logger.info(f"Fetching page {page_number}...")
-    cases = get_sager(token, page_number=page_number, per_page=config["batch_size"])
-    if cases:
-        for case in cases:
-            headline = case.get("headline", "No headline")
-            case_id = case.get("id", "No ID")
-            logger.info(f"Fetched case: {headline} (ID: {case_id})")
-        save_cases(page_number, cases, directory)
-        logger.info(f"Successfully fetched and saved {len(cases)} cases")
-        return len(cases)
+    with DownloadClient.from_config(config) as client:
+        tokens = TokenManager(client)
+        page_number = get_last_saved_page(directory)
+        logger.info(f"Fetching page {page_number}...")
+        staged = _fetch_page(
+            tokens,
+            page_number,
+            config["batch_size"],
+            directory,
+            client,
+            config.get("compress", False),
+        )
+    if staged.cases:
+        path = _commit(staged, directory, config.get("blobs", False))
+        record_pages(directory, [path])
+        logger.info(f"Successfully fetched and saved {staged.cases} cases")
+        return staged.cases
+    discard_page(staged)
     logger.info("No cases fetched")
     return 0
+
+
+def load_pages(directory: str, pages: int, workers: int = 4) -> DownloadSummary:
+    """Fetch up to ``pages`` pages after the last saved one with a worker pool.
+
+    At most ``workers`` pages are in flight at once, sharing one pooled
+    ``DownloadClient`` sized to the worker count. Workers stream each page into
+    a temp file; pages are committed in page order, and the run stops at the
+    first empty page so the cache never has gaps (``get_last_saved_page``
+    resumes from the highest page number). Older copies of the fetched cases
+    are dropped from earlier pages once the run ends.
+    """
+    config = load_config()
+    workers = max(1, workers)
+    with DownloadClient.from_config(config, pool_size=workers) as client:
+        tokens = TokenManager(client)
+        tokens.get()
+        first_page = get_last_saved_page(directory)
+        last_page = first_page + pages - 1
+        logger.info(
+            f"Fetching pages {first_page}-{last_page} into {directory} "
+            f"with {workers} workers"
+        )
+
+        summary = DownloadSummary()
+        started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending: dict[int, Future] = {}
+        committed: list[str] = []
+        try:
+            next_page = first_page
+            for page_number in range(first_page, last_page + 1):
+                while next_page <= last_page and len(pending) < workers:
+                    pending[next_page] = pool.submit(
+                        _fetch_page,
+                        tokens,
+                        next_page,
+                        config["batch_size"],
+                        directory,
+                        client,
+                        config.get("compress", False),
+                    )
+                    next_page += 1
+                staged = pending.pop(page_number).result()
+                if not staged.cases:
+                    discard_page(staged)
+                    logger.info(f"Page {page_number} is empty, stopping")
+                    break
+                committed.append(_commit(staged, directory, config.get("blobs", False)))
+                summary.pages += 1
+                summary.cases += staged.cases
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for future in pending.values():
+                if future.done() and not future.cancelled() and not future.exception():
+                    discard_page(future.result())
+            if committed:
+                record_pages(directory, committed)
+            summary.elapsed = time.perf_counter() - started
+            summary.retries = client.stats.retries
+            summary.throttled = client.stats.throttled
+            summary.rate_limited = client.stats.rate_limited
+
+    logger.info(summary.describe())
+    return summary
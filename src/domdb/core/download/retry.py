@@ -0,0 +1,99 @@
+"""Retry policy and client-side rate limiting for the download client."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Responses worth retrying: throttling and transient server/gateway errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter; ``Retry-After`` wins when present."""
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    # Fraction of each backoff step that is randomised, so workers spread out.
+    jitter: float = 0.5
+    # Upper bound on how long a server-sent Retry-After may pause a worker.
+    max_retry_after: float = 300.0
+    retry_statuses: frozenset[int] = field(default=RETRY_STATUSES)
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to sleep before retry number ``attempt`` (1-based)."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_retry_after)
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(backoff * (1 - self.jitter), backoff)
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers of a download run.
+
+    ``rate`` tokens are added per second up to ``burst``; each request takes one
+    and callers that find the bucket empty sleep until their token is due.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if needed. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+@dataclass
+class ClientStats:
+    """Request counters updated concurrently by page workers.
+
+    ``throttled`` counts requests the local token bucket held back;
+    ``rate_limited`` counts 429 responses from the server.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
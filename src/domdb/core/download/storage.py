@@ -1,9 +1,30 @@
 import os
+import gzip
 import json
-from typing import List
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO, List
 from loguru import logger
 
 from ..exceptions import DownloadError
+from ..jsoncodec import loads
+from ..jsonstream import drop_string_values, iter_array_items
+from ..pages import GZIP_SUFFIX, HEAVY_FIELDS, JSON_SUFFIX
+from ..tempfiles import mkstemp
+
+
+@dataclass
+class StagedPage:
+    """A downloaded page written to a temp file, not yet visible in the cache."""
+
+    page_number: int
+    path: str
+    cases: int
+    compressed: bool = False
+
+
+def page_file_name(page_number: int, compress: bool = False) -> str:
+    return f"cases_{page_number}{GZIP_SUFFIX if compress else JSON_SUFFIX}"
 
 
 def get_last_saved_page(directory: str) -> int:
@@ -24,15 +45,81 @@ def get_last_saved_page(directory: str) -> int:
         return 1
 
 
-def save_cases(page_number: int, cases: List[dict], directory: str) -> None:
-    """Save cases to a JSON file."""
+def save_cases(
+    page_number: int, cases: List[dict], directory: str, compress: bool = False
+) -> None:
+    """Save cases to a JSON file, gzip-compressed if ``compress`` is set."""
     logger.info(f"Saving {len(cases)} cases to directory: {directory}")
     os.makedirs(directory, exist_ok=True)
-    file_path = os.path.join(directory, f"cases_{page_number}.json")
+    file_path = os.path.join(directory, page_file_name(page_number, compress))
+    opener = gzip.open if compress else open
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(cases, f, ensure_ascii=False, indent=2)
+        with opener(file_path, "wt", encoding="utf-8") as f:
+            json.dump(cases, f, ensure_ascii=False, indent=None if compress else 2)
         logger.info(f"Saved {len(cases)} cases to {file_path}")
     except IOError as e:
         logger.error(f"Failed to save cases: {str(e)}")
         raise DownloadError(f"Failed to save cases: {str(e)}")
+
+
+def _tee(chunks: Iterable[bytes], handle: BinaryIO) -> Iterator[bytes]:
+    for chunk in chunks:
+        handle.write(chunk)
+        yield chunk
+
+
+def stage_page(
+    page_number: int,
+    chunks: Iterable[bytes],
+    directory: str,
+    compress: bool = False,
+) -> StagedPage:
+    """Stream a page body into a temp file in ``directory`` as it arrives.
+
+    The bytes are written untouched (gzipped on the fly with ``compress``)
+    while an incremental scan counts the cases and logs each id and headline,
+    decoding only the small metadata part of each case. Nothing is parsed or
+    held in memory as a whole page.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = mkstemp(directory, f".cases_{page_number}.", ".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "wb") as raw_handle:
+            handle = (
+                gzip.GzipFile(fileobj=raw_handle, mode="wb") if compress else raw_handle
+            )
+            for _offset, raw in iter_array_items(_tee(chunks, handle)):
+                case = loads(drop_string_values(raw, HEAVY_FIELDS))
+                headline = case.get("headline", "No headline")
+                case_id = case.get("id", "No ID")
+                logger.info(f"Fetched case: {headline} (ID: {case_id})")
+                count += 1
+            if compress:
+                handle.close()
+    except (OSError, ValueError) as e:
+        os.unlink(tmp_path)
+        logger.error(f"Failed to save page {page_number}: {str(e)}")
+        raise DownloadError(f"Failed to save page {page_number}: {str(e)}")
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return StagedPage(page_number, tmp_path, count, compress)
+
+
+def commit_page(staged: StagedPage, directory: str) -> str:
+    """Atomically move a staged page into place as ``cases_<n>.json[.gz]``."""
+    file_path = os.path.join(
+        directory, page_file_name(staged.page_number, staged.compressed)
+    )
+    os.replace(staged.path, file_path)
+    logger.info(f"Saved {staged.cases} cases to {file_path}")
+    return file_path
+
+
+def discard_page(staged: StagedPage) -> None:
+    """Remove a staged page that will not be committed (e.g. an empty page)."""
+    try:
+        os.unlink(staged.path)
+    except FileNotFoundError:
+        pass
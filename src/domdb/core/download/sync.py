@@ -0,0 +1,159 @@
+import os
+
+from loguru import logger
+
+from ..blobs import externalize_case
+from ..config import load_config
+from ..exceptions import AuthenticationError
+from ..manifest import (
+    ChangeList,
+    ManifestEntry,
+    case_fingerprint,
+    load_manifest,
+    manifest_entry,
+    manifest_exists,
+    save_changes,
+    save_manifest,
+)
+from ..pages import resolve_page_path, rewrite_page
+from ..store import dedupe_cache
+from .auth import TokenManager
+from .client import DownloadClient
+from .fetch import get_sager
+from .storage import get_last_saved_page, page_file_name, save_cases
+
+
+def _fetch_cases(
+    tokens: TokenManager, page_number: int, per_page: int, client: DownloadClient
+) -> list[dict]:
+    token = tokens.get()
+    try:
+        return get_sager(token, page_number, per_page, client)
+    except AuthenticationError:
+        return get_sager(tokens.refresh(token), page_number, per_page, client)
+
+
+def _replace_cases(path: str, replacements: dict[str, dict]) -> set[str]:
+    """Swap cached cases in one page file for their new versions, by id."""
+    replaced: set[str] = set()
+
+    def transform(case: dict) -> int:
+        new = replacements.get(case.get("id"))
+        if new is None:
+            return 0
+        case.clear()
+        case.update(new)
+        replaced.add(new["id"])
+        return 1
+
+    rewrite_page(path, transform)
+    return replaced
+
+
+class _Sync:
+    """State of one sync run: manifest, pending writes and the change list."""
+
+    def __init__(self, directory: str, config: dict):
+        self.directory = directory
+        self.batch_size = config["batch_size"]
+        self.compress = config.get("compress", False)
+        self.blobs = config.get("blobs", False)
+        if not manifest_exists(directory):
+            dedupe_cache(directory)
+        self.manifest: dict[str, ManifestEntry] = load_manifest(directory)
+        self.changes = ChangeList()
+        self.new_cases: dict[str, dict] = {}
+        self.files: set[str] = set()
+
+    def _page_path(self, entry: ManifestEntry) -> str | None:
+        path = resolve_page_path(os.path.join(self.directory, entry.file))
+        return path if os.path.exists(path) else None
+
+    def _store(self, case: dict, file: str) -> None:
+        self.manifest[case["id"]] = manifest_entry(case, file)
+        if self.blobs:
+            externalize_case(case, self.directory)
+
+    def add_page(self, cases: list[dict]) -> None:
+        """Classify one API page and rewrite the page files it changes."""
+        self.changes.pages += 1
+        updates: dict[str, dict[str, dict]] = {}
+        for case in cases:
+            case_id = case.get("id")
+            if not case_id:
+                continue
+            if case_id in self.new_cases:
+                self.new_cases[case_id] = case  # seen twice: pagination shifted
+                continue
+            known = self.manifest.get(case_id)
+            path = self._page_path(known) if known else None
+            if path is None:
+                self.changes.added.append(case_id)
+                self.new_cases[case_id] = case
+            elif known.hash != case_fingerprint(case):
+                self.changes.updated.append(case_id)
+                if case.get("revokedDateTime") and not known.revoked:
+                    self.changes.revoked.append(case_id)
+                updates.setdefault(path, {})[case_id] = case
+
+        for path, replacements in updates.items():
+            for case in replacements.values():
+                self._store(case, path)
+            replaced = _replace_cases(path, replacements)
+            if replaced:
+                self.files.add(os.path.basename(path))
+                logger.info(f"Refreshed {len(replaced)} cases in {path}")
+            for case_id in replacements.keys() - replaced:
+                logger.warning(f"Case {case_id} missing from {path}, saving anew")
+                self.new_cases[case_id] = replacements[case_id]
+
+        if len(self.new_cases) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending new cases after the last saved page."""
+        cases = list(self.new_cases.values())
+        while cases:
+            batch, cases = cases[: self.batch_size], cases[self.batch_size :]
+            page_number = get_last_saved_page(self.directory)
+            file = page_file_name(page_number, self.compress)
+            for case in batch:
+                self._store(case, file)
+            save_cases(page_number, batch, self.directory, self.compress)
+            self.files.add(file)
+        self.new_cases.clear()
+
+    def finish(self) -> ChangeList:
+        self.flush()
+        save_manifest(self.directory, self.manifest)
+        self.changes.files = sorted(self.files)
+        save_changes(self.directory, self.changes)
+        return self.changes
+
+
+def sync_cases(directory: str, max_pages: int = -1) -> ChangeList:
+    """Walk the API from page 1 and refresh the cache where cases changed.
+
+    Every case is compared by id and content hash against the cache manifest.
+    Corrected or revoked cases are rewritten in the page file that holds them;
+    unseen cases are appended as new page files. Unchanged cases cost one hash.
+    The change list is saved to ``<cache>/sync/changes.json`` and returned.
+    ``max_pages`` limits the walk (-1 walks until the first empty page).
+    """
+    config = load_config()
+    os.makedirs(directory, exist_ok=True)
+    run = _Sync(directory, config)
+    try:
+        with DownloadClient.from_config(config) as client:
+            tokens = TokenManager(client)
+            page_number = 1
+            while max_pages < 0 or page_number <= max_pages:
+                cases = _fetch_cases(tokens, page_number, run.batch_size, client)
+                if not cases:
+                    break
+                run.add_page(cases)
+                page_number += 1
+    finally:
+        changes = run.finish()
+    logger.info(changes.describe())
+    return changes
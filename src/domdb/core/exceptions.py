@@ -4,6 +4,12 @@ class DownloadError(Exception):
     pass
 
 
+class AuthenticationError(DownloadError):
+    """Raised when the API rejects the access token (HTTP 401)."""
+
+    pass
+
+
 class ConversionError(Exception):
     """Custom exception for conversion errors."""
 
@@ -14,3 +20,9 @@ class EvidConversionError(Exception):
     """Custom exception for EVID conversion errors."""
 
     pass
+
+
+class PdfBackendError(Exception):
+    """Raised when the selected PDF backend is unknown or not installed."""
+
+    pass
@@ -0,0 +1,71 @@
+"""JSON decoding backend shared by every page reader.
+
+Uses orjson when it is installed (``pip install domdb[fast]``) and the stdlib
+``json`` module otherwise. Set ``DOMDB_JSON_BACKEND`` to ``json`` or ``orjson``
+to force a backend; ``set_backend`` switches at runtime (benchmarks, tests).
+"""
+
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+Decoder = Callable[[bytes | bytearray | memoryview | str], Any]
+
+
+def _orjson() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _stdlib() -> Decoder:
+    def loads(data):
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    return loads
+
+
+# Preferred first; "auto" picks the first one that imports.
+BACKENDS: dict[str, Callable[[], Decoder]] = {
+    "orjson": _orjson,
+    "json": _stdlib,
+}
+
+
+def available_backends() -> list[str]:
+    names = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the decoder used by ``loads``. Returns the backend chosen."""
+    global BACKEND, _loads
+    if name == "auto":
+        name = available_backends()[0]
+    elif name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; choose from {list(BACKENDS)}")
+    _loads = BACKENDS[name]()
+    BACKEND = name
+    return name
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode one JSON document with the selected backend.
+
+    Both backends raise ``ValueError`` subclasses on malformed input.
+    """
+    return _loads(data)
+
+
+BACKEND: str
+_loads: Decoder
+set_backend(os.environ.get("DOMDB_JSON_BACKEND", "auto"))
@@ -0,0 +1,152 @@
+"""Incremental splitting of JSON array files into raw element bytes.
+
+Page files are JSON arrays of cases that embed multi-megabyte base64 PDFs.
+``iter_array_items`` walks the bytes chunk by chunk, tracking only nesting
+depth and string state, and yields each top-level element as soon as it is
+complete, so memory is bounded by the largest element rather than the file.
+String bodies are skipped with ``re`` searches, which keeps long base64 values
+at C speed.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
+
+CHUNK_SIZE = 1 << 20
+
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_NON_WHITESPACE = re.compile(rb"[^ \t\r\n]")
+
+
+def read_chunks(handle: BinaryIO, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield ``size``-byte chunks from a binary file object until EOF."""
+    while chunk := handle.read(size):
+        yield chunk
+
+
+def _string_end(buf: bytes | bytearray, pos: int) -> int:
+    """Index of the quote closing the string that continues at ``pos``.
+
+    Returns ``-(resume + 1)`` when the closing quote is not in ``buf`` yet, where
+    ``resume`` is where scanning must continue once more bytes arrive. Uses
+    ``find`` (memchr) rather than a regex so base64 runs are skipped quickly.
+    """
+    while True:
+        quote = buf.find(b'"', pos)
+        backslash = buf.find(b"\\", pos, len(buf) if quote < 0 else quote)
+        if backslash < 0:
+            return quote if quote >= 0 else -len(buf) - 1
+        if backslash + 1 >= len(buf):
+            return -backslash - 1  # escape split across chunks
+        pos = backslash + 2
+
+
+def iter_array_items(chunks: Iterable[bytes]) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(offset, raw_bytes)`` for each element of a top-level JSON array.
+
+    ``offset`` is the element's byte position in the concatenated input. The
+    elements are not validated; decode them with ``json.loads``. Raises
+    ``ValueError`` if the document is not an array or ends early.
+    """
+    source = iter(chunks)
+    buf = bytearray()
+    base = 0  # absolute offset of buf[0]
+    pos = 0
+    depth = 0
+    opened = False
+    in_string = False
+    expect_element = False
+    start: int | None = None  # start of the current element in buf
+
+    while True:
+        if in_string:
+            end = _string_end(buf, pos)
+            if end >= 0:
+                in_string = False
+                pos = end + 1
+                continue
+            pos = -end - 1
+        elif not opened or expect_element:
+            match = _NON_WHITESPACE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+            elif not opened:
+                if buf[match.start()] != ord("["):
+                    raise ValueError("JSON document is not an array")
+                opened = True
+                depth = 1
+                expect_element = True
+                pos = match.end()
+                continue
+            else:
+                expect_element = False
+                pos = match.start()
+                if buf[pos] != ord("]"):
+                    start = pos
+                continue
+        else:
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+            else:
+                char = match.group()
+                pos = match.end()
+                if char == b'"':
+                    in_string = True
+                elif char in (b"[", b"{"):
+                    depth += 1
+                elif depth > 1:
+                    if char != b",":
+                        depth -= 1
+                else:
+                    if start is not None:
+                        raw = bytes(memoryview(buf)[start : match.start()])
+                        yield base + start, raw.rstrip()
+                        start = None
+                    if char == b"]":
+                        for _ in source:
+                            pass
+                        return
+                    if char == b",":
+                        expect_element = True
+                    else:
+                        raise ValueError("Unbalanced '}' in JSON array")
+                continue
+
+        # Need more input: drop consumed bytes but keep the unfinished element.
+        keep = pos if start is None else start
+        del buf[:keep]
+        base += keep
+        pos -= keep
+        if start is not None:
+            start = 0
+        chunk = next(source, None)
+        if chunk is None:
+            raise ValueError("Unexpected end of JSON array")
+        buf += chunk
+
+
+def drop_string_values(raw: bytes, keys: Iterable[str]) -> bytes:
+    """Replace string values of the given object keys with ``null``.
+
+    Runs on one raw element before decoding, so heavy fields (base64 PDFs,
+    HTML bodies) never become Python strings. Matching the quoted key followed
+    by ``:`` cannot hit text inside another string, where quotes are escaped.
+    """
+    names = b"|".join(re.escape(key.encode()) for key in keys)
+    if not names:
+        return raw
+    pattern = re.compile(rb'"(?:' + names + rb')"\s*:\s*"')
+    parts: list[bytes] = []
+    pos = 0
+    while match := pattern.search(raw, pos):
+        end = _string_end(raw, match.end())
+        if end < 0:
+            break
+        parts.append(raw[pos : match.end() - 1])
+        parts.append(b"null")
+        pos = end + 1
+    if not parts:
+        return raw
+    parts.append(raw[pos:])
+    return b"".join(parts)
@@ -0,0 +1,166 @@
+"""Manifest of cached cases and the change list written by ``sync``.
+
+The manifest maps every cached case id to a content hash and the page file
+holding it. It is the id-keyed view of the cache (see ``store``) and lets a
+sync tell new, corrected and revoked verdicts apart from unchanged ones
+without re-reading the cache. Each sync also records which ids and page files
+changed, for downstream steps that only need to redo that work.
+Both live in ``<cache>/sync/``, outside the page-file glob.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+from loguru import logger
+
+from .pages import iter_page, list_page_files, page_number
+from .tempfiles import mkstemp
+
+SYNC_DIRNAME = "sync"
+MANIFEST_NAME = "manifest.json"
+CHANGES_NAME = "changes.json"
+
+
+@dataclass
+class ManifestEntry:
+    hash: str
+    file: str
+    revoked: bool = False
+
+
+@dataclass
+class ChangeList:
+    """Ids and page files touched by one sync run."""
+
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    revoked: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    pages: int = 0
+
+    @property
+    def changed_ids(self) -> list[str]:
+        return self.added + self.updated
+
+    def describe(self) -> str:
+        return (
+            f"Scanned {self.pages} pages: {len(self.added)} added, "
+            f"{len(self.updated)} updated ({len(self.revoked)} revoked), "
+            f"{len(self.files)} page files written"
+        )
+
+
+def sync_path(directory: str, name: str) -> str:
+    return os.path.join(directory, SYNC_DIRNAME, name)
+
+
+def case_fingerprint(case: dict) -> str:
+    """SHA-256 over a raw case with each PDF reduced to the hash of its bytes.
+
+    An inline base64 ``contentPdf`` and the equivalent ``contentPdfBlob`` key
+    (which is the SHA-256 of the same bytes) fingerprint identically, so moving
+    PDFs into the blob store does not register as a change.
+    """
+    normalized = dict(case)
+    docs = []
+    for doc in case.get("documents") or []:
+        doc = dict(doc)
+        content = doc.pop("contentPdf", None)
+        if content:
+            try:
+                data = base64.b64decode(content, validate=True)
+            except (binascii.Error, ValueError):
+                data = content.encode("utf-8")
+            doc["contentPdfBlob"] = hashlib.sha256(data).hexdigest()
+        docs.append(doc)
+    if docs:
+        normalized["documents"] = docs
+    encoded = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def manifest_entry(case: dict, file: str) -> ManifestEntry:
+    return ManifestEntry(
+        hash=case_fingerprint(case),
+        file=os.path.basename(file),
+        revoked=bool(case.get("revokedDateTime")),
+    )
+
+
+def pages_oldest_first(directory: str) -> list[str]:
+    """Page files in download order, newest last.
+
+    Downloads and syncs always save after the last page, so the page number is
+    the download order. Modification times are not: ``storage compress``,
+    ``storage blobs``, sync refreshes and deduplication rewrite old pages in
+    place. Files without a page number sort first.
+    """
+
+    def order(path: str) -> tuple[int, str]:
+        number = page_number(path)
+        return (-1 if number is None else number), os.path.basename(path)
+
+    return sorted(list_page_files(directory), key=order)
+
+
+def build_manifest(directory: str) -> dict[str, ManifestEntry]:
+    """Fingerprint every cached case. The last-downloaded page wins duplicate ids."""
+    manifest: dict[str, ManifestEntry] = {}
+    for path in pages_oldest_first(directory):
+        for case in iter_page(path):
+            if case.get("id"):
+                manifest[case["id"]] = manifest_entry(case, path)
+    logger.info(f"Built manifest of {len(manifest)} cases from {directory}")
+    return manifest
+
+
+def _write_json(path: str, payload) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = mkstemp(os.path.dirname(path), ".sync.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def manifest_exists(directory: str) -> bool:
+    return os.path.exists(sync_path(directory, MANIFEST_NAME))
+
+
+def load_manifest(directory: str) -> dict[str, ManifestEntry]:
+    """Read the saved manifest, building it from the cache if there is none."""
+    if not manifest_exists(directory):
+        return build_manifest(directory)
+    with open(sync_path(directory, MANIFEST_NAME), encoding="utf-8") as handle:
+        return {
+            case_id: ManifestEntry(**entry)
+            for case_id, entry in json.load(handle).items()
+        }
+
+
+def save_manifest(directory: str, manifest: dict[str, ManifestEntry]) -> None:
+    payload = {case_id: asdict(entry) for case_id, entry in manifest.items()}
+    _write_json(sync_path(directory, MANIFEST_NAME), payload)
+
+
+def save_changes(directory: str, changes: ChangeList) -> str:
+    path = sync_path(directory, CHANGES_NAME)
+    _write_json(path, asdict(changes))
+    return path
+
+
+def load_changes(directory: str) -> ChangeList | None:
+    """The change list of the most recent sync, or None if never synced."""
+    path = sync_path(directory, CHANGES_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return ChangeList(**json.load(handle))
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from pydantic import BaseModel, RootModel, Field, field_validator
+from pydantic import BaseModel, RootModel, Field, PrivateAttr, field_validator
 
 
 class CaseSubject(BaseModel):
@@ -142,6 +142,8 @@ class Document(BaseModel):
 
     contentHtml: Optional[str] = None
     contentPdf: Optional[str] = None
+    # SHA-256 key of the PDF in the cache's blob store (replaces contentPdf).
+    contentPdfBlob: Optional[str] = None
     id: Optional[str] = None
     displayTitle: Optional[str] = None
     revokedDateTime: Optional[str] = None
@@ -186,6 +188,9 @@ class ModelItem(BaseModel):
     officeName: Optional[str] = None
     author: Optional[str] = None
 
+    # Cache directory the case was loaded from, used to resolve PDF blobs.
+    _cache_dir: Optional[str] = PrivateAttr(default=None)
+
     @field_validator(
         "horizontalCotreatmentCases", "verticalCotreatmentGroups", mode="before"
     )
@@ -0,0 +1,279 @@
+"""Page files in the case cache: discovery, reading and compression.
+
+A cache directory holds one JSON array of cases per downloaded page, stored
+either as plain ``cases_<n>.json`` or gzip-compressed ``cases_<n>.json.gz``.
+Every reader goes through this module so both formats work everywhere.
+"""
+
+import glob
+import gzip
+import json
+import mmap
+import os
+import shutil
+from collections.abc import Callable, Container, Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from loguru import logger
+
+from .jsoncodec import loads
+from .jsonstream import drop_string_values, iter_array_items, read_chunks
+from .snapshots import prune_snapshots, remove_snapshots
+from .tempfiles import mkstemp
+
+JSON_SUFFIX = ".json"
+GZIP_SUFFIX = ".json.gz"
+
+# Large string fields skipped when only a case's metadata is needed.
+HEAVY_FIELDS = ("contentPdf", "contentHtml")
+
+# Loader projections: the document bodies each one drops (sets to null) while
+# parsing. "metadata" serves citation exports, "html" the HTML body search.
+PROJECTIONS: dict[str, tuple[str, ...]] = {
+    "full": (),
+    "html": ("contentPdf",),
+    "metadata": HEAVY_FIELDS,
+}
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(GZIP_SUFFIX)
+
+
+def list_page_files(directory: str) -> list[str]:
+    """Sorted page files in ``directory``, plain and compressed.
+
+    If a page exists in both forms (an interrupted ``storage compress``), the
+    compressed copy wins since it is only renamed into place once complete.
+    """
+    plain = glob.glob(str(Path(directory) / f"*{JSON_SUFFIX}"))
+    compressed = set(glob.glob(str(Path(directory) / f"*{GZIP_SUFFIX}")))
+    files = [p for p in plain if p + ".gz" not in compressed]
+    return sorted(files + list(compressed))
+
+
+def page_number(path: str) -> int | None:
+    """Page number of a ``cases_<n>.json[.gz]`` file, or None for other names."""
+    name = os.path.basename(path)
+    if not name.startswith("cases_"):
+        return None
+    stem = name[len("cases_") :].split(".")[0]
+    return int(stem) if stem.isdigit() else None
+
+
+def resolve_page_path(path: str) -> str:
+    """Return ``path`` or its other-format sibling if the cache was converted."""
+    if os.path.exists(path):
+        return path
+    sibling = path[: -len(".gz")] if is_compressed(path) else path + ".gz"
+    return sibling if os.path.exists(sibling) else path
+
+
+def open_page(path: str) -> BinaryIO:
+    """Open a page file for binary reading, decompressing transparently."""
+    path = resolve_page_path(path)
+    if is_compressed(path):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_page(path: str) -> list[dict]:
+    """Decode a whole page file into a list of raw case dicts."""
+    with open_page(path) as handle:
+        return loads(handle.read())
+
+
+def iter_raw_cases(path: str) -> Iterator[bytes]:
+    """Yield the encoded bytes of each case in a page file, one at a time."""
+    with open_page(path) as src:
+        for _offset, item in iter_array_items(read_chunks(src)):
+            yield item
+
+
+def iter_page_entries(
+    path: str, projection: str = "full"
+) -> Iterator[tuple[int, int, dict]]:
+    """Yield ``(offset, length, case)`` for each case of a page file.
+
+    ``offset`` and ``length`` locate the case's encoded bytes in the
+    uncompressed page, so ``read_cases_at`` can fetch it again later without
+    scanning. See ``iter_page`` for ``projection``.
+    """
+    dropped = PROJECTIONS[projection]
+    with open_page(path) as src:
+        for offset, item in iter_array_items(read_chunks(src)):
+            case = loads(drop_string_values(item, dropped) if dropped else item)
+            yield offset, len(item), case
+
+
+def iter_page(path: str, projection: str = "full") -> Iterator[dict]:
+    """Yield each case of a page file as soon as it has been parsed.
+
+    Unlike ``read_page``, peak memory is bounded by the largest case (plus one
+    read chunk) rather than the whole file. A ``projection`` other than
+    ``"full"`` (see ``PROJECTIONS``) nulls the dropped document bodies in the
+    raw bytes, so they are never decoded into strings.
+    """
+    for _offset, _length, case in iter_page_entries(path, projection):
+        yield case
+
+
+def read_cases_at(
+    path: str, spans: Iterable[tuple[int, int]]
+) -> Iterator[tuple[int, dict]]:
+    """Decode the cases stored at the given ``(offset, length)`` spans.
+
+    Yields ``(offset, case)`` in offset order, opening the page once. Plain
+    pages are memory-mapped and only each case's slice is parsed, so the cost
+    does not depend on the page size. Gzip pages have no random access: the
+    stream is decompressed once, up to the last span, without parsing the
+    bytes in between. Raises ``ValueError`` if a span does not hold a JSON
+    object, e.g. because the page was rewritten since the offsets were taken.
+    """
+    path = resolve_page_path(path)
+    spans = sorted(spans)
+    if is_compressed(path):
+        with gzip.open(path, "rb") as src:
+            for offset, length in spans:
+                src.seek(offset)
+                yield offset, _decode_case(src.read(length), path, offset)
+        return
+    with open(path, "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        if spans and spans[-1][0] + spans[-1][1] > size:
+            raise ValueError(f"Offset {spans[-1][0]} is past the end of {path}")
+        if not spans:
+            return
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset, length in spans:
+                raw = mapped[offset : offset + length]
+                yield offset, _decode_case(raw, path, offset)
+
+
+def _decode_case(raw: bytes, path: str, offset: int) -> dict:
+    case = loads(raw)
+    if not isinstance(case, dict):
+        raise ValueError(f"No case at offset {offset} in {path}")
+    return case
+
+
+def _write_items(path: str, items: Iterable[bytes]) -> str:
+    """Write encoded cases as a JSON array to a temp file beside ``path``.
+
+    The temp file uses ``path``'s format (plain or gzip); the caller moves it
+    into place or removes it.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = mkstemp(directory, ".rewrite.", ".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            out = gzip.GzipFile(fileobj=raw, mode="wb") if is_compressed(path) else raw
+            out.write(b"[")
+            for count, item in enumerate(items):
+                out.write(b",\n" if count else b"\n")
+                out.write(item)
+            out.write(b"\n]\n")
+            if out is not raw:
+                out.close()
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _replace_if(tmp_path: str, path: str, changed: int) -> int:
+    if changed:
+        os.replace(tmp_path, path)
+    else:
+        os.unlink(tmp_path)
+    return changed
+
+
+def rewrite_page(path: str, transform: Callable[[dict], int]) -> int:
+    """Rewrite a page file case by case, keeping its format (plain or gzip).
+
+    ``transform`` edits each decoded case in place and returns how many changes
+    it made. Cases are written one at a time to a temp file, so memory stays
+    bounded by the largest case; the temp file replaces ``path`` atomically
+    only if anything changed. Returns the total number of changes.
+    """
+    path = resolve_page_path(path)
+    changed = 0
+
+    def items() -> Iterator[bytes]:
+        nonlocal changed
+        for item in iter_raw_cases(path):
+            case = loads(item)
+            changed += transform(case)
+            yield json.dumps(case, ensure_ascii=False).encode("utf-8")
+
+    return _replace_if(_write_items(path, items()), path, changed)
+
+
+def case_id(raw: bytes) -> str | None:
+    """Id of one encoded case, decoding only its light fields."""
+    return loads(drop_string_values(raw, HEAVY_FIELDS)).get("id")
+
+
+def drop_cases(path: str, ids: Container[str]) -> int:
+    """Remove the cases with the given ids from a page file.
+
+    Kept cases are copied as raw bytes without being decoded, and the file is
+    only replaced if something was dropped. Returns the number dropped.
+    """
+    path = resolve_page_path(path)
+    dropped = 0
+
+    def items() -> Iterator[bytes]:
+        nonlocal dropped
+        for item in iter_raw_cases(path):
+            if case_id(item) in ids:
+                dropped += 1
+            else:
+                yield item
+
+    return _replace_if(_write_items(path, items()), path, dropped)
+
+
+def compress_page_file(path: str) -> str:
+    """Gzip one plain page file in place and return the new path.
+
+    The compressed copy is written to a temp file and renamed into place before
+    the original is removed, so an interruption never loses a page. The
+    original's snapshots go with it.
+    """
+    target = path + ".gz"
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = mkstemp(directory, ".compress.", ".tmp")
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    os.unlink(path)
+    remove_snapshots(path)
+    return target
+
+
+def compress_cache(directory: str) -> tuple[int, int, int]:
+    """Compress every plain page file in ``directory``.
+
+    Returns ``(files, bytes_before, bytes_after)``.
+    """
+    files = bytes_before = bytes_after = 0
+    for path in list_page_files(directory):
+        if is_compressed(path):
+            continue
+        size = os.path.getsize(path)
+        target = compress_page_file(path)
+        files += 1
+        bytes_before += size
+        bytes_after += os.path.getsize(target)
+        logger.info(f"Compressed {path} ({size} -> {os.path.getsize(target)} bytes)")
+    prune_snapshots(directory)
+    return files, bytes_before, bytes_after
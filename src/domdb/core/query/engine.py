@@ -1,12 +1,14 @@
-import json
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from typing import TypeVar
 
 from loguru import logger
 
-from ..converters.text_utils import extract_case_text
+from ..converters.extraction import ExtractionService
 from ..model import ModelItem
 from .dates import case_verdict_date, date_in_range, parse_query_date
+from .hydrate import CaseHydrator
 from .index import IndexedCase, fetch_indexed_cases, index_exists
 from .loader import iter_cached_cases
 from .paragraph import ParagraphSpec, parse_paragraph_query, text_matches_paragraph
@@ -14,9 +16,15 @@ from .search import (
     html_body_search_text,
     metadata_search_text,
     normalize_keywords,
+    pages_contain_keywords,
     text_contains_keywords,
 )
 
+T = TypeVar("T")
+
+# Index rows matched per batch before their PDFs are loaded page by page.
+HYDRATE_WINDOW = 256
+
 
 @dataclass
 class QueryParams:
@@ -54,13 +62,13 @@ class CaseHit:
 class SearchableCase:
     """Searchable text surface shared by cache-scan and index match paths.
 
-    ``body_text`` / ``full_text`` are callables so HTML extraction and PDF load
-    stay lazy until keyword/paragraph matching actually needs them.
+    ``body_text`` is a callable so HTML extraction stays lazy until keyword or
+    paragraph matching actually needs it. PDF text is matched separately, once
+    the extraction service has produced it.
     """
 
     metadata_text: str
     body_text: Callable[[], str] = field(repr=False, hash=False, compare=False)
-    full_text: Callable[[], str | None] = field(repr=False, hash=False, compare=False)
 
 
 def _case_hit(case: ModelItem, fields: dict[str, str]) -> CaseHit:
@@ -85,34 +93,17 @@ def _case_hit_from_index(row: IndexedCase) -> CaseHit:
     )
 
 
-def _load_case_from_file(path: str, case_id: str) -> ModelItem | None:
-    with open(path, encoding="utf-8") as handle:
-        cases_data = json.load(handle)
-    for case_data in cases_data:
-        if case_data.get("id") == case_id:
-            return ModelItem.model_validate(case_data)
-    return None
-
-
 def _searchable_from_case(case: ModelItem) -> SearchableCase:
     return SearchableCase(
         metadata_text=metadata_search_text(case),
         body_text=lambda: html_body_search_text(case),
-        full_text=lambda: extract_case_text(case).lower(),
     )
 
 
 def _searchable_from_index(row: IndexedCase) -> SearchableCase:
-    def full_text() -> str | None:
-        case = _load_case_from_file(row.source_file, row.id)
-        if case is None:
-            return None
-        return extract_case_text(case).lower()
-
     return SearchableCase(
         metadata_text=row.metadata_text,
         body_text=lambda: row.body_text,
-        full_text=full_text,
     )
 
 
@@ -138,13 +129,13 @@ def _text_matches(
     return True
 
 
-def _matches(
+def _match_without_pdf(
     case: SearchableCase,
     params: QueryParams,
     keywords: list[str],
     paragraph_spec: ParagraphSpec | None,
-) -> bool:
-    """Keyword / paragraph / full-text match against a searchable case."""
+) -> bool | None:
+    """Match on metadata and HTML body; None when only the PDF text can decide."""
     if _text_matches(case.metadata_text, keywords, paragraph_spec):
         return True
     if not _needs_body_search(params, paragraph_spec):
@@ -153,15 +144,47 @@ def _matches(
     haystack = case.metadata_text + "\n" + case.body_text()
     if _text_matches(haystack, keywords, paragraph_spec):
         return True
-    if not params.full_text:
-        return False
+    return None if params.full_text else False
+
 
-    body = case.full_text()
-    if body is None:
+def _match_pdf(
+    case: SearchableCase,
+    page_texts: Iterable[str] | None,
+    keywords: list[str],
+    paragraph_spec: ParagraphSpec | None,
+) -> bool:
+    if page_texts is None:
         return False
+    if not (paragraph_spec and paragraph_spec.section):
+        return pages_contain_keywords(page_texts, keywords, case.metadata_text)
+    body = "\n".join(page_texts).lower()
     return _text_matches(case.metadata_text + "\n" + body, keywords, paragraph_spec)
 
 
+def _resolve_pdf_matches(
+    candidates: Iterable[tuple[tuple[T, SearchableCase, bool | None], object]],
+    service: ExtractionService | None,
+    keywords: list[str],
+    paragraph_spec: ParagraphSpec | None,
+) -> Iterator[T]:
+    """Payloads of matching candidates, in order.
+
+    Each candidate is ``((payload, searchable, matched), case)``; ``case`` is
+    only set when ``matched`` is None, and its PDF text then decides through
+    the extraction service, which works ahead on later candidates and stops
+    extracting a case once its keywords have all been seen.
+    """
+    if service is None:
+        resolved = ((item, None) for item, _case in candidates)
+    else:
+        resolved = service.attach(candidates)
+    for (payload, searchable, matched), page_texts in resolved:
+        if matched is None:
+            matched = _match_pdf(searchable, page_texts, keywords, paragraph_spec)
+        if matched:
+            yield payload
+
+
 def _scan_filters_match(
     case: ModelItem,
     params: QueryParams,
@@ -170,7 +193,8 @@ def _scan_filters_match(
 ) -> bool:
     """Date / court / subject filters for the full JSON cache scan path.
 
-    The index path applies the same filters in SQL via ``fetch_indexed_cases``.
+    The index path applies the same filters in SQL via ``fetch_indexed_cases``,
+    along with a full-text prefilter on keywords.
     """
     from ..converters.fields import parse_case_fields
 
@@ -197,29 +221,63 @@ def _iter_hits(directory: str, params: QueryParams):
     from_d = parse_query_date(params.from_date)
     to_d = parse_query_date(params.to_date)
 
-    if index_exists(directory):
-        rows = fetch_indexed_cases(
-            directory,
-            from_date=params.from_date,
-            to_date=params.to_date,
-            court=params.court,
-            subject=params.subject,
-        )
-        for row in rows:
-            if _matches(_searchable_from_index(row), params, keywords, paragraph_spec):
-                yield _case_hit_from_index(row)
-        return
-
-    logger.info(
-        "No query index found; scanning JSON cache (run `domdb query index` for speed)"
-    )
+    with ExtractionService() if params.full_text else nullcontext() as service:
+        if index_exists(directory):
+            rows = fetch_indexed_cases(
+                directory,
+                from_date=params.from_date,
+                to_date=params.to_date,
+                court=params.court,
+                subject=params.subject,
+                keywords=keywords,
+                search_body=_needs_body_search(params, paragraph_spec),
+                keep_pdf=params.full_text,
+            )
+            candidates = _index_candidates(rows, params, keywords, paragraph_spec)
+        else:
+            logger.info(
+                "No query index found; scanning JSON cache "
+                "(run `domdb query index` for speed)"
+            )
+            candidates = _scan_candidates(
+                directory, params, keywords, paragraph_spec, from_d, to_d
+            )
+        yield from _resolve_pdf_matches(candidates, service, keywords, paragraph_spec)
+
+
+def _index_candidates(rows, params, keywords, paragraph_spec):
+    # Rows go through in windows: the ones only a PDF can decide are
+    # registered first, so each page file is read once per window rather than
+    # once per candidate.
+    hydrator = CaseHydrator()
+    for start in range(0, len(rows), HYDRATE_WINDOW):
+        window = rows[start : start + HYDRATE_WINDOW]
+        searchable = [_searchable_from_index(row) for row in window]
+        matched = [
+            _match_without_pdf(case, params, keywords, paragraph_spec)
+            for case in searchable
+        ]
+        hydrator.want(row for row, m in zip(window, matched) if m is None)
+        for row, case, m in zip(window, searchable, matched):
+            if m is not False:
+                hit = _case_hit_from_index(row)
+                yield (hit, case, m), hydrator.get(row) if m is None else None
+
+
+def _scan_candidates(directory, params, keywords, paragraph_spec, from_d, to_d):
     from ..converters.fields import parse_case_fields
 
-    for case, _source in iter_cached_cases(directory):
+    # PDFs are only needed for --full-text; HTML bodies feed the body search.
+    projection = "full" if params.full_text else "html"
+    for case, _source in iter_cached_cases(directory, True, projection):
         if not _scan_filters_match(case, params, from_d, to_d):
             continue
-        if _matches(_searchable_from_case(case), params, keywords, paragraph_spec):
-            yield _case_hit(case, parse_case_fields(case))
+        searchable = _searchable_from_case(case)
+        m = _match_without_pdf(searchable, params, keywords, paragraph_spec)
+        if m is False:
+            continue
+        hit = _case_hit(case, parse_case_fields(case))
+        yield (hit, searchable, m), case if m is None else None
 
 
 def count_cases(directory: str, params: QueryParams) -> int:
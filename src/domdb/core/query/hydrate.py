@@ -0,0 +1,93 @@
+"""Loading full cases for index rows, one page file at a time.
+
+Index rows carry metadata and HTML text but not PDFs, so ``--full-text``
+queries must go back to the page files for the candidates the index alone
+cannot decide. ``CaseHydrator`` collects those candidates first, then serves
+them grouped by ``source_file``: the first request for a page reads every
+pending case of that page in one pass, and the results stay in a small LRU of
+pages until they are handed out.
+"""
+
+import os
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+
+from loguru import logger
+
+from ..compact import CompactCase, compact_case
+from ..pages import iter_page, read_cases_at
+from .index import IndexedCase
+
+# Pages whose pending cases are kept in memory at once.
+PAGE_CACHE_SIZE = 8
+
+
+class CaseHydrator:
+    """Hand out the full case behind index rows, reading each page once."""
+
+    def __init__(self, max_pages: int = PAGE_CACHE_SIZE):
+        self.max_pages = max_pages
+        self.page_reads = 0
+        self._pending: defaultdict[str, dict[str, IndexedCase]] = defaultdict(dict)
+        self._pages: OrderedDict[str, dict[str, CompactCase]] = OrderedDict()
+
+    def want(self, rows: Iterable[IndexedCase]) -> None:
+        """Register rows that will be requested, so their pages load together."""
+        for row in rows:
+            self._pending[row.source_file][row.id] = row
+
+    def get(self, row: IndexedCase) -> CompactCase | None:
+        """The case for ``row``, or None if its page no longer holds it."""
+        page = self._pages.get(row.source_file)
+        if page is None or row.id not in page:
+            self.want([row])
+            page = self._load(row.source_file)
+        self._pages.move_to_end(row.source_file)
+        return page.pop(row.id, None)
+
+    def _load(self, path: str) -> dict[str, CompactCase]:
+        rows = self._pending.pop(path, {})
+        self.page_reads += 1
+        cases = _read_rows(path, rows)
+        page = self._pages.setdefault(path, {})
+        page.update(cases)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+
+def _read_rows(path: str, rows: dict[str, IndexedCase]) -> dict[str, CompactCase]:
+    """Read the cases for ``rows`` from one page, by offset when possible.
+
+    Falls back to one scan of the page if an offset is missing or stale (the
+    page was rewritten after indexing, e.g. by sync or dedupe).
+    """
+    cache_dir = os.path.dirname(path)
+    by_offset = {
+        row.case_offset: row
+        for row in rows.values()
+        if row.case_offset is not None and row.case_length is not None
+    }
+    if len(by_offset) == len(rows):
+        spans = [(row.case_offset, row.case_length) for row in by_offset.values()]
+        try:
+            cases = {
+                by_offset[offset].id: case
+                for offset, case in read_cases_at(path, spans)
+                if case.get("id") == by_offset[offset].id
+            }
+        except (OSError, ValueError) as exc:
+            logger.debug(f"Stale offsets in {path}: {exc}")
+        else:
+            if len(cases) == len(rows):
+                return {k: compact_case(v, cache_dir) for k, v in cases.items()}
+            logger.debug(f"Stale offsets in {path}")
+
+    cases = {}
+    for case_data in iter_page(path):
+        case_id = case_data.get("id")
+        if case_id in rows and case_id not in cases:
+            cases[case_id] = compact_case(case_data, cache_dir)
+            if len(cases) == len(rows):
+                break
+    return cases
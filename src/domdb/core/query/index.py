@@ -1,3 +1,13 @@
+"""SQLite index of the case cache for ``domdb query``.
+
+``cases`` holds one row per case with its filter fields and lower-cased
+search texts; ``cases_fts`` is an FTS5 trigram index over those texts, so
+keyword filters run inside SQLite as substring matches. The trigram index
+can only look up keywords of three or more characters and is a prefilter:
+the query engine still checks every returned row in Python, which keeps
+the results identical to a cache scan.
+"""
+
 import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
@@ -5,11 +15,14 @@ from pathlib import Path
 from loguru import logger
 
 from ..converters.fields import parse_case_fields
-from .loader import iter_cached_cases
+from .loader import iter_cached_entries
 from .search import html_body_search_text, metadata_search_text
 
 INDEX_FILENAME = ".domdb-query.sqlite"
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 4
+
+# Shortest keyword the trigram tokenizer can match.
+FTS_MIN_LENGTH = 3
 
 
 @dataclass(frozen=True)
@@ -25,6 +38,8 @@ class IndexedCase:
     body_text: str
     has_pdf: bool
     source_file: str
+    case_offset: int | None = None
+    case_length: int | None = None
 
 
 def index_path(directory: str) -> Path:
@@ -32,7 +47,24 @@ def index_path(directory: str) -> Path:
 
 
 def index_exists(directory: str) -> bool:
-    return index_path(directory).is_file()
+    """Whether a usable index exists.
+
+    An index written with an older schema counts as missing, so queries fall
+    back to scanning the cache until ``domdb query index`` rebuilds it.
+    """
+    path = index_path(directory)
+    if not path.is_file():
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone()
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return row is not None and row[0] == str(SCHEMA_VERSION)
 
 
 def _connect(directory: str) -> sqlite3.Connection:
@@ -60,11 +92,44 @@ def _init_schema(conn: sqlite3.Connection) -> None:
             metadata_text TEXT NOT NULL,
             body_text TEXT NOT NULL,
             has_pdf INTEGER NOT NULL,
-            source_file TEXT NOT NULL
+            source_file TEXT NOT NULL,
+            case_offset INTEGER NOT NULL,
+            case_length INTEGER NOT NULL
         );
         CREATE INDEX IF NOT EXISTS idx_cases_verdict_date ON cases(verdict_date);
         """
     )
+    try:
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE cases_fts USING fts5(
+                metadata_text, body_text,
+                content='cases', tokenize='trigram'
+            )
+            """
+        )
+    except sqlite3.OperationalError as exc:
+        # FTS5 or its trigram tokenizer (SQLite 3.34+) is missing.
+        logger.warning(f"No full-text index ({exc}); keywords are matched in Python")
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    return (
+        conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'").fetchone()
+        is not None
+    )
+
+
+def _fts_query(keywords: list[str], search_body: bool) -> str | None:
+    """FTS5 expression requiring every keyword the trigram index can match."""
+    phrases = []
+    for keyword in keywords:
+        # A keyword spanning the metadata/body join can't be found per column.
+        if len(keyword) < FTS_MIN_LENGTH or "\n" in keyword:
+            continue
+        phrase = '"' + keyword.replace('"', '""') + '"'
+        phrases.append(phrase if search_body else f"metadata_text : {phrase}")
+    return " AND ".join(phrases) or None
 
 
 def build_index(directory: str) -> int:
@@ -84,7 +149,9 @@ def build_index(directory: str) -> int:
 
         rows: list[tuple] = []
         seen_ids: set[str] = set()
-        for case, source_file in iter_cached_cases(directory):
+        for case, source_file, offset, length in iter_cached_entries(
+            directory, compact=True
+        ):
             if case.id in seen_ids:
                 continue
             seen_ids.add(case.id)
@@ -92,7 +159,9 @@ def build_index(directory: str) -> int:
             verdict_date = fields["verdict_date"]
             if verdict_date == "Unknown":
                 verdict_date = None
-            has_pdf = any(doc.contentPdf for doc in case.documents or [])
+            has_pdf = any(
+                doc.contentPdf or doc.contentPdfBlob for doc in case.documents or []
+            )
             rows.append(
                 (
                     case.id,
@@ -106,6 +175,8 @@ def build_index(directory: str) -> int:
                     html_body_search_text(case),
                     int(has_pdf),
                     source_file,
+                    offset,
+                    length,
                 )
             )
 
@@ -113,11 +184,14 @@ def build_index(directory: str) -> int:
             """
             INSERT INTO cases (
                 id, verdict_date, headline, author, court, subjects,
-                case_number, metadata_text, body_text, has_pdf, source_file
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                case_number, metadata_text, body_text, has_pdf, source_file,
+                case_offset, case_length
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             rows,
         )
+        if _has_fts(conn):
+            conn.execute("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
         conn.commit()
         logger.info(f"Indexed {len(rows)} cases at {path}")
         return len(rows)
@@ -132,8 +206,17 @@ def fetch_indexed_cases(
     to_date: str | None = None,
     court: str | None = None,
     subject: str | None = None,
+    keywords: list[str] | None = None,
+    search_body: bool = False,
+    keep_pdf: bool = False,
 ) -> list[IndexedCase]:
-    """Return index rows pre-filtered by date, court, and subject."""
+    """Return index rows pre-filtered by date, court, subject, and keywords.
+
+    ``keywords`` (lower-cased) must occur in the metadata text, or in the
+    metadata or body text with ``search_body``. With ``keep_pdf`` cases that
+    have a PDF are returned regardless, since their PDF text may hold the
+    keywords. The keyword filter may let extra rows through; callers re-check.
+    """
     if not index_exists(directory):
         return []
 
@@ -154,17 +237,23 @@ def fetch_indexed_cases(
         clauses.append("subjects LIKE ?")
         params.append(f"%{subject.lower()}%")
 
-    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    sql = f"""
-        SELECT id, verdict_date, headline, author, court, subjects,
-               case_number, metadata_text, body_text, has_pdf, source_file
-        FROM cases
-        {where}
-        ORDER BY verdict_date DESC, headline
-    """
-
     conn = _connect(directory)
     try:
+        match = _fts_query(keywords or [], search_body) if _has_fts(conn) else None
+        if match:
+            fts = "rowid IN (SELECT rowid FROM cases_fts WHERE cases_fts MATCH ?)"
+            clauses.append(f"({fts} OR has_pdf)" if keep_pdf else fts)
+            params.append(match)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"""
+            SELECT id, verdict_date, headline, author, court, subjects,
+                   case_number, metadata_text, body_text, has_pdf, source_file,
+                   case_offset, case_length
+            FROM cases
+            {where}
+            ORDER BY verdict_date DESC, headline
+        """
         cur = conn.execute(sql, params)
         return [
             IndexedCase(
@@ -179,6 +268,8 @@ def fetch_indexed_cases(
                 body_text=row["body_text"],
                 has_pdf=bool(row["has_pdf"]),
                 source_file=row["source_file"],
+                case_offset=row["case_offset"],
+                case_length=row["case_length"],
             )
             for row in cur.fetchall()
         ]
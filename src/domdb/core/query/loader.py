@@ -1,25 +1,67 @@
-import glob
-import json
+import os
 from collections.abc import Iterator
-from pathlib import Path
 
 from loguru import logger
 from pydantic import ValidationError
 
+from ..compact import CompactCase, compact_case
 from ..model import ModelItem
+from ..pages import iter_page_entries, list_page_files
+from ..snapshots import SnapshotStats, page_cases
 
 
-def iter_cached_cases(directory: str) -> Iterator[tuple[ModelItem, str]]:
-    """Yield (case, source_json_path) from all JSON files in the cache directory."""
-    pattern = str(Path(directory) / "*.json")
-    for path in sorted(glob.glob(pattern)):
-        with open(path, encoding="utf-8") as handle:
-            cases_data = json.load(handle)
-        for case_data in cases_data:
-            try:
-                case = ModelItem.model_validate(case_data)
-            except ValidationError as exc:
-                logger.debug(f"Skipping invalid case in {path}: {exc}")
-                continue
-            if case.id:
+def _page_entries(
+    path: str, compact: bool, projection: str
+) -> Iterator[tuple[ModelItem | CompactCase, int, int]]:
+    cache_dir = os.path.dirname(path)
+    for offset, length, case_data in iter_page_entries(path, projection):
+        if compact:
+            if case_data.get("id"):
+                yield compact_case(case_data, cache_dir), offset, length
+            continue
+        try:
+            case = ModelItem.model_validate(case_data)
+        except ValidationError as exc:
+            logger.debug(f"Skipping invalid case in {path}: {exc}")
+            continue
+        if case.id:
+            case._cache_dir = cache_dir
+            yield case, offset, length
+
+
+def iter_cached_entries(
+    directory: str, compact: bool = False, projection: str = "full"
+) -> Iterator[tuple[ModelItem | CompactCase, str, int, int]]:
+    """Yield (case, source_json_path, offset, length) from all page files.
+
+    ``offset`` and ``length`` locate the case in its page for
+    ``pages.read_cases_at``. Page files are parsed one case at a time, so memory
+    is bounded by the largest case. ``compact=True`` yields unvalidated
+    ``CompactCase`` views instead of models; ``projection`` drops unneeded
+    document bodies (see ``pages.PROJECTIONS``).
+    """
+    for path in list_page_files(directory):
+        for case, offset, length in _page_entries(path, compact, projection):
+            yield case, path, offset, length
+
+
+def iter_cached_cases(
+    directory: str, compact: bool = False, projection: str = "full"
+) -> Iterator[tuple[ModelItem | CompactCase, str]]:
+    """Yield (case, source_json_path) from all page files in the cache directory.
+
+    Pages loaded with a PDF-free projection come from their snapshots when
+    valid (see ``snapshots``). See ``iter_cached_entries`` for ``compact`` and
+    ``projection``.
+    """
+    stats = SnapshotStats()
+    try:
+        for path in list_page_files(directory):
+
+            def parse(path=path):
+                return (case for case, _, _ in _page_entries(path, compact, projection))
+
+            for case in page_cases(path, projection, compact, parse, stats):
                 yield case, path
+    finally:
+        stats.report()
@@ -1,9 +1,9 @@
+from collections.abc import Iterable
 from typing import Optional
 
-from bs4 import BeautifulSoup
-
 from ..model import ModelItem
 from ..converters.fields import parse_case_fields
+from ..converters.html_text import html_to_text
 
 
 def normalize_keywords(keywords: Optional[list[str]]) -> list[str]:
@@ -34,11 +34,30 @@ def text_contains_keywords(haystack: str, keywords: list[str]) -> bool:
     return all(k in lower for k in keywords)
 
 
+def pages_contain_keywords(
+    pages: Iterable[str], keywords: list[str], seen: str = ""
+) -> bool:
+    """True once every keyword has appeared in ``seen`` or in one of ``pages``.
+
+    Stops at the first page that completes the set, so a lazy page stream is
+    only extracted as far as needed. A keyword must occur within one page.
+    """
+    seen = seen.lower()
+    remaining = [k for k in keywords if k not in seen]
+    if not remaining:
+        return True
+    for page in pages:
+        lower = page.lower()
+        remaining = [k for k in remaining if k not in lower]
+        if not remaining:
+            return True
+    return False
+
+
 def html_body_search_text(case: ModelItem) -> str:
     """Fast plain-text extraction from HTML documents only (no PDF)."""
     chunks: list[str] = []
     for doc in case.documents or []:
         if doc.contentHtml:
-            soup = BeautifulSoup(doc.contentHtml, "html.parser")
-            chunks.append(soup.get_text(separator="\n", strip=True))
+            chunks.append(html_to_text(doc.contentHtml))
     return "\n".join(chunks).lower()
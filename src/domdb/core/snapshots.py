@@ -0,0 +1,232 @@
+"""Pickled snapshots of parsed and validated page files.
+
+Page files rarely change after download, yet every converter run and cache
+scan decodes their JSON and validates each case again. For the projections
+that drop PDFs (see ``SNAPSHOT_PROJECTIONS``) the loaders keep a snapshot of
+each page's finished case objects in a hidden file next to it,
+``.<page>.<projection>[.compact].snapshot``, outside the page-file glob.
+
+A snapshot is used while the page's size, mtime and inode match those
+recorded in it (page rewrites replace the file, so a same-size rewrite within
+the mtime resolution still gets a new inode). If only the mtime or inode
+differs (a copy or ``touch``), the page's SHA-256 decides, and a matching
+snapshot is re-stamped. Pickles restore objects without validating them, so
+the header also carries a ``schema_fingerprint`` of the package version and
+the case model; a snapshot written for another model layout is a miss like
+an unreadable one or another ``SNAPSHOT_VERSION``: the page is parsed and the
+snapshot rewritten. Set ``DOMDB_SNAPSHOTS=0`` to disable them.
+
+Snapshots of a page that is renamed or removed (``storage compress``) are
+deleted with it; ``prune_snapshots`` clears any left behind.
+"""
+
+import glob
+import hashlib
+import importlib.metadata
+import json
+import os
+import pickle
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import cache
+
+from loguru import logger
+
+from .model import ModelItem
+from .tempfiles import mkstemp
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Only projections without PDFs: snapshots of "full" would duplicate them.
+SNAPSHOT_PROJECTIONS = ("metadata", "html")
+
+
+@dataclass
+class SnapshotStats:
+    """Snapshot hits and misses over one loader run."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Snapshot cache: {self.hits}/{self.hits + self.misses} pages hit "
+            f"({self.rate:.0%})"
+        )
+
+    def report(self) -> None:
+        if self.hits or self.misses:
+            logger.info(self.describe())
+
+
+def snapshots_enabled(projection: str) -> bool:
+    if os.environ.get("DOMDB_SNAPSHOTS", "1") in ("0", "false", "no"):
+        return False
+    return projection in SNAPSHOT_PROJECTIONS
+
+
+def snapshot_path(page_path: str, projection: str, compact: bool) -> str:
+    directory, name = os.path.split(page_path)
+    kind = f"{projection}.compact" if compact else projection
+    return os.path.join(directory, f".{name}.{kind}{SNAPSHOT_SUFFIX}")
+
+
+@cache
+def schema_fingerprint() -> str:
+    """Package version and a hash of the case model's JSON schema.
+
+    Compact views are generated from the same model, so this changes whenever
+    a model field is added, renamed or retyped, even without a release.
+    """
+    try:
+        version = importlib.metadata.version("domdb")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    schema = json.dumps(ModelItem.model_json_schema(), sort_keys=True)
+    return f"{version}:{hashlib.sha256(schema.encode('utf-8')).hexdigest()}"
+
+
+def _unlink(path: str) -> bool:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        logger.debug(f"Could not remove snapshot {path}: {exc}")
+        return False
+    return True
+
+
+def remove_snapshots(page_path: str) -> int:
+    """Delete every snapshot of one page file; returns how many."""
+    return sum(
+        _unlink(snapshot_path(page_path, projection, compact))
+        for projection in SNAPSHOT_PROJECTIONS
+        for compact in (False, True)
+    )
+
+
+def prune_snapshots(directory: str) -> int:
+    """Delete snapshots whose page file no longer exists; returns how many."""
+    removed = 0
+    for path in glob.glob(os.path.join(glob.escape(directory), f".*{SNAPSHOT_SUFFIX}")):
+        # ".<page>.<projection>[.compact].snapshot"
+        name = os.path.basename(path)[1 : -len(SNAPSHOT_SUFFIX)]
+        page = name.removesuffix(".compact").rsplit(".", 1)[0]
+        if not os.path.exists(os.path.join(directory, page)):
+            removed += _unlink(path)
+    if removed:
+        logger.info(f"Removed {removed} orphaned snapshots from {directory}")
+    return removed
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _header(page_path: str, sha256: str | None = None) -> dict:
+    stat = os.stat(page_path)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "schema": schema_fingerprint(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "sha256": sha256 or file_sha256(page_path),
+    }
+
+
+def load_snapshot(page_path: str, projection: str, compact: bool) -> list | None:
+    """Cases from the page's snapshot, or None if it is missing or stale."""
+    path = snapshot_path(page_path, projection, compact)
+    try:
+        with open(path, "rb") as handle:
+            header = pickle.load(handle)
+            stat = os.stat(page_path)
+            if header.get("version") != SNAPSHOT_VERSION:
+                return None
+            if header.get("schema") != schema_fingerprint():
+                return None
+            if header["size"] != stat.st_size:
+                return None
+            touched = (header["mtime_ns"], header["inode"]) != (
+                stat.st_mtime_ns,
+                stat.st_ino,
+            )
+            if touched and header["sha256"] != file_sha256(page_path):
+                return None
+            cases = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # corrupt or written by an incompatible version
+        logger.debug(f"Ignoring snapshot {path}: {exc}")
+        return None
+    if touched:
+        save_snapshot(page_path, projection, compact, cases, header["sha256"])
+    return cases
+
+
+def save_snapshot(
+    page_path: str,
+    projection: str,
+    compact: bool,
+    cases: list,
+    sha256: str | None = None,
+) -> None:
+    """Write the snapshot atomically; failures only cost the next run a miss."""
+    path = snapshot_path(page_path, projection, compact)
+    directory = os.path.dirname(path) or "."
+    try:
+        header = _header(page_path, sha256)
+        fd, tmp_path = mkstemp(directory, ".snapshot.", ".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(header, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(cases, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as exc:
+        logger.debug(f"Could not write snapshot {path}: {exc}")
+
+
+def page_cases(
+    page_path: str,
+    projection: str,
+    compact: bool,
+    parse: Callable[[], Iterable],
+    stats: SnapshotStats | None = None,
+) -> Iterable:
+    """One page's cases, from its snapshot when valid, else from ``parse()``.
+
+    ``parse`` yields the page's finished case objects; on a miss they are
+    collected and snapshotted. Restored cases get their ``_cache_dir`` reset,
+    so a cache directory can be moved. Without snapshots for ``projection``,
+    ``parse()`` is returned as is and nothing is counted.
+    """
+    if not snapshots_enabled(projection):
+        return parse()
+    cases = load_snapshot(page_path, projection, compact)
+    if cases is not None:
+        if stats is not None:
+            stats.hits += 1
+        cache_dir = os.path.dirname(page_path)
+        for case in cases:
+            case._cache_dir = cache_dir
+        return cases
+    if stats is not None:
+        stats.misses += 1
+    cases = list(parse())
+    save_snapshot(page_path, projection, compact, cases)
+    return cases
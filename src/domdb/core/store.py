@@ -0,0 +1,88 @@
+"""Id-keyed view of the page cache with last-write-wins deduplication.
+
+Pages are stored as the API served them, so a case can be saved in several
+``cases_*.json`` files (pagination shifts, re-downloads). Whenever pages are
+ingested, the manifest is pointed at the new copies and older copies of the
+same ids are dropped from their page files, so every reader sees each case
+exactly once.
+"""
+
+import os
+
+from loguru import logger
+
+from .manifest import (
+    ManifestEntry,
+    build_manifest,
+    load_manifest,
+    manifest_entry,
+    manifest_exists,
+    save_manifest,
+)
+from .pages import (
+    case_id,
+    drop_cases,
+    iter_page,
+    iter_raw_cases,
+    list_page_files,
+    resolve_page_path,
+)
+
+
+def _drop_stale(directory: str, stale: dict[str, set[str]]) -> int:
+    dropped = 0
+    for file, ids in sorted(stale.items()):
+        path = resolve_page_path(os.path.join(directory, file))
+        if not os.path.exists(path):
+            continue
+        removed = drop_cases(path, ids)
+        if removed:
+            logger.info(f"Dropped {removed} superseded cases from {path}")
+        dropped += removed
+    return dropped
+
+
+def dedupe_cache(directory: str) -> tuple[int, int]:
+    """Keep only the newest copy of every case id in ``directory``.
+
+    Rebuilds the manifest from scratch (highest page number wins) and drops every
+    other copy. Returns ``(files_rewritten, cases_dropped)``.
+    """
+    manifest = build_manifest(directory)
+    stale: dict[str, set[str]] = {}
+    for path in list_page_files(directory):
+        file = os.path.basename(path)
+        for raw in iter_raw_cases(path):
+            key = case_id(raw)
+            owner = manifest.get(key)
+            if owner is not None and owner.file != file:
+                stale.setdefault(file, set()).add(key)
+    dropped = _drop_stale(directory, stale)
+    save_manifest(directory, manifest)
+    return len(stale), dropped
+
+
+def record_pages(directory: str, paths: list[str]) -> int:
+    """Make freshly saved pages the owners of their case ids.
+
+    Copies of the same ids in other page files are dropped and the manifest is
+    updated. Without a manifest yet, the whole cache is deduplicated once.
+    Returns the number of superseded cases dropped.
+    """
+    if not manifest_exists(directory):
+        return dedupe_cache(directory)[1]
+    manifest: dict[str, ManifestEntry] = load_manifest(directory)
+    stale: dict[str, set[str]] = {}
+    for path in paths:
+        file = os.path.basename(path)
+        for case in iter_page(path):
+            key = case.get("id")
+            if not key:
+                continue
+            previous = manifest.get(key)
+            if previous is not None and previous.file != file:
+                stale.setdefault(previous.file, set()).add(key)
+            manifest[key] = manifest_entry(case, path)
+    dropped = _drop_stale(directory, stale)
+    save_manifest(directory, manifest)
+    return dropped
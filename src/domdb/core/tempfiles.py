@@ -0,0 +1,23 @@
+"""Temp files that are renamed into the cache.
+
+Cache files are written to a temp file beside their target and moved into
+place with ``os.replace``. ``tempfile.mkstemp`` creates files readable by
+their owner only, so without a fix-up every downloaded, compressed or
+rewritten file would end up mode 0600 while files written directly follow the
+umask, and a cache shared between users or services would break.
+"""
+
+import os
+import tempfile
+
+# os.umask can only be read by setting it, which is not safe once download
+# threads are creating files, so it is read once at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def mkstemp(directory: str, prefix: str, suffix: str = "") -> tuple[int, str]:
+    """``tempfile.mkstemp`` in ``directory``, with the mode ``open`` would use."""
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=directory)
+    os.chmod(path, 0o666 & ~_UMASK)
+    return fd, path
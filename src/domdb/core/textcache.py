@@ -0,0 +1,292 @@
+"""On-disk cache of text extracted from case documents.
+
+PDF extraction with pdfplumber is by far the slowest step of ``output j2e``,
+``output md --full-text`` and ``query --full-text``, and all three extract the
+same documents again on every run. ``text_utils`` stores each document's page
+texts here, keyed by document id and content hash, so a document is parsed
+once no matter which command needs it next.
+
+The cache is one SQLite file (``text_cache`` in the config, default
+``~/.domdb/text-cache.sqlite``; ``DOMDB_TEXT_CACHE`` overrides it and an empty
+value disables caching). Entries are zlib-compressed JSON lists. When the
+stored text exceeds ``text_cache_mb`` the least recently used entries are
+evicted. The stored size is kept as a running total next to the texts, so an
+insert only scans the table when it actually has to evict, and a hit only
+writes its new use time when the old one is over ``TOUCH_INTERVAL`` old.
+
+The same file holds the PDF registry: one row per PDF document (id and
+SHA-256) recording how its last extraction went (``text``, ``scanned`` or
+``failed``), its page count and byte size. Registry rows are never evicted,
+so a PDF known to be scanned is skipped on later runs without being parsed,
+whichever backend is selected. ``domdb storage pdfs`` summarises it. PDFs
+stored inline as base64 are also mapped from a hash of that string to their
+SHA-256 and size, so finding them in the registry never decodes them again.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+
+from loguru import logger
+
+from .config import load_config
+
+# Part of every key: bump when extraction changes so old texts are not reused.
+EXTRACTOR_VERSION = 1
+
+# Eviction trims the cache to this fraction of its limit, so it does not run
+# again on the very next insert.
+EVICT_TO = 0.9
+
+# Seconds before a hit refreshes an entry's use time; finer LRU order is not
+# worth one write transaction per cached document.
+TOUCH_INTERVAL = 3600
+
+# Layout of the texts table (PRAGMA user_version). Version 2 stores ``size``
+# before the ``data`` BLOB, so reading sizes does not walk overflow pages.
+SCHEMA_VERSION = 2
+
+# PDF registry statuses.
+TEXT = "text"
+SCANNED = "scanned"
+FAILED = "failed"
+
+
+@dataclass
+class PdfOutcome:
+    """How a PDF document's last extraction went."""
+
+    status: str
+    pages: int
+    size: int
+    backend: str
+
+
+class TextCache:
+    """Size-bounded LRU of extracted document texts in a SQLite file."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Several loader or extraction processes may share the file.
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._init_schema()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _init_schema(self) -> None:
+        # Plain execute() calls: executescript() would commit the transaction.
+        texts = """
+            CREATE TABLE {name} (
+                key TEXT PRIMARY KEY,
+                doc_id TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used REAL NOT NULL,
+                data BLOB NOT NULL
+            )
+            """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            if self._has_table("texts"):
+                # Older layout: copy the texts over with ``size`` before ``data``.
+                self._conn.execute(texts.format(name="texts_new"))
+                self._conn.execute(
+                    "INSERT INTO texts_new (key, doc_id, size, used, data) "
+                    "SELECT key, doc_id, size, used, data FROM texts"
+                )
+                self._conn.execute("DROP TABLE texts")
+                self._conn.execute("ALTER TABLE texts_new RENAME TO texts")
+            else:
+                self._conn.execute(texts.format(name="texts"))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_texts_used ON texts(used)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdfs (
+                doc_id TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                status TEXT NOT NULL,
+                pages INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                backend TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (doc_id, digest)
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS inline_pdfs (
+                encoded TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """)
+        if version < SCHEMA_VERSION:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) "
+                "SELECT 'bytes', COALESCE(SUM(size), 0) FROM texts"
+            )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _has_table(self, name: str) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (name,),
+            ).fetchone()
+            is not None
+        )
+
+    @staticmethod
+    def key(doc_id: str | None, kind: str, content_hash: str) -> str:
+        return f"{EXTRACTOR_VERSION}:{kind}:{doc_id or ''}:{content_hash}"
+
+    def get(self, key: str) -> list[str] | None:
+        row = self._conn.execute(
+            "SELECT used, data FROM texts WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        used, data = row
+        now = time.time()
+        if now - used > TOUCH_INTERVAL:
+            self._conn.execute("UPDATE texts SET used = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(data))
+
+    def put(self, key: str, doc_id: str | None, texts: list[str]) -> None:
+        data = zlib.compress(json.dumps(texts, ensure_ascii=False).encode("utf-8"))
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = self._conn.execute(
+                "SELECT size FROM texts WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts (key, doc_id, size, used, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, doc_id or "", len(data), time.time(), data),
+            )
+            total = self._add_bytes(len(data) - (old[0] if old else 0))
+            if total > self.max_bytes:
+                self._evict(total)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def record_pdf(self, doc_id: str | None, digest: str, outcome: PdfOutcome) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pdfs "
+            "(doc_id, digest, status, pages, size, backend, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                doc_id or "",
+                digest,
+                outcome.status,
+                outcome.pages,
+                outcome.size,
+                outcome.backend,
+                time.time(),
+            ),
+        )
+
+    def pdf_outcome(self, doc_id: str | None, digest: str) -> PdfOutcome | None:
+        row = self._conn.execute(
+            "SELECT status, pages, size, backend FROM pdfs "
+            "WHERE doc_id = ? AND digest = ?",
+            (doc_id or "", digest),
+        ).fetchone()
+        return PdfOutcome(*row) if row else None
+
+    def inline_pdf(self, encoded: str) -> tuple[str, int] | None:
+        """``(digest, size)`` of an inline PDF by the SHA-256 of its base64."""
+        row = self._conn.execute(
+            "SELECT digest, size FROM inline_pdfs WHERE encoded = ?", (encoded,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def record_inline_pdf(self, encoded: str, digest: str, size: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO inline_pdfs (encoded, digest, size) "
+            "VALUES (?, ?, ?)",
+            (encoded, digest, size),
+        )
+
+    def pdf_summary(self) -> dict[str, tuple[int, int, int]]:
+        """``status -> (documents, pages, bytes)`` over the PDF registry."""
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*), SUM(pages), SUM(size) FROM pdfs GROUP BY status"
+        )
+        return {status: (docs, pages, size) for status, docs, pages, size in rows}
+
+    def total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'bytes'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _add_bytes(self, delta: int) -> int:
+        """Adjust the running total inside the caller's transaction."""
+        self._conn.execute(
+            "UPDATE meta SET value = value + ? WHERE key = 'bytes'", (delta,)
+        )
+        return self.total_bytes()
+
+    def _evict(self, total: int) -> None:
+        target = int(self.max_bytes * EVICT_TO)
+        doomed = []
+        freed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM texts ORDER BY used"
+        ):
+            if total - freed <= target:
+                break
+            doomed.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM texts WHERE key = ?", doomed)
+        self._add_bytes(-freed)
+        logger.debug(f"Evicted {len(doomed)} texts from {self.path}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_cache: TextCache | None = None
+_cache_pid: int | None = None
+
+
+def text_cache_path() -> str:
+    """Configured cache file, or "" if caching is disabled."""
+    path = os.environ.get("DOMDB_TEXT_CACHE")
+    if path is None:
+        path = load_config()["text_cache"]
+    return os.path.expanduser(path) if path else ""
+
+
+def get_text_cache() -> TextCache | None:
+    """This process's cache, opened on first use; None if disabled or broken."""
+    global _cache, _cache_pid
+    path = text_cache_path()
+    if not path:
+        return None
+    if _cache is not None and _cache_pid == os.getpid() and _cache.path == path:
+        return _cache
+    max_bytes = int(load_config()["text_cache_mb"] * 1024 * 1024)
+    try:
+        _cache = TextCache(path, max_bytes)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning(f"Text cache {path} unavailable: {exc}")
+        return None
+    _cache_pid = os.getpid()
+    return _cache
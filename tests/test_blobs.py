@@ -0,0 +1,82 @@
+import base64
+import gzip
+import json
+import os
+import stat
+
+from domdb.core.blobs import blob_path, ingest_cache, open_blob, put_blob
+from domdb.core.converters.case_load import load_cases
+from domdb.core.converters.text_utils import extract_case_page_texts
+from domdb.core.download.storage import save_cases
+from domdb.core.query import build_index
+from domdb.core.query.hydrate import CaseHydrator
+from domdb.core.query.index import fetch_indexed_cases
+
+
+def _pdf_case(case_id, pdf: bytes):
+    return {
+        "id": case_id,
+        "headline": f"Sag {case_id}",
+        "documents": [
+            {"id": f"{case_id}-doc", "contentPdf": base64.b64encode(pdf).decode()}
+        ],
+    }
+
+
+def test_put_blob_is_content_addressed(tmp_path):
+    key = put_blob(str(tmp_path), b"pdf bytes")
+
+    assert put_blob(str(tmp_path), b"pdf bytes") == key
+    assert open(blob_path(str(tmp_path), key), "rb").read() == b"pdf bytes"
+    with open_blob(str(tmp_path), key) as mapped:
+        assert mapped[:3] == b"pdf"
+
+
+def test_ingest_cache_moves_pdfs_and_dedupes(tmp_path, make_pdf):
+    pdf = make_pdf(["Dom afsagt"])
+    save_cases(1, [_pdf_case("a", pdf), _pdf_case("b", pdf)], str(tmp_path))
+    save_cases(2, [{"id": "c"}], str(tmp_path), compress=True)
+
+    assert ingest_cache(str(tmp_path)) == (1, 2)
+    assert ingest_cache(str(tmp_path)) == (0, 0)
+
+    docs = [
+        case["documents"][0]
+        for case in json.loads((tmp_path / "cases_1.json").read_text())
+    ]
+    assert all(doc["contentPdf"] is None for doc in docs)
+    assert docs[0]["contentPdfBlob"] == docs[1]["contentPdfBlob"]
+    assert len(list((tmp_path / "blobs").rglob("*"))) == 2  # one prefix dir, one blob
+    assert json.loads(gzip.decompress((tmp_path / "cases_2.json.gz").read_bytes()))
+
+
+def test_extract_text_reads_blob_via_loaders(tmp_path, make_pdf):
+    save_cases(1, [_pdf_case("a", make_pdf(["Dom afsagt", "Side to"]))], str(tmp_path))
+    ingest_cache(str(tmp_path))
+
+    (case,) = load_cases(str(tmp_path))
+    assert case.documents[0].contentPdfBlob
+    assert extract_case_page_texts(case) == ["Dom afsagt", "Side to"]
+
+    build_index(str(tmp_path))
+    (row,) = fetch_indexed_cases(str(tmp_path))
+    loaded = CaseHydrator().get(row)
+    assert extract_case_page_texts(loaded) == ["Dom afsagt", "Side to"]
+
+
+def test_index_counts_blob_pdfs(tmp_path, make_pdf):
+    save_cases(1, [_pdf_case("a", make_pdf(["x"])), {"id": "b"}], str(tmp_path))
+    ingest_cache(str(tmp_path))
+    build_index(str(tmp_path))
+
+    flags = {row.id: row.has_pdf for row in fetch_indexed_cases(str(tmp_path))}
+    assert flags == {"a": True, "b": False}
+
+
+def test_blobs_follow_the_umask(tmp_path):
+    key = put_blob(str(tmp_path), b"%PDF-1.4")
+    plain = tmp_path / "plain"
+    plain.write_bytes(b"")
+
+    mode = os.stat(blob_path(str(tmp_path), key)).st_mode
+    assert stat.S_IMODE(mode) == stat.S_IMODE(plain.stat().st_mode)
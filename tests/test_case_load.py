@@ -0,0 +1,26 @@
+import pytest
+
+from domdb.core.converters.case_load import load_cases
+from domdb.core.download.storage import save_cases
+
+
+@pytest.fixture
+def cache(tmp_path):
+    for page in range(1, 6):
+        cases = [{"id": f"{page}-{i}", "headline": f"Sag {i}"} for i in range(3)]
+        cases.insert(1, {"headline": "no id"})
+        cases.append({"id": f"{page}-bad", "documents": "not a list"})
+        save_cases(page, cases, str(tmp_path), compress=page % 2 == 0)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("number", [None, 7])
+def test_parallel_load_matches_serial(cache, compact, number):
+    serial = load_cases(cache, number, compact=compact)
+    parallel = load_cases(cache, number, compact=compact, workers=3)
+
+    assert [c.id for c in parallel] == [c.id for c in serial]
+    # 5 pages x 3 valid cases; compact views skip validation, so keep "bad" too.
+    assert len(serial) == number or len(serial) == (20 if compact else 15)
+    assert all(c._cache_dir == cache for c in parallel)
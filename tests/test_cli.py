@@ -4,7 +4,10 @@ from domdb.cli.bib import bib
 from domdb.cli.hay import hay
 from domdb.cli.j2e import j2e
 from domdb.cli.download import download
+from domdb.cli.bench import bench_pdf
 from domdb.cli.main import main
+from domdb.core.converters import pdf_backends
+from domdb.core.download.storage import save_cases
 from domdb.core.exceptions import ConversionError, EvidConversionError, DownloadError
 
 
@@ -14,7 +17,7 @@ def test_bib_success(mocker, capsys):
     bib(-1, "dir", "out.bib")
     captured = capsys.readouterr()
     assert "Converted 5 unique cases to out.bib" in captured.out
-    mock_convert.assert_called_once_with("dir", "out.bib", None)
+    mock_convert.assert_called_once_with("dir", "out.bib", None, 1)
 
 
 def test_bib_error(mocker, capsys):
@@ -27,7 +30,7 @@ def test_bib_error(mocker, capsys):
     assert excinfo.value.code == 1
     captured = capsys.readouterr()
     assert "error" in captured.err
-    mock_convert.assert_called_once_with("dir", "out.bib", 10)
+    mock_convert.assert_called_once_with("dir", "out.bib", 10, 1)
 
 
 def test_hay_success(mocker, capsys):
@@ -36,7 +39,7 @@ def test_hay_success(mocker, capsys):
     hay(-1, "dir", "out.yml")
     captured = capsys.readouterr()
     assert "Converted 5 unique cases to out.yml" in captured.out
-    mock_convert.assert_called_once_with("dir", "out.yml", None)
+    mock_convert.assert_called_once_with("dir", "out.yml", None, 1)
 
 
 def test_hay_error(mocker, capsys):
@@ -49,7 +52,7 @@ def test_hay_error(mocker, capsys):
     assert excinfo.value.code == 1
     captured = capsys.readouterr()
     assert "error" in captured.err
-    mock_convert.assert_called_once_with("dir", "out.yml", 10)
+    mock_convert.assert_called_once_with("dir", "out.yml", 10, 1)
 
 
 def test_j2e_success(mocker, capsys):
@@ -58,7 +61,7 @@ def test_j2e_success(mocker, capsys):
     j2e(-1, "dir", "out")
     captured = capsys.readouterr()
     assert "Converted 3 cases to EVID in out" in captured.out
-    mock_convert.assert_called_once_with("dir", "out", None)
+    mock_convert.assert_called_once_with("dir", "out", None, 1)
 
 
 def test_j2e_error(mocker, capsys):
@@ -71,7 +74,19 @@ def test_j2e_error(mocker, capsys):
     assert excinfo.value.code == 1
     captured = capsys.readouterr()
     assert "error" in captured.err
-    mock_convert.assert_called_once_with("dir", "out", 5)
+    mock_convert.assert_called_once_with("dir", "out", 5, 1)
+
+
+def test_j2e_unknown_pdf_backend(tmp_path, monkeypatch, capsys):
+    """An unknown PDF backend stops j2e with a clean error."""
+    monkeypatch.setenv("DOMDB_PDF_BACKEND", "nope")
+    monkeypatch.setattr(pdf_backends, "_backend", None)
+    monkeypatch.setattr(pdf_backends, "_backend_name", None)
+    save_cases(1, [{"id": "a", "documents": []}], str(tmp_path))
+    with pytest.raises(SystemExit) as excinfo:
+        j2e(-1, str(tmp_path), str(tmp_path / "out"))
+    assert excinfo.value.code == 1
+    assert "Unknown PDF backend 'nope'" in capsys.readouterr().err
 
 
 def test_download_success(mocker, capsys):
@@ -83,6 +98,17 @@ def test_download_success(mocker, capsys):
     mock_load.assert_called_once_with("dir")
 
 
+def test_download_multiple_pages(mocker, capsys):
+    """Test concurrent multi-page download."""
+    summary = mocker.Mock()
+    summary.describe.return_value = "Fetched 50 cases from 2 pages"
+    mock_pages = mocker.patch("domdb.cli.download.load_pages", return_value=summary)
+    download("dir", pages=5, workers=3)
+    captured = capsys.readouterr()
+    assert "Fetched 50 cases from 2 pages" in captured.out
+    mock_pages.assert_called_once_with("dir", 5, 3)
+
+
 def test_download_error(mocker, capsys):
     """Test download error."""
     mock_load = mocker.patch(
@@ -114,3 +140,13 @@ def test_main(mocker):
     mock_app = mocker.patch("domdb.cli.main.app")
     main()
     mock_app.run.assert_called_once()
+
+
+def test_bench_pdf_unknown_backend(mocker, capsys):
+    """An unknown backend is reported before any PDFs are sampled."""
+    mock_sample = mocker.patch("domdb.cli.bench.sample_pdfs")
+    bench_pdf("dir", 5, ["pdfplumber", "nosuch"])
+    captured = capsys.readouterr()
+    assert "Unknown PDF backend(s): nosuch" in captured.out
+    assert "pdfplumber" in captured.out
+    mock_sample.assert_not_called()
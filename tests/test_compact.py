@@ -0,0 +1,61 @@
+import pytest
+
+from domdb.core.compact import compact_case
+from domdb.core.converters.fields import parse_case_fields
+from domdb.core.converters.json2bib.entry import create_bib_entry
+from domdb.core.converters.json2hay.entry import create_hay_entry
+from domdb.core.converters.json2md.entry import create_md_entry
+from domdb.core.model import ModelItem
+from domdb.core.query.search import metadata_search_text
+
+RAW = {
+    "id": "c1",
+    "headline": "Sag om vold",
+    "courtCaseNumber": "BS-12/2023",
+    "officeName": "Østre Landsret",
+    "profession": {"enumValue": 1, "displayText": "Straffesag"},
+    "instance": {"enumValue": 2, "displayText": "2. instans"},
+    "caseType": None,
+    "caseSubjects": [{"enumValue": 3, "displayText": "Vold"}],
+    "horizontalCotreatmentCases": None,
+    "participants": [{"type": {"enumValue": 1, "displayText": "Part"}}],
+    "documents": [
+        {
+            "id": "d1",
+            "verdictDateTime": "2023-04-05T00:00:00",
+            "contentHtml": "<p>Tiltalte dømmes efter straffeloven § 244</p>",
+            "references": [{"content": "§ 244"}],
+        }
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "render",
+    [parse_case_fields, create_bib_entry, create_hay_entry, create_md_entry],
+)
+def test_compact_case_renders_like_model(render):
+    assert render(compact_case(RAW)) == render(ModelItem.model_validate(RAW))
+
+
+def test_compact_case_mirrors_model_defaults():
+    case = compact_case({"id": "x", "horizontalCotreatmentCases": None}, "/cache")
+    model = ModelItem.model_validate({"id": "x", "horizontalCotreatmentCases": None})
+
+    assert case.horizontalCotreatmentCases == model.horizontalCotreatmentCases == []
+    assert case.documents == [] and case.profession is None
+    assert case._cache_dir == "/cache"
+    assert metadata_search_text(compact_case(RAW)) == metadata_search_text(
+        ModelItem.model_validate(RAW)
+    )
+
+
+def test_compact_case_shares_enums_and_defers_lists():
+    first, second = compact_case(RAW), compact_case(dict(RAW, id="c2"))
+
+    assert first.profession is second.profession
+    assert first.caseSubjects[0].displayText == "Vold"
+    assert first.documents is first.documents  # built once, then cached
+    assert first.documents[0].references[0].content == "§ 244"
+    with pytest.raises(AttributeError):
+        first.unknown_field = 1
@@ -1,11 +1,30 @@
+import base64
 import pytest
 import json
+import os
+import stat
+import time
 import requests
-from domdb.core.download.main import load_next_batch
-from domdb.core.download.auth import get_access_token, API_BASE_URL
+import domdb.core.download.auth as auth
+from domdb.core.download.main import load_next_batch, load_pages
+from domdb.core.download.auth import TokenManager, get_access_token, API_BASE_URL
+from domdb.core.download.client import DEFAULT_TIMEOUT, DownloadClient
 from domdb.core.download.fetch import get_sager
-from domdb.core.download.storage import save_cases, get_last_saved_page
-from domdb.core.exceptions import DownloadError
+from domdb.core.download.retry import RetryPolicy, TokenBucket, parse_retry_after
+from domdb.core.download.storage import (
+    commit_page,
+    get_last_saved_page,
+    save_cases,
+    stage_page,
+)
+from domdb.core.exceptions import AuthenticationError, DownloadError
+
+
+@pytest.fixture(autouse=True)
+def token_cache(tmp_path, monkeypatch):
+    path = tmp_path / "token.json"
+    monkeypatch.setattr(auth, "TOKEN_CACHE_PATH", str(path))
+    return path
 
 
 @pytest.fixture
@@ -20,7 +39,7 @@ def mock_env(mocker):
 
 
 def test_get_access_token_success(mock_env, mocker):
-    mock_post = mocker.patch("requests.post")
+    mock_post = mocker.patch("requests.Session.post")
     mock_response = mock_post.return_value
     mock_response.json.return_value = {"tokenString": "test_token"}
     mock_response.raise_for_status.return_value = None
@@ -31,8 +50,48 @@ def test_get_access_token_success(mock_env, mocker):
         f"{API_BASE_URL}/autoriser",
         json={"Email": "test_user", "Password": "test_pass"},
         headers={"Content-Type": "application/json"},
-        timeout=10,
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+def test_get_access_token_reuses_cached_token(mock_env, mocker, token_cache):
+    mock_post = mocker.patch("requests.Session.post")
+    mock_post.return_value.json.return_value = {"tokenString": "fresh"}
+
+    assert get_access_token() == "fresh"
+    assert get_access_token() == "fresh"
+    mock_post.assert_called_once()
+    assert json.loads(token_cache.read_text())["user"] == "test_user"
+
+
+def test_get_access_token_refreshes_near_expiry(mock_env, mocker, token_cache):
+    token_cache.write_text(
+        json.dumps({"user": "test_user", "token": "old", "expires_at": time.time() + 5})
+    )
+    mock_post = mocker.patch("requests.Session.post")
+    mock_post.return_value.json.return_value = {"tokenString": "new"}
+
+    assert get_access_token() == "new"
+    mock_post.assert_called_once()
+
+
+def test_token_expiry_from_jwt_claim():
+    payload = b'{"exp": 2000000000}'
+    token = "h." + base64.urlsafe_b64encode(payload).decode().rstrip("=") + ".s"
+    assert auth._token_expiry(token) == 2000000000
+
+
+def test_token_manager_refreshes_once_per_stale_token(mocker):
+    issued = iter(["t1", "t2", "t3"])
+    mock_get = mocker.patch(
+        "domdb.core.download.auth.get_access_token",
+        side_effect=lambda client, force_refresh=False: next(issued),
     )
+    tokens = TokenManager()
+    assert tokens.get() == "t1"
+    assert tokens.refresh("t1") == "t2"
+    assert tokens.refresh("t1") == "t2"
+    assert mock_get.call_count == 2
 
 
 def test_get_access_token_missing_credentials(mocker):
@@ -44,7 +103,8 @@ def test_get_access_token_missing_credentials(mocker):
 
 
 def test_get_sager_success(mocker):
-    mock_get = mocker.patch("requests.get")
+    mock_get = mocker.patch("requests.Session.get")
+    mock_close = mocker.patch("requests.Session.close")
     mock_response = mock_get.return_value
     mock_response.json.return_value = [{"id": "test"}]
     mock_response.raise_for_status.return_value = None
@@ -56,17 +116,49 @@ def test_get_sager_success(mocker):
         f"{API_BASE_URL}/sager",
         headers={"Authorization": "Bearer test_token"},
         params={"sideNr": 1, "perSide": 100},
-        timeout=10,
+        timeout=DEFAULT_TIMEOUT,
     )
+    mock_close.assert_called_once()  # the fallback client's session
 
 
 def test_get_sager_failure(mocker):
-    mock_get = mocker.patch("requests.get")
+    mock_get = mocker.patch("requests.Session.get")
     mock_get.side_effect = requests.exceptions.RequestException("API error")
     with pytest.raises(DownloadError, match="Failed to fetch cases: API error"):
         get_sager("test_token")
 
 
+def test_client_shares_one_session(mocker):
+    session = mocker.Mock()
+    client = DownloadClient("http://localhost:1/api/", session=session, pool_size=4)
+    client.get("sager", params={"sideNr": 2})
+    client.post("autoriser", json={}, timeout=3)
+
+    session.get.assert_called_once_with(
+        "http://localhost:1/api/sager", params={"sideNr": 2}, timeout=DEFAULT_TIMEOUT
+    )
+    session.post.assert_called_once_with(
+        "http://localhost:1/api/autoriser", json={}, timeout=3
+    )
+    assert session.mount.call_count == 2
+
+
+def test_client_from_config_overrides():
+    client = DownloadClient.from_config(
+        {"connect_timeout": 2, "read_timeout": 7}, pool_size=16
+    )
+    assert client.timeout == (2, 7)
+    adapter = client.session.get_adapter("https://domsdatabasen.dk")
+    assert adapter._pool_maxsize == 16
+
+
+def test_get_sager_unauthorized(mocker):
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.status_code = 401
+    with pytest.raises(AuthenticationError):
+        get_sager("stale_token")
+
+
 def test_save_cases(tmp_path):
     cases = [{"id": "test"}]
     save_cases(1, cases, directory=str(tmp_path))
@@ -88,17 +180,201 @@ def test_get_last_saved_page_existing(tmp_path):
 
 
 def test_load_next_batch_success(mock_env, mocker, tmp_path):
-    mock_post = mocker.patch("requests.post")
-    mock_get = mocker.patch("requests.get")
+    mock_post = mocker.patch("requests.Session.post")
+    mock_get = mocker.patch("requests.Session.get")
     mock_post_response = mock_post.return_value
     mock_post_response.json.return_value = {"tokenString": "test_token"}
     mock_post_response.raise_for_status.return_value = None
     mock_get_response = mock_get.return_value
-    mock_get_response.json.return_value = [{"id": "test"}]
+    mock_get_response.status_code = 200
+    mock_get_response.iter_content.return_value = [b'[{"id": ', b'"test"}]']
     mock_get_response.raise_for_status.return_value = None
     mocker.patch("domdb.core.config.load_config", return_value={"batch_size": 100})
 
-    count = load_next_batch(directory=str(tmp_path))
+    cases_dir = tmp_path / "cases"
+    count = load_next_batch(directory=str(cases_dir))
     assert count == 1
-    output_file = tmp_path / "cases_1.json"
+    output_file = cases_dir / "cases_1.json"
     assert output_file.exists()
+    assert json.loads(output_file.read_text()) == [{"id": "test"}]
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+def test_load_next_batch_empty_page_leaves_no_files(mock_env, mocker, tmp_path):
+    mock_post = mocker.patch("requests.Session.post")
+    mock_post.return_value.json.return_value = {"tokenString": "test_token"}
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.iter_content.return_value = [b"[]"]
+
+    cases_dir = tmp_path / "cases"
+    assert load_next_batch(directory=str(cases_dir)) == 0
+    assert list(cases_dir.iterdir()) == []
+
+
+def _fake_fetch(pages):
+    def fetch(token, page_number, per_page, directory, client, compress=False):
+        body = json.dumps(pages.get(page_number, [])).encode()
+        return stage_page(page_number, [body[:3], body[3:]], directory)
+
+    return fetch
+
+
+def test_stage_page_streams_without_touching_cache_names(tmp_path):
+    body = json.dumps(
+        [{"id": "1", "headline": "A", "documents": [{"contentPdf": "QUJD"}]}]
+    ).encode()
+    staged = stage_page(
+        7, (body[i : i + 5] for i in range(0, len(body), 5)), str(tmp_path)
+    )
+
+    assert staged.cases == 1
+    assert os.path.basename(staged.path).startswith(".cases_7.")
+    assert get_last_saved_page(str(tmp_path)) == 1
+
+    commit_page(staged, str(tmp_path))
+    assert (tmp_path / "cases_7.json").read_bytes() == body
+    assert not os.path.exists(staged.path)
+
+
+def test_committed_page_follows_the_umask(tmp_path):
+    staged = stage_page(2, [b'[{"id": "1"}]'], str(tmp_path))
+    committed = commit_page(staged, str(tmp_path))
+    plain = tmp_path / "plain.json"
+    plain.write_bytes(b"[]")
+
+    assert stat.S_IMODE(os.stat(committed).st_mode) == stat.S_IMODE(
+        plain.stat().st_mode
+    )
+
+
+def test_stage_page_rejects_truncated_body(tmp_path):
+    with pytest.raises(DownloadError, match="page 3"):
+        stage_page(3, [b'[{"id": "1"'], str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_load_pages_stops_at_first_empty_page(mocker, tmp_path):
+    (tmp_path / "cases_1.json").write_text("[]")
+    pages = {2: [{"id": "a"}, {"id": "b"}], 3: [{"id": "c"}], 4: [], 5: [{"id": "x"}]}
+    mocker.patch("domdb.core.download.auth.get_access_token", return_value="tok")
+    mock_fetch = mocker.patch(
+        "domdb.core.download.main.fetch_page_to_disk", side_effect=_fake_fetch(pages)
+    )
+
+    summary = load_pages(str(tmp_path), pages=10, workers=2)
+
+    assert summary.pages == 2
+    assert summary.cases == 3
+    assert (tmp_path / "cases_2.json").exists()
+    assert (tmp_path / "cases_3.json").exists()
+    assert not (tmp_path / "cases_4.json").exists()
+    assert not (tmp_path / "cases_5.json").exists()
+    fetched = {call.args[1] for call in mock_fetch.call_args_list}
+    assert fetched <= set(range(2, 12))
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "cases_1.json",
+        "cases_2.json",
+        "cases_3.json",
+        "sync",
+    ]
+    assert "cases/s" in summary.describe()
+
+
+def test_load_pages_propagates_fetch_errors(mocker, tmp_path):
+    mocker.patch("domdb.core.download.auth.get_access_token", return_value="tok")
+    mocker.patch(
+        "domdb.core.download.main.fetch_page_to_disk",
+        side_effect=DownloadError("Failed to fetch cases: boom"),
+    )
+    with pytest.raises(DownloadError, match="boom"):
+        load_pages(str(tmp_path), pages=3, workers=2)
+
+
+def test_load_pages_refreshes_token_after_401(mocker, tmp_path):
+    issued = iter(["stale", "fresh"])
+    mocker.patch(
+        "domdb.core.download.auth.get_access_token",
+        side_effect=lambda client, force_refresh=False: next(issued),
+    )
+
+    fetch = _fake_fetch({1: [{"id": "a"}]})
+
+    def fake_fetch(token, *args):
+        if token == "stale":
+            raise AuthenticationError("401")
+        return fetch(token, *args)
+
+    mocker.patch("domdb.core.download.main.fetch_page_to_disk", side_effect=fake_fetch)
+
+    summary = load_pages(str(tmp_path), pages=3, workers=1)
+    assert summary.cases == 1
+    assert (tmp_path / "cases_1.json").exists()
+
+
+def _response(mocker, status, headers=None):
+    response = mocker.Mock(status_code=status, headers=headers or {})
+    return response
+
+
+def test_client_retries_with_retry_after(mocker):
+    sleep = mocker.patch("domdb.core.download.client.time.sleep")
+    session = mocker.Mock()
+    session.get.side_effect = [
+        _response(mocker, 429, {"Retry-After": "7"}),
+        _response(mocker, 503),
+        _response(mocker, 200),
+    ]
+    client = DownloadClient(session=session, retry=RetryPolicy(base_delay=2, jitter=0))
+
+    assert client.get("sager").status_code == 200
+    assert [c.args[0] for c in sleep.call_args_list] == [7.0, 4.0]
+    assert client.stats.retries == 2
+    assert client.stats.rate_limited == 1
+    assert client.stats.requests == 3
+
+
+def test_client_gives_up_after_max_attempts(mocker):
+    mocker.patch("domdb.core.download.client.time.sleep")
+    session = mocker.Mock()
+    session.get.side_effect = requests.exceptions.ConnectTimeout("slow")
+    client = DownloadClient(session=session, retry=RetryPolicy(max_attempts=3))
+
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        client.get("sager")
+    assert session.get.call_count == 3
+    assert client.stats.retries == 2
+
+
+def test_get_sager_wraps_exhausted_retries(mocker):
+    mocker.patch("domdb.core.download.client.time.sleep")
+    session = mocker.Mock()
+    session.get.return_value = _response(mocker, 502)
+    session.get.return_value.raise_for_status.side_effect = (
+        requests.exceptions.HTTPError("502 Bad Gateway")
+    )
+    client = DownloadClient(session=session, retry=RetryPolicy(max_attempts=2))
+
+    with pytest.raises(DownloadError, match="502"):
+        get_sager("token", client=client)
+    assert session.get.call_count == 2
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("soon") is None
+
+
+def test_token_bucket_spaces_requests(mocker):
+    clock = [100.0]
+    mocker.patch(
+        "domdb.core.download.retry.time.monotonic", side_effect=lambda: clock[0]
+    )
+    sleep = mocker.patch("domdb.core.download.retry.time.sleep")
+    bucket = TokenBucket(rate=2, burst=2)
+
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    assert sleep.call_count == 2
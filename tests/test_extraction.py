@@ -0,0 +1,109 @@
+import base64
+import time
+
+import domdb.core.converters.extraction as extraction
+from domdb.core.converters.extraction import ExtractionService
+from domdb.core.converters.text_utils import extract_case_page_texts
+from domdb.core.model import ModelItem
+
+
+def _case(case_id, *documents):
+    return ModelItem.model_validate({"id": case_id, "documents": list(documents)})
+
+
+def _pdf_doc(doc_id, pdf: bytes):
+    return {"id": doc_id, "contentPdf": base64.b64encode(pdf).decode()}
+
+
+def test_service_matches_inline_extraction(make_pdf, monkeypatch):
+    monkeypatch.setenv("DOMDB_TEXT_CACHE", "")
+    cases = [
+        _case("a", _pdf_doc("a1", make_pdf(["Dom afsagt", "Side to"]))),
+        _case("b", {"contentHtml": "<p>krisecenter</p>"}),
+        _case("c", _pdf_doc("c1", make_pdf(["Tredje"])), {"contentHtml": "<p>x</p>"}),
+    ]
+
+    with ExtractionService(workers=2) as service:
+        texts = list(service.extract(cases))
+
+    assert texts == [extract_case_page_texts(case) for case in cases]
+    assert texts[0] == ["Dom afsagt", "Side to"]
+
+
+def test_long_pdf_is_split_across_workers(make_pdf, monkeypatch):
+    monkeypatch.setenv("DOMDB_TEXT_CACHE", "")
+    pages = [f"Side {number}" for number in range(1, 8)]
+    cases = [
+        _case("a", _pdf_doc("long", make_pdf(pages))),
+        _case("b", _pdf_doc("short", make_pdf(["Kort"]))),
+    ]
+
+    with ExtractionService(workers=2, split_pages=2) as service:
+        texts = list(service.extract(cases))
+
+    assert texts == [pages, ["Kort"]]
+    assert service.split == 1
+
+
+def test_attach_keeps_order_and_passes_through(make_pdf):
+    case = _case("a", _pdf_doc("a1", make_pdf(["tekst"])))
+    items = [("first", None), ("second", case), ("third", None)]
+
+    with ExtractionService(workers=1) as service:
+        resolved = [
+            (payload, job and list(job)) for payload, job in service.attach(items)
+        ]
+
+    assert resolved == [("first", None), ("second", ["tekst"]), ("third", None)]
+
+
+def test_slow_document_is_killed_and_the_batch_continues(make_pdf, monkeypatch):
+    real_pages = extraction.pdf_page_texts
+
+    def page_texts(cache_dir, doc, pages=None):
+        if doc.id == "slow":
+            time.sleep(60)
+        return real_pages(cache_dir, doc, pages)
+
+    monkeypatch.setattr(extraction, "pdf_page_texts", page_texts)
+    cases = [
+        _case("a", _pdf_doc("slow", make_pdf(["aldrig"]))),
+        _case("b", _pdf_doc("fast", make_pdf(["hurtig"]))),
+    ]
+
+    started = time.monotonic()
+    with ExtractionService(workers=1, timeout=0.5) as service:
+        texts = list(service.extract(cases))
+
+    assert texts == [[], ["hurtig"]]
+    assert service.killed == 1
+    assert time.monotonic() - started < 10
+
+
+def test_workers_holding_memory_are_replaced(make_pdf, monkeypatch):
+    monkeypatch.setattr(extraction, "_rss_bytes", lambda pid: 60 * 1024 * 1024)
+    cases = [
+        _case("a", _pdf_doc("a1", make_pdf(["en"]))),
+        _case("b", _pdf_doc("b1", make_pdf(["to"]))),
+    ]
+
+    with ExtractionService(workers=1, max_rss_mb=100) as service:
+        texts = list(service.extract(cases))
+
+    assert texts == [["en"], ["to"]]
+    assert (service.recycled, service.killed) == (2, 0)
+
+
+def test_memory_hungry_document_is_killed(make_pdf, monkeypatch):
+    def page_texts(cache_dir, doc, pages=None):
+        hog = bytearray(300 * 1024 * 1024)
+        time.sleep(60)
+        return [str(len(hog))]
+
+    monkeypatch.setattr(extraction, "pdf_page_texts", page_texts)
+
+    with ExtractionService(workers=1, timeout=30, max_rss_mb=150) as service:
+        (texts,) = service.extract([_case("a", _pdf_doc("hog", make_pdf(["x"])))])
+
+    assert texts == []
+    assert service.killed == 1
@@ -1,4 +1,12 @@
-from domdb.core.converters.json2md.filter import case_matches_keywords
+import base64
+import time
+
+import domdb.core.converters.extraction as extraction
+from domdb.core.converters.extraction import ExtractionService
+from domdb.core.converters.json2md.filter import (
+    case_matches_keywords,
+    iter_keyword_matches,
+)
 from domdb.core.query.search import metadata_search_text, normalize_keywords
 from domdb.core.model import ModelItem
 
@@ -45,3 +53,27 @@ def test_case_matches_keywords_uses_body_when_full_text():
     )
     assert not case_matches_keywords(case, ["krisecenter"])
     assert case_matches_keywords(case, ["krisecenter"], full_text=True)
+
+
+def test_service_stops_extracting_at_the_matching_page(make_pdf, monkeypatch):
+    def page_texts(cache_dir, doc, pages=None):
+        yield "side 1"
+        yield "krisecenter"
+        time.sleep(60)
+        yield "aldrig"
+
+    monkeypatch.setattr(extraction, "pdf_page_texts", page_texts)
+    pdf = base64.b64encode(make_pdf(["x"])).decode()
+    case = ModelItem.model_validate(
+        {"id": "1", "documents": [{"id": "d", "contentPdf": pdf}]}
+    )
+
+    started = time.monotonic()
+    with ExtractionService(workers=1, timeout=120, split_pages=0) as service:
+        matches = iter_keyword_matches(
+            [case], ["krisecenter"], full_text=True, service=service
+        )
+        assert [match.id for match in matches] == ["1"]
+
+    assert (service.cancelled, service.killed) == (1, 0)
+    assert time.monotonic() - started < 10
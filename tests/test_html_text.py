@@ -0,0 +1,145 @@
+import html.entities
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from domdb.core.converters.html_text import _fast_html_text, html_to_text
+
+pytestmark = pytest.mark.filterwarnings("ignore:It looks like you're using an HTML")
+
+
+def _soup_text(markup: str) -> str:
+    return BeautifulSoup(markup, "html.parser").get_text(separator="\n", strip=True)
+
+
+WORD_HTML = """<!DOCTYPE html>
+<html><head><meta http-equiv=Content-Type content="text/html; charset=utf-8">
+<title>U.2023.1234 H</title>
+<style><!-- p.MsoNormal {margin:0cm; font-family:"Times New Roman"} --></style>
+<script>if (a < b && c > d) { document.write("<b>" + x + "</b>"); }</script>
+</head><body lang=DA style='tab-interval:65.2pt'>
+<div class=WordSection1>
+<p class=MsoNormal><b><span style='font-size:12.0pt'>Dom</span></b><o:p></o:p></p>
+<p class=MsoNormal>afsagt den 3.&nbsp;maj 2023 &#8211; sag BS-1234/2022</p>
+<p>Straffeloven &sect; 237, jf. &#xA7; 21 &amp; &quot;krisecenter&quot;</p>
+<!-- side 2 -->
+<table border=1 cellpadding=0><tr><td width=307 valign=top><p>T&aelig;t</p></td>
+<td><br/>Vidne<br>forklarede</td></tr></table>
+<P ALIGN="center">STORE BOGSTAVER</P>
+</div></body></html>
+"""
+
+SNIPPETS = [
+    "",
+    "plain text",
+    "   <p>  spaced  </p>   ",
+    "<p>a</p><p></p><p>b</p>",
+    "<p>a<!-- c -->b</p>",
+    "<p>a<!---->b</p>",
+    "<p>a<!-- x -- y -->b</p>",
+    "<p>a<!-- <p>hidden</p> -->b</p>",
+    "<p>a<![CDATA[cdata text]]>b</p>",
+    "<?xml version='1.0'?><p>pi</p>",
+    "<p>1 < 2 and 3 > 2</p>",
+    "<p>a <b>bold</b>c</p>",
+    "<p>&amp;&lt;&gt;&quot;&apos;&nbsp;&copy;&AElig;</p>",
+    "<p>&amp no semicolon</p>",
+    "<p>&unknown; entity</p>",
+    "<p>&#65;&#x42;&#X43;&#0;&#128;&#150;&#129;&#xD800;&#1114112;</p>",
+    "<p>& alone</p>",
+    "<p>A&B</p>",
+    "<p title='a > b'>quoted &gt;</p>",
+    '<a href="/x?a=1&amp;b=2">link</a>',
+    "<a href=/x>unquoted path</a>",
+    "<a href=x/>self-closing-ish</a>",
+    "<p>unclosed",
+    "<p>broken <tag",
+    "</p>stray end<p>x</p>",
+    "<br></br>after",
+    "<script>var s = '</p>';</script>after",
+    "<script>a<!--b</script>after",
+    "<script>x</script >after",
+    "<SCRIPT type=text/javascript>y</SCRIPT>after",
+    "<script/>after",
+    "<style>p > b { color: red }</style>styled",
+    "<style>a</style >b",
+    "<template><p>in template</p></template>out",
+    "<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>",
+    "<title>a <b> title</title>body",
+    "<textarea><p>raw</p></textarea>",
+    "<noscript><p>enable js</p></noscript>",
+    "<p>tab\there\r\nnewline</p>",
+    "<p>\xa0non-breaking\xa0</p>",
+    "<o:p>word</o:p><v:shape id=x>shape</v:shape>",
+    "<p a=1 b='2' c=\"3\" d>attrs</p>",
+    '<p a="1"b="2">no space between attributes</p>',
+    "<!doctype html><p>doctype</p>",
+    "<!DOCTYPE html PUBLIC '-//W3C//DTD HTML 4.01//EN'><p>x</p>",
+    "<!ELEMENT x><p>declaration</p>",
+    WORD_HTML,
+]
+
+
+@pytest.mark.parametrize("markup", SNIPPETS)
+def test_matches_beautifulsoup(markup):
+    assert html_to_text(markup) == _soup_text(markup)
+
+
+def test_verdict_html_takes_fast_path():
+    assert _fast_html_text(WORD_HTML) == _soup_text(WORD_HTML)
+
+
+def test_named_and_numeric_references_match_beautifulsoup():
+    names = [name for name in html.entities.html5 if name.endswith(";")]
+    numbers = [*range(0, 0x300), 0xD7FF, 0xD800, 0xDFFF, 0xFDD0, 0xFFFE, 0x10FFFF]
+    numbers += [0x110000]
+    refs = [f"&{name}" for name in names] + [f"&#{n};" for n in numbers]
+    refs += [f"&#x{n:x};" for n in numbers]
+    for ref in refs:
+        markup = f"<p>[{ref}]</p>"
+        assert html_to_text(markup) == _soup_text(markup), ref
+
+
+def test_random_markup_matches_beautifulsoup():
+    pieces = [
+        "<p>",
+        "</p>",
+        "<b>",
+        "</b>",
+        "<br>",
+        "<br/>",
+        "</br>",
+        "<div class=x>",
+        "</div>",
+        "<span style='a:b'>",
+        "</span>",
+        "<!-- c -->",
+        "<script>s</script>",
+        "<style>t</style>",
+        "<rt>",
+        "</rt>",
+        "&amp;",
+        "&nbsp;",
+        "&#8211;",
+        "&",
+        "<",
+        ">",
+        " ",
+        "\n",
+        "tekst",
+        "æøå",
+        "§ 237",
+        "<o:p>",
+        "</o:p>",
+        "<P>",
+        "</br>",
+        "<!---->",
+        "<script>a</p>b</script>",
+        "<title>t</title>",
+        "&#150;",
+    ]
+    rng = random.Random(20231018)
+    for _ in range(500):
+        markup = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 30)))
+        assert html_to_text(markup) == _soup_text(markup), markup
@@ -2,7 +2,7 @@ import pytest
 import json
 import uuid
 import yaml
-from domdb.core.converters.json2evid.dir_creation import create_evid_dir
+from domdb.core.converters.json2evid.dir_creation import create_evid_dir, write_label
 from domdb.core.converters.json2evid.processing import convert_json_to_evid
 from domdb.core.model import ModelItem
 from domdb.core.exceptions import EvidConversionError
@@ -69,6 +69,25 @@ def test_create_evid_dir(tmp_path, sample_case):
         assert "Test Profession, Test Instance, Test Type" in content
 
 
+def test_write_label_streams_pages(tmp_path):
+    consumed = []
+
+    def pages():
+        for number in range(1, 4):
+            consumed.append(number)
+            yield f"Side {number}"
+
+    path = tmp_path / "label.typ"
+    assert write_label(str(path), "Titel", "2023-01-01", pages()) == 3
+    content = path.read_text(encoding="utf-8")
+    assert consumed == [1, 2, 3]
+    assert "#mset(values: (opage: 3))\n== Page 3\nSide 3" in content
+    assert content.endswith("= List of Labels\n#lablist()\n")
+
+    assert write_label(str(path), "Titel", "2023-01-01", iter([])) == 0
+    assert "No content available" in path.read_text(encoding="utf-8")
+
+
 def test_convert_json_to_evid_success(tmp_path, sample_case):
     json_dir = tmp_path / "json"
     json_dir.mkdir()
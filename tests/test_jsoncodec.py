@@ -0,0 +1,27 @@
+import pytest
+
+from domdb.core import jsoncodec
+from domdb.core.download.storage import save_cases
+from domdb.core.pages import read_page
+
+
+@pytest.fixture(params=jsoncodec.available_backends())
+def backend(request):
+    previous = jsoncodec.BACKEND
+    yield jsoncodec.set_backend(request.param)
+    jsoncodec.set_backend(previous)
+
+
+def test_backends_decode_pages_identically(backend, tmp_path):
+    cases = [{"id": "a", "headline": "Sag om § 237 – Østre Landsret", "n": [1, 2.5]}]
+    save_cases(1, cases, str(tmp_path), compress=True)
+
+    assert read_page(str(tmp_path / "cases_1.json.gz")) == cases
+    assert jsoncodec.loads(memoryview(b'{"id": "a"}')) == {"id": "a"}
+    with pytest.raises(ValueError):
+        jsoncodec.loads(b'{"id": ')
+
+
+def test_set_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        jsoncodec.set_backend("simdjson")
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from domdb.core.jsonstream import drop_string_values, iter_array_items
+
+CASES = [
+    {"id": "1", "headline": 'Sag om "vold" \\ æøå', "documents": [{"x": [1, {}]}]},
+    {"id": "2", "headline": "]},[{", "documents": []},
+    None,
+    "tekst",
+    12.5,
+]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_array_items_across_chunk_boundaries(size, indent):
+    data = json.dumps(CASES, ensure_ascii=False, indent=indent).encode()
+    items = list(iter_array_items(_chunks(data, size)))
+
+    assert [json.loads(raw) for _offset, raw in items] == CASES
+    for offset, raw in items:
+        assert data[offset : offset + len(raw)] == raw
+
+
+def test_iter_array_items_empty_array():
+    assert list(iter_array_items([b" [ ", b" ] \n"])) == []
+
+
+@pytest.mark.parametrize("data", [b'{"id": "1"}', b'[{"id": "1"}', b'["open'])
+def test_iter_array_items_rejects_invalid_documents(data):
+    with pytest.raises(ValueError):
+        list(iter_array_items([data]))
+
+
+def test_drop_string_values_nulls_only_named_keys():
+    raw = json.dumps(
+        {
+            "headline": "contentPdf",
+            "documents": [{"contentPdf": 'QUJD\\"', "id": "d", "contentHtml": None}],
+        }
+    ).encode()
+    dropped = json.loads(drop_string_values(raw, ["contentPdf", "contentHtml"]))
+
+    assert dropped == {
+        "headline": "contentPdf",
+        "documents": [{"contentPdf": None, "id": "d", "contentHtml": None}],
+    }
@@ -242,7 +242,7 @@ class TestKeywordFiltering:
     ):
         """Without full_text, body extraction is never invoked."""
         mock_extract = mocker.patch(
-            "domdb.core.converters.json2md.filter.extract_case_text"
+            "domdb.core.converters.json2md.filter.iter_case_page_texts"
         )
         output_file = Path(output_dir) / "cases.md"
         convert_json_to_md(
@@ -255,8 +255,8 @@ class TestKeywordFiltering:
     ):
         """With full_text, body extraction is skipped for cases metadata already matches."""
         mock_extract = mocker.patch(
-            "domdb.core.converters.json2md.filter.extract_case_text",
-            return_value="",
+            "domdb.core.converters.json2md.filter.iter_case_page_texts",
+            return_value=iter([]),
         )
         output_file = Path(output_dir) / "cases.md"
         convert_json_to_md(
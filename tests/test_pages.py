@@ -0,0 +1,170 @@
+import gzip
+import json
+import stat
+
+import pytest
+
+from domdb.core.converters.case_load import load_cases
+from domdb.core.download.storage import (
+    commit_page,
+    get_last_saved_page,
+    save_cases,
+    stage_page,
+)
+from domdb.core.pages import (
+    compress_cache,
+    iter_page,
+    iter_page_entries,
+    list_page_files,
+    page_number,
+    read_cases_at,
+    read_page,
+)
+from domdb.core.query import QueryParams, build_index, count_cases
+from domdb.core.query.hydrate import CaseHydrator
+from domdb.core.query.index import fetch_indexed_cases
+from domdb.core.query.loader import iter_cached_cases
+
+
+def _case(case_id, **extra):
+    return {"id": case_id, "headline": f"Sag {case_id}", **extra}
+
+
+def test_save_cases_compressed_roundtrip(tmp_path):
+    save_cases(2, [_case("a")], str(tmp_path), compress=True)
+    path = tmp_path / "cases_2.json.gz"
+
+    assert json.loads(gzip.decompress(path.read_bytes())) == [_case("a")]
+    assert read_page(str(path)) == [_case("a")]
+    assert get_last_saved_page(str(tmp_path)) == 3
+
+
+def test_stage_page_compresses_while_streaming(tmp_path):
+    body = json.dumps([_case("a"), _case("b")]).encode()
+    staged = stage_page(4, [body[:10], body[10:]], str(tmp_path), compress=True)
+    path = commit_page(staged, str(tmp_path))
+
+    assert path.endswith("cases_4.json.gz")
+    assert gzip.decompress(open(path, "rb").read()) == body
+
+
+def test_list_page_files_prefers_compressed_duplicate(tmp_path):
+    save_cases(1, [_case("a")], str(tmp_path))
+    save_cases(1, [_case("a")], str(tmp_path), compress=True)
+    save_cases(2, [_case("b")], str(tmp_path))
+
+    names = [p.rsplit("/", 1)[-1] for p in list_page_files(str(tmp_path))]
+    assert names == ["cases_1.json.gz", "cases_2.json"]
+    assert [page_number(p) for p in list_page_files(str(tmp_path))] == [1, 2]
+
+
+def test_compress_cache_keeps_readers_working(tmp_path):
+    save_cases(1, [_case("a")], str(tmp_path))
+    save_cases(
+        2,
+        [_case("b", documents=[{"contentHtml": "<p>krisecenter</p>"}])],
+        str(tmp_path),
+    )
+    build_index(str(tmp_path))
+
+    files, before, after = compress_cache(str(tmp_path))
+
+    assert files == 2 and before > 0 and after > 0
+    assert sorted(p.name for p in tmp_path.glob("cases_*")) == [
+        "cases_1.json.gz",
+        "cases_2.json.gz",
+    ]
+    assert sorted(c.id for c in load_cases(str(tmp_path))) == ["a", "b"]
+    assert sorted(c.id for c, _ in iter_cached_cases(str(tmp_path))) == ["a", "b"]
+    # The index still points at the old .json names; reads follow the rename.
+    assert read_page(str(tmp_path / "cases_1.json")) == [_case("a")]
+    params = QueryParams(keywords=["krisecenter"], full_text=True)
+    assert count_cases(str(tmp_path), params) == 1
+    assert compress_cache(str(tmp_path))[0] == 0
+
+
+def test_compressed_page_keeps_the_umask_mode(tmp_path):
+    save_cases(1, [_case("a")], str(tmp_path))
+    mode = stat.S_IMODE((tmp_path / "cases_1.json").stat().st_mode)
+
+    compress_cache(str(tmp_path))
+
+    assert stat.S_IMODE((tmp_path / "cases_1.json.gz").stat().st_mode) == mode
+
+
+def test_iter_page_yields_cases_before_reading_the_rest(tmp_path):
+    path = tmp_path / "cases_1.json"
+    path.write_text(json.dumps([_case("a"), _case("b")])[:-10])  # truncated
+
+    cases = iter_page(str(path))
+    assert next(cases) == _case("a")
+    with pytest.raises(ValueError):
+        next(cases)
+
+
+def test_load_cases_stops_reading_at_the_cap(tmp_path):
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    (tmp_path / "cases_2.json").write_text("[{broken")
+
+    assert [c.id for c in load_cases(str(tmp_path), 2, compact=True)] == ["a", "b"]
+    with pytest.raises(ValueError):
+        load_cases(str(tmp_path))
+
+
+def test_projections_drop_document_bodies_before_decoding(tmp_path):
+    doc = {"id": "d", "contentPdf": "QUJD", "contentHtml": "<p>x</p>"}
+    save_cases(1, [_case("a", documents=[doc])], str(tmp_path), compress=True)
+    path = str(tmp_path / "cases_1.json.gz")
+
+    (full,) = iter_page(path)
+    (html,) = iter_page(path, "html")
+    (meta,) = load_cases(str(tmp_path), projection="metadata")
+
+    assert full["documents"] == [doc]
+    assert html["documents"] == [dict(doc, contentPdf=None)]
+    assert (meta.headline, meta.documents[0].id) == ("Sag a", "d")
+    assert meta.documents[0].contentPdf is meta.documents[0].contentHtml is None
+    with pytest.raises(ValueError, match="Unknown projection"):
+        load_cases(str(tmp_path), projection="pdf")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_cases_at_uses_recorded_offsets(tmp_path, compress):
+    save_cases(1, [_case("a"), _case("b", note="x" * 5000)], str(tmp_path), compress)
+    (path,) = list_page_files(str(tmp_path))
+
+    entries = list(iter_page_entries(path))
+
+    assert [case["id"] for _, _, case in entries] == ["a", "b"]
+    spans = [(offset, length) for offset, length, _ in reversed(entries)]
+    assert list(read_cases_at(path, spans)) == [
+        (offset, case) for offset, _, case in entries
+    ]
+    with pytest.raises(ValueError):
+        list(read_cases_at(path, [(entries[1][0] + 1, entries[1][1])]))
+
+
+def test_stale_index_offsets_fall_back_to_scanning(tmp_path):
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    build_index(str(tmp_path))
+    row = next(r for r in fetch_indexed_cases(str(tmp_path)) if r.id == "b")
+
+    assert CaseHydrator().get(row).id == "b"
+    save_cases(1, [_case("b"), _case("a")], str(tmp_path))
+    assert CaseHydrator().get(row).id == "b"
+    save_cases(1, [_case("a")], str(tmp_path))
+    assert CaseHydrator().get(row) is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_hydrator_reads_each_page_once(tmp_path, compress):
+    for page in (1, 2):
+        cases = [_case(f"{page}-{i}") for i in range(5)]
+        save_cases(page, cases, str(tmp_path), compress)
+    build_index(str(tmp_path))
+    rows = fetch_indexed_cases(str(tmp_path))
+    hydrator = CaseHydrator()
+
+    hydrator.want(rows)
+    assert sorted(hydrator.get(row).id for row in rows) == sorted(r.id for r in rows)
+    assert hydrator.page_reads == 2
@@ -0,0 +1,79 @@
+import base64
+from io import BytesIO
+
+import pytest
+
+from domdb.core.converters import pdf_backends
+from domdb.core.converters.pdf_bench import compare_backends, sample_pdfs
+from domdb.core.converters.text_utils import extract_case_page_texts
+from domdb.core.download.storage import save_cases
+from domdb.core.exceptions import PdfBackendError
+from domdb.core.model import ModelItem
+
+
+@pytest.mark.parametrize("name", pdf_backends.available_backends())
+def test_backends_agree_on_simple_pdfs(name, make_pdf):
+    page_texts = pdf_backends.BACKENDS[name]().page_texts
+    pdf = make_pdf(["Dom afsagt den 3. maj", "Straffeloven § 237"])
+    assert [text.strip() for text in page_texts(BytesIO(pdf))] == [
+        "Dom afsagt den 3. maj",
+        "Straffeloven § 237",
+    ]
+
+
+def test_selected_backend_is_used_and_keyed(make_pdf, monkeypatch):
+    monkeypatch.setenv("DOMDB_TEXT_CACHE", "")
+    pdf = base64.b64encode(make_pdf(["pdfium tekst"])).decode()
+    case = ModelItem.model_validate(
+        {"id": "a", "documents": [{"id": "d", "contentPdf": pdf}]}
+    )
+    previous = pdf_backends.backend_name()
+    try:
+        pdf_backends.set_backend("pdfium")
+        assert extract_case_page_texts(case) == ["pdfium tekst"]
+    finally:
+        pdf_backends.set_backend(previous)
+
+    with pytest.raises(PdfBackendError):
+        pdf_backends.set_backend("nope")
+
+
+def test_unknown_configured_backend_fails_on_first_use(make_pdf, monkeypatch):
+    monkeypatch.setenv("DOMDB_PDF_BACKEND", "nope")
+    monkeypatch.setattr(pdf_backends, "_backend", None)
+    monkeypatch.setattr(pdf_backends, "_backend_name", None)
+    with pytest.raises(PdfBackendError, match="nope"):
+        list(pdf_backends.page_texts(BytesIO(make_pdf(["tekst"]))))
+
+    pdf = base64.b64encode(make_pdf(["tekst"])).decode()
+    case = ModelItem.model_validate(
+        {"id": "a", "documents": [{"id": "d", "contentPdf": pdf}]}
+    )
+    with pytest.raises(PdfBackendError):
+        extract_case_page_texts(case)
+
+
+def test_compare_backends_on_cache_sample(tmp_path, make_pdf):
+    cases = [
+        {
+            "id": str(number),
+            "documents": [
+                {
+                    "id": f"d{number}",
+                    "contentPdf": base64.b64encode(
+                        make_pdf([f"side {number}"])
+                    ).decode(),
+                }
+            ],
+        }
+        for number in range(3)
+    ]
+    save_cases(1, cases, str(tmp_path))
+    pdfs = sample_pdfs(str(tmp_path), 2)
+    assert [doc_id for doc_id, _data in pdfs] == ["d0", "d1"]
+
+    reports = compare_backends(pdfs, ["pdfplumber", "pdfminer"])
+    assert [r.backend for r in reports] == ["pdfplumber", "pdfminer"]
+    assert all(r.pages == 2 and r.errors == 0 for r in reports)
+    assert reports[0].identical is None
+    assert reports[1].identical == 1.0
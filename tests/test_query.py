@@ -1,11 +1,20 @@
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from domdb.core.query import QueryParams, build_index, count_cases, list_cases
+from domdb.core.query import (
+    QueryParams,
+    build_index,
+    count_cases,
+    index_exists,
+    index_path,
+    list_cases,
+)
 from domdb.core.query.engine import CaseHit
+from domdb.core.query.index import fetch_indexed_cases
 
 
 @pytest.fixture
@@ -105,3 +114,29 @@ class TestQueryEngine:
         build_index(research_dir)
         params = QueryParams(keywords=["erstatning"], court="København")
         assert count_cases(research_dir, params) == 1
+
+    def test_keywords_are_prefiltered_by_full_text_index(self, research_dir):
+        build_index(research_dir)
+
+        def ids(**kwargs):
+            return [row.id for row in fetch_indexed_cases(research_dir, **kwargs)]
+
+        assert ids(keywords=["psykisk vold"]) == []
+        assert ids(keywords=["psykisk vold"], search_body=True) == ["101"]
+        assert ids(keywords=["§ 237", "aarhus"], search_body=True) == ["100"]
+        # Too short for the trigram index; left to the Python re-check.
+        assert len(ids(keywords=["§"])) == 3
+
+        params = QueryParams(keywords=["psykisk vold"], full_text=True)
+        assert count_cases(research_dir, params) == 1
+        assert count_cases(research_dir, QueryParams(keywords=["§", "237"])) == 1
+
+    def test_old_schema_index_is_ignored(self, research_dir):
+        build_index(research_dir)
+        conn = sqlite3.connect(index_path(research_dir))
+        conn.execute("UPDATE meta SET value = '2' WHERE key = 'schema_version'")
+        conn.commit()
+        conn.close()
+
+        assert not index_exists(research_dir)
+        assert count_cases(research_dir, QueryParams(keywords=["erstatning"])) == 1
@@ -0,0 +1,84 @@
+import os
+
+from domdb.core.converters.case_load import load_cases
+from domdb.core.download.storage import save_cases
+import domdb.core.snapshots as snapshots
+from domdb.core.pages import compress_cache
+from domdb.core.query.loader import iter_cached_cases
+from domdb.core.snapshots import SnapshotStats, load_snapshot, page_cases
+
+
+def _case(case_id, headline="old"):
+    return {"id": case_id, "headline": headline, "contentHtml": None}
+
+
+def _load(tmp_path, stats):
+    page = str(tmp_path / "cases_1.json")
+    return page_cases(
+        page, "metadata", True, lambda: load_cases(str(tmp_path), compact=True), stats
+    )
+
+
+def test_second_load_is_served_from_the_snapshot(tmp_path):
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    stats = SnapshotStats()
+
+    first = load_cases(str(tmp_path), compact=True, projection="metadata")
+    second = load_cases(str(tmp_path), compact=True, projection="metadata")
+
+    assert [c.id for c in second] == [c.id for c in first] == ["a", "b"]
+    assert second[0]._cache_dir == str(tmp_path)
+    assert len(_load(tmp_path, stats)) == 2
+    assert stats.describe() == "Snapshot cache: 1/1 pages hit (100%)"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        ".cases_1.json.metadata.compact.snapshot",
+        "cases_1.json",
+    ]
+
+
+def test_snapshot_follows_page_changes(tmp_path):
+    page = str(tmp_path / "cases_1.json")
+    save_cases(1, [_case("a")], str(tmp_path))
+    load_cases(str(tmp_path), projection="html")
+
+    os.utime(page, (1_000, 1_000))  # same bytes: the hash keeps the snapshot
+    assert [c.id for c in load_snapshot(page, "html", False)] == ["a"]
+
+    save_cases(1, [_case("a", "new!")], str(tmp_path))
+    assert load_snapshot(page, "html", False) is None
+    (case,) = load_cases(str(tmp_path), projection="html")
+    assert case.headline == "new!"
+
+
+def test_snapshot_of_another_model_layout_is_a_miss(tmp_path, monkeypatch):
+    page = str(tmp_path / "cases_1.json")
+    save_cases(1, [_case("a")], str(tmp_path))
+    load_cases(str(tmp_path), projection="html")
+    assert load_snapshot(page, "html", False) is not None
+
+    monkeypatch.setattr(snapshots, "schema_fingerprint", lambda: "0.0.0:renamed")
+    assert load_snapshot(page, "html", False) is None
+
+
+def test_compress_removes_snapshots_of_renamed_pages(tmp_path):
+    save_cases(1, [_case("a")], str(tmp_path))
+    save_cases(2, [_case("b")], str(tmp_path))
+    load_cases(str(tmp_path), projection="html")
+    load_cases(str(tmp_path), compact=True, projection="metadata")
+    (tmp_path / ".cases_9.json.html.snapshot").write_bytes(b"orphan")
+
+    compress_cache(str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "cases_1.json.gz",
+        "cases_2.json.gz",
+    ]
+
+
+def test_full_projection_and_disabled_snapshots_parse_pages(tmp_path, monkeypatch):
+    save_cases(1, [_case("a")], str(tmp_path))
+    load_cases(str(tmp_path))
+    monkeypatch.setenv("DOMDB_SNAPSHOTS", "0")
+    list(iter_cached_cases(str(tmp_path), compact=True, projection="html"))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["cases_1.json"]
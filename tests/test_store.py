@@ -0,0 +1,79 @@
+import os
+import stat
+
+from domdb.core.converters.case_load import load_cases
+from domdb.core.download.storage import save_cases
+from domdb.core.manifest import load_manifest
+from domdb.core.pages import compress_page_file, drop_cases, read_page
+from domdb.core.store import dedupe_cache, record_pages
+
+
+def _case(case_id, headline="old"):
+    return {"id": case_id, "headline": headline}
+
+
+def _age(path, seconds):
+    os.utime(path, (seconds, seconds))
+
+
+def test_dedupe_cache_keeps_newest_copy(tmp_path):
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    save_cases(2, [_case("a", "new")], str(tmp_path), compress=True)
+    _age(tmp_path / "cases_1.json", 1_000)
+    _age(tmp_path / "cases_2.json.gz", 2_000)
+
+    assert dedupe_cache(str(tmp_path)) == (1, 1)
+
+    assert read_page(str(tmp_path / "cases_1.json")) == [_case("b")]
+    assert [c.headline for c in load_cases(str(tmp_path))] == ["old", "new"]
+    assert load_manifest(str(tmp_path))["a"].file == "cases_2.json.gz"
+
+
+def test_dedupe_cache_ignores_rewrites_of_older_pages(tmp_path):
+    save_cases(2, [_case("a", "new")], str(tmp_path))
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    # cases_1 is rewritten (here compressed) after cases_2 was downloaded.
+    compress_page_file(str(tmp_path / "cases_1.json"))
+    _age(tmp_path / "cases_2.json", 1_000)
+    _age(tmp_path / "cases_1.json.gz", 2_000)
+
+    assert dedupe_cache(str(tmp_path)) == (1, 1)
+
+    assert read_page(str(tmp_path / "cases_1.json.gz")) == [_case("b")]
+    assert read_page(str(tmp_path / "cases_2.json")) == [_case("a", "new")]
+    assert load_manifest(str(tmp_path))["a"].file == "cases_2.json"
+
+
+def test_record_pages_drops_superseded_copies(tmp_path):
+    save_cases(1, [_case("a"), _case("b")], str(tmp_path))
+    dedupe_cache(str(tmp_path))
+    save_cases(2, [_case("b", "new"), _case("c")], str(tmp_path))
+
+    assert record_pages(str(tmp_path), [str(tmp_path / "cases_2.json")]) == 1
+
+    assert read_page(str(tmp_path / "cases_1.json")) == [_case("a")]
+    manifest = load_manifest(str(tmp_path))
+    assert {k: v.file for k, v in manifest.items()} == {
+        "a": "cases_1.json",
+        "b": "cases_2.json",
+        "c": "cases_2.json",
+    }
+
+
+def test_drop_cases_copies_kept_cases_verbatim(tmp_path):
+    (tmp_path / "cases_1.json").write_text(
+        '[{"id": "a", "contentPdf": "QUJD"},\n {"id":"b","x":[1, 2]}]'
+    )
+
+    assert drop_cases(str(tmp_path / "cases_1.json"), {"x"}) == 0
+    assert drop_cases(str(tmp_path / "cases_1.json"), {"a"}) == 1
+    assert (tmp_path / "cases_1.json").read_text() == '[\n{"id":"b","x":[1, 2]}\n]\n'
+
+
+def test_dropping_cases_keeps_the_umask_mode(tmp_path):
+    save_cases(1, [{"id": "a"}, {"id": "b"}], str(tmp_path))
+    path = tmp_path / "cases_1.json"
+    mode = stat.S_IMODE(path.stat().st_mode)
+
+    assert drop_cases(str(path), {"a"}) == 1
+    assert stat.S_IMODE(path.stat().st_mode) == mode
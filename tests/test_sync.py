@@ -0,0 +1,81 @@
+import base64
+import json
+
+import pytest
+
+from domdb.core.blobs import externalize_case
+from domdb.core.download.storage import save_cases
+from domdb.core.download.sync import sync_cases
+from domdb.core.manifest import case_fingerprint, load_changes, load_manifest
+from domdb.core.pages import read_page
+
+
+@pytest.fixture(autouse=True)
+def token(mocker, tmp_path):
+    mocker.patch("domdb.core.download.auth.TOKEN_CACHE_PATH", str(tmp_path / "t"))
+    mocker.patch("domdb.core.download.auth.get_access_token", return_value="tok")
+
+
+def _api(mocker, pages):
+    return mocker.patch(
+        "domdb.core.download.sync.get_sager",
+        side_effect=lambda token, page, per_page, client: pages.get(page, []),
+    )
+
+
+def _case(case_id, **extra):
+    return {"id": case_id, "headline": f"Sag {case_id}", **extra}
+
+
+def test_sync_refreshes_changed_and_appends_new(mocker, tmp_path):
+    cache = tmp_path / "cases"
+    save_cases(1, [_case("a"), _case("b")], str(cache))
+    revoked = _case("b", revokedDateTime="2024-01-01")
+    _api(mocker, {1: [_case("a"), revoked, _case("c")], 2: [_case("c")]})
+
+    changes = sync_cases(str(cache))
+
+    assert (changes.added, changes.updated, changes.revoked) == (["c"], ["b"], ["b"])
+    assert changes.pages == 2
+    assert changes.files == ["cases_1.json", "cases_2.json"]
+    assert read_page(str(cache / "cases_1.json")) == [_case("a"), revoked]
+    assert read_page(str(cache / "cases_2.json")) == [_case("c")]
+    assert load_changes(str(cache)) == changes
+    assert load_manifest(str(cache))["c"].file == "cases_2.json"
+    assert sorted(p.name for p in cache.glob("*.json")) == [
+        "cases_1.json",
+        "cases_2.json",
+    ]
+
+
+def test_sync_without_changes_writes_nothing(mocker, tmp_path):
+    cache = tmp_path / "cases"
+    save_cases(1, [_case("a")], str(cache), compress=True)
+    _api(mocker, {1: [_case("a")]})
+    before = (cache / "cases_1.json.gz").stat().st_mtime_ns
+
+    changes = sync_cases(str(cache))
+
+    assert changes.changed_ids == [] and changes.files == []
+    assert (cache / "cases_1.json.gz").stat().st_mtime_ns == before
+
+
+def test_sync_respects_max_pages(mocker, tmp_path):
+    api = _api(mocker, {1: [_case("a")], 2: [_case("b")]})
+
+    changes = sync_cases(str(tmp_path / "cases"), max_pages=1)
+
+    assert changes.added == ["a"]
+    assert [call.args[1] for call in api.call_args_list] == [1]
+
+
+def test_fingerprint_ignores_blob_externalization(tmp_path):
+    case = _case(
+        "a", documents=[{"id": "d", "contentPdf": base64.b64encode(b"%PDF").decode()}]
+    )
+    before = case_fingerprint(case)
+    externalize_case(case, str(tmp_path))
+
+    assert case["documents"][0]["contentPdf"] is None
+    assert case_fingerprint(case) == before
+    assert case_fingerprint(json.loads(json.dumps(case)) | {"headline": "x"}) != before
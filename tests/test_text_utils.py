@@ -1,6 +1,9 @@
 import base64
 
+import pdfplumber
+
 import domdb.core.converters.text_utils as text_utils
+from domdb.core.converters.json2md.filter import case_matches_keywords
 from domdb.core.converters.text_utils import (
     extract_case_page_texts,
     extract_case_text,
@@ -50,6 +53,9 @@ def test_extract_skips_scanned_pdf(monkeypatch):
         def extract_text(self):
             return None
 
+        def close(self):
+            pass
+
     class FakePdf:
         pages = [FakePage(), FakePage(), FakePage()]
 
@@ -62,7 +68,7 @@ def test_extract_skips_scanned_pdf(monkeypatch):
 
     warnings: list[str] = []
 
-    monkeypatch.setattr(text_utils.pdfplumber, "open", lambda _: FakePdfContext())
+    monkeypatch.setattr(pdfplumber, "open", lambda _, **kwargs: FakePdfContext())
     monkeypatch.setattr(
         text_utils.logger, "warning", lambda msg: warnings.append(str(msg))
     )
@@ -74,3 +80,38 @@ def test_extract_skips_scanned_pdf(monkeypatch):
 
     assert pages == []
     assert any("scanned" in w.lower() for w in warnings)
+
+
+def test_keyword_search_stops_at_matching_page(monkeypatch):
+    extracted: list[int] = []
+
+    class FakePage:
+        def __init__(self, number):
+            self.number = number
+
+        def extract_text(self):
+            extracted.append(self.number)
+            return "krisecenter" if self.number == 5 else f"side {self.number}"
+
+        def close(self):
+            pass
+
+    class FakePdf:
+        pages = [FakePage(number) for number in range(1, 501)]
+
+    class FakePdfContext:
+        def __enter__(self):
+            return FakePdf()
+
+        def __exit__(self, *args):
+            pass
+
+    monkeypatch.setattr(pdfplumber, "open", lambda _, **kwargs: FakePdfContext())
+    pdf_b64 = base64.b64encode(b"%PDF-1.4 long").decode()
+    case = _case([{"contentPdf": pdf_b64, "id": "long-1"}])
+
+    assert case_matches_keywords(case, ["krisecenter"], full_text=True)
+    assert extracted == [1, 2, 3, 4, 5]
+
+    # The abandoned stream was not cached as if it were the whole document.
+    assert len(text_utils.extract_case_page_texts(case)) == 500
@@ -0,0 +1,153 @@
+import base64
+import json
+import os
+import sqlite3
+import zlib
+
+import pdfplumber
+
+from domdb.core.blobs import ingest_cache
+from domdb.core.converters.case_load import load_cases
+from domdb.core.converters.text_utils import extract_case_page_texts
+from domdb.core.download.storage import save_cases
+from domdb.core.model import ModelItem
+from domdb.core.textcache import TextCache, get_text_cache
+
+
+def _pdf_case(case_id, pdf: bytes):
+    pdf_b64 = base64.b64encode(pdf).decode()
+    return {"id": case_id, "documents": [{"id": f"{case_id}-d", "contentPdf": pdf_b64}]}
+
+
+def _load_one(tmp_path, cases):
+    save_cases(1, cases, str(tmp_path))
+    (case,) = load_cases(str(tmp_path))
+    return case
+
+
+def _count_pdf_opens(monkeypatch) -> list[int]:
+    opened = [0]
+    real_open = pdfplumber.open
+
+    def counting_open(stream, **kwargs):
+        opened[0] += 1
+        return real_open(stream, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, "open", counting_open)
+    return opened
+
+
+def test_second_extraction_parses_no_pdf(tmp_path, make_pdf, monkeypatch):
+    save_cases(1, [_pdf_case("a", make_pdf(["Dom afsagt", "Side to"]))], str(tmp_path))
+    opened = _count_pdf_opens(monkeypatch)
+
+    (case,) = load_cases(str(tmp_path))
+    assert extract_case_page_texts(case) == ["Dom afsagt", "Side to"]
+    assert extract_case_page_texts(case) == ["Dom afsagt", "Side to"]
+    assert opened == [1]
+
+    # Moving the PDF into the blob store keeps its key (the bytes' SHA-256).
+    ingest_cache(str(tmp_path))
+    (case,) = load_cases(str(tmp_path))
+    assert case.documents[0].contentPdfBlob
+    assert extract_case_page_texts(case) == ["Dom afsagt", "Side to"]
+    assert opened == [1]
+
+
+def test_unreadable_pdfs_are_not_cached(tmp_path):
+    doc = {"id": "d", "contentPdf": base64.b64encode(b"not-a-pdf").decode()}
+    case = _load_one(tmp_path, [{"id": "a", "documents": [doc]}])
+
+    assert extract_case_page_texts(case) == []
+    assert get_text_cache().total_bytes() == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TextCache(str(tmp_path / "texts.sqlite"), max_bytes=400)
+    texts = [[os.urandom(300).hex()] for _ in range(3)]  # ~300 B compressed
+    for number, text in enumerate(texts):
+        cache.put(f"k{number}", "d", text)
+    assert cache.get("k0") is None
+    assert cache.get("k2") == texts[2]
+    assert cache.total_bytes() <= 400
+
+
+def test_cache_keeps_a_running_byte_total(tmp_path):
+    cache = TextCache(str(tmp_path / "texts.sqlite"), max_bytes=10_000)
+    cache.put("a", "d", ["x" * 100])
+    cache.put("b", "d", [os.urandom(200).hex()])
+    cache.put("a", "d", [os.urandom(300).hex()])  # replaced, not added
+
+    (stored,) = cache._conn.execute("SELECT SUM(size) FROM texts").fetchone()
+    assert cache.total_bytes() == stored
+
+    # Recent hits don't rewrite the use time.
+    (used,) = cache._conn.execute("SELECT used FROM texts WHERE key = 'a'").fetchone()
+    cache.get("a")
+    assert cache._conn.execute("SELECT used FROM texts WHERE key = 'a'").fetchone() == (
+        used,
+    )
+
+
+def test_cache_in_the_old_layout_is_migrated(tmp_path):
+    path = str(tmp_path / "texts.sqlite")
+    data = zlib.compress(json.dumps(["gammel"]).encode())
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE texts (key TEXT PRIMARY KEY, doc_id TEXT NOT NULL, "
+        "data BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO texts VALUES ('k', 'd', ?, ?, 0)", (data, len(data)))
+    conn.commit()
+    conn.close()
+
+    cache = TextCache(path, max_bytes=10_000)
+
+    assert cache.get("k") == ["gammel"]
+    assert cache.total_bytes() == len(data)
+    columns = [row[1] for row in cache._conn.execute("PRAGMA table_info(texts)")]
+    assert columns == ["key", "doc_id", "size", "used", "data"]
+
+
+def test_disabled_cache(monkeypatch):
+    monkeypatch.setenv("DOMDB_TEXT_CACHE", "")
+    assert get_text_cache() is None
+
+
+def test_registry_skips_known_scanned_pdfs(tmp_path, make_pdf, monkeypatch):
+    cases = [
+        _pdf_case("scan", make_pdf(["", "", "", ""])),
+        _pdf_case("text", make_pdf(["Dom afsagt"])),
+        {"id": "bad", "documents": [{"id": "bad-d", "contentPdf": "bm90LWEtcGRm"}]},
+    ]
+    save_cases(1, cases, str(tmp_path))
+    opened = _count_pdf_opens(monkeypatch)
+
+    scan, text, bad = load_cases(str(tmp_path))
+    assert extract_case_page_texts(scan) == []
+    assert extract_case_page_texts(text) == ["Dom afsagt"]
+    assert extract_case_page_texts(bad) == []
+    assert opened == [3]
+
+    cache = get_text_cache()
+    summary = cache.pdf_summary()
+    assert summary["scanned"][0] == 1
+    assert summary["text"][:2] == (1, 1)
+    assert summary["failed"] == (1, 0, len(b"not-a-pdf"))
+
+    # Evicted texts: the registry still knows the scanned PDF.
+    cache._conn.execute("DELETE FROM texts")
+    assert extract_case_page_texts(scan) == []
+    assert opened == [3]
+
+
+def test_known_scanned_inline_pdf_is_not_decoded(make_pdf, monkeypatch):
+    case = ModelItem.model_validate(_pdf_case("scan", make_pdf(["", "", ""])))
+    assert extract_case_page_texts(case) == []
+    assert get_text_cache().pdf_summary()["scanned"][0] == 1
+
+    def b64decode(*args, **kwargs):
+        raise AssertionError("known scanned PDF was decoded")
+
+    monkeypatch.setattr(base64, "b64decode", b64decode)
+    assert extract_case_page_texts(case) == []